@@ -18,15 +18,20 @@ License: MIT
 Version: 1.0.0
 """
 
-__version__ = "1.0.0"
+from .version import __version__
+
 __author__ = "ExcelSearchPro Team"
 __license__ = "MIT"
 
-# Import main classes for easy access
-try:
-    from .search_engine import ExcelSearchEngine
-    from .excel_search_gui import ExcelSearchGUI
-    __all__ = ['ExcelSearchEngine', 'ExcelSearchGUI']
-except ImportError:
-    # Handle case where package is run directly
-    pass
+__all__ = ['ExcelSearchEngine', 'ExcelSearchGUI']
+
+
+def __getattr__(name):
+    """Import main classes on first access, so importing the package stays cheap"""
+    if name == 'ExcelSearchEngine':
+        from .search_engine import ExcelSearchEngine
+        return ExcelSearchEngine
+    if name == 'ExcelSearchGUI':
+        from .excel_search_gui import ExcelSearchGUI
+        return ExcelSearchGUI
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
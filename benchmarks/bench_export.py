@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Writer throughput benchmark for every export format
+Exports the same row positions from a synthetic DataFrame with each writer
+"""
+
+import argparse
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+# Allow importing the application modules from the repository root
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import exporters
+
+
+def make_dataframe(rows, seed=42):
+    """Build a people-style DataFrame with strings, numbers, dates and gaps"""
+    rng = np.random.default_rng(seed)
+    first_names = np.array(['Alice', 'Bob', 'Carol', 'David', 'Eve', 'Frank', 'Grace', 'Heidi'])
+    cities = np.array(['Paris', 'Rome', 'Oslo', 'Lima', 'Cairo', 'Tokyo', 'Austin', 'Dubai'])
+    names = pd.Series(first_names[rng.integers(0, len(first_names), rows)]) + ' ' + \
+        pd.Series(rng.integers(0, 100000, rows)).astype(str)
+    scores = rng.normal(70, 15, rows).round(2)
+    scores[rng.random(rows) < 0.05] = np.nan
+    return pd.DataFrame({
+        'ID': np.arange(rows),
+        'Name': names,
+        'City': cities[rng.integers(0, len(cities), rows)],
+        'Email': [f"user{i}@example.com" for i in range(rows)],
+        'Score': scores,
+        'Joined': pd.Timestamp('2020-01-01') + pd.to_timedelta(rng.integers(0, 2000, rows), unit='D')
+    })
+
+
+def run_benchmark(df, positions, formats, chunk_rows, output_dir):
+    """
+    Export the positions once per format and time each writer
+    
+    Returns:
+        List of result dictionaries, one per format
+    """
+    results = []
+    for file_ext in formats:
+        output_path = os.path.join(output_dir, f"results{file_ext}")
+        start = time.perf_counter()
+        try:
+            success, message = exporters.export_dataframe(df, output_path, positions=positions,
+                                                          chunk_rows=chunk_rows)
+        except ImportError as e:
+            success, message = False, str(e)
+        elapsed = time.perf_counter() - start
+        
+        result = {'format': file_ext, 'ok': success, 'seconds': elapsed}
+        if success:
+            size = os.path.getsize(output_path)
+            result.update({
+                'rows': len(positions),
+                'rows_per_second': len(positions) / elapsed if elapsed > 0 else 0,
+                'file_mb': size / (1024 * 1024),
+                'mb_per_second': size / (1024 * 1024) / elapsed if elapsed > 0 else 0
+            })
+            os.unlink(output_path)
+        else:
+            result['error'] = message
+        results.append(result)
+    return results
+
+
+def main():
+    """Command-line entry point"""
+    parser = argparse.ArgumentParser(description="Benchmark export writer throughput")
+    parser.add_argument("--rows", type=int, default=500000, help="Rows in the synthetic DataFrame")
+    parser.add_argument("--selectivity", type=float, default=0.5,
+                        help="Fraction of rows exported, as scattered row positions")
+    parser.add_argument("--chunk-rows", type=int,
+                        help="Rows written per chunk (default: each format's own)")
+    parser.add_argument("--formats", default=','.join(exporters.WRITERS),
+                        help="Comma-separated extensions to benchmark")
+    parser.add_argument("--output", help="Write results as JSON to this file")
+    args = parser.parse_args()
+    
+    df = make_dataframe(args.rows)
+    rng = np.random.default_rng(7)
+    positions = np.flatnonzero(rng.random(args.rows) < args.selectivity)
+    formats = [ext.strip() for ext in args.formats.split(',') if ext.strip()]
+    
+    output_dir = tempfile.mkdtemp()
+    try:
+        results = run_benchmark(df, positions, formats, args.chunk_rows, output_dir)
+    finally:
+        shutil.rmtree(output_dir)
+    
+    report = {
+        'rows': args.rows,
+        'exported_rows': len(positions),
+        'chunk_rows': args.chunk_rows,
+        'results': results
+    }
+    print(json.dumps(report, indent=2))
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
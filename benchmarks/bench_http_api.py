@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+Latency and throughput benchmark for the HTTP/JSON search API
+Starts the API on localhost, then fires concurrent search requests at it
+"""
+
+import argparse
+import http.client
+import json
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlencode
+
+# Allow importing the application modules from the repository root
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from search_server import SearchAPIServer
+
+
+def write_sample_csv(path, rows):
+    """Write a simple people-style CSV for the benchmark"""
+    first_names = ['Alice', 'Bob', 'Carol', 'David', 'Eve', 'Frank', 'Grace', 'Heidi']
+    cities = ['Paris', 'Rome', 'Oslo', 'Lima', 'Cairo', 'Tokyo', 'Austin', 'Dubai']
+    rng = random.Random(42)
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write('ID,Name,City,Email\n')
+        for i in range(rows):
+            name = f"{rng.choice(first_names)} {rng.randrange(100000)}"
+            f.write(f"{i},{name},{rng.choice(cities)},user{i}@example.com\n")
+
+
+def percentile(sorted_values, fraction):
+    """Nearest-rank percentile of an ascending list"""
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(fraction * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def run_benchmark(file_path, requests, concurrency, queries):
+    """
+    Load the file through the API and time concurrent searches
+    
+    Returns:
+        Dictionary with latency percentiles (ms) and throughput
+    """
+    server = SearchAPIServer('127.0.0.1', 0)
+    httpd = server.start()
+    port = httpd.server_address[1]
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    
+    local = threading.local()
+    
+    def call(path, payload=None):
+        if not hasattr(local, 'conn'):
+            local.conn = http.client.HTTPConnection('127.0.0.1', port)
+        body = json.dumps(payload).encode('utf-8') if payload is not None else None
+        local.conn.request('POST' if body else 'GET', path, body=body,
+                           headers={'Content-Type': 'application/json'} if body else {})
+        response = local.conn.getresponse()
+        data = response.read()
+        return response.status, data
+    
+    try:
+        load_start = time.perf_counter()
+        status, data = call('/load', {'file': file_path})
+        load_time = time.perf_counter() - load_start
+        if status != 200:
+            raise RuntimeError(f"Load failed: {data.decode('utf-8', 'replace')}")
+        
+        def one_request(i):
+            query = queries[i % len(queries)]
+            params = urlencode(dict(query, file=file_path, rows=10))
+            start = time.perf_counter()
+            status, _ = call(f"/search?{params}")
+            return time.perf_counter() - start, status
+        
+        wall_start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            outcomes = list(pool.map(one_request, range(requests)))
+        wall_time = time.perf_counter() - wall_start
+    finally:
+        httpd.shutdown()
+        httpd.server_close()
+    
+    latencies = sorted(latency * 1000 for latency, _ in outcomes)
+    return {
+        'file': file_path,
+        'load_time_s': load_time,
+        'requests': requests,
+        'concurrency': concurrency,
+        'errors': sum(1 for _, status in outcomes if status != 200),
+        'throughput_rps': requests / wall_time if wall_time > 0 else 0,
+        'latency_ms': {
+            'p50': percentile(latencies, 0.50),
+            'p95': percentile(latencies, 0.95),
+            'p99': percentile(latencies, 0.99),
+            'max': latencies[-1] if latencies else 0.0
+        }
+    }
+
+
+def main():
+    """Command-line entry point"""
+    parser = argparse.ArgumentParser(description="Benchmark the HTTP/JSON search API on localhost")
+    parser.add_argument("--file", help="Workbook to query (default: generate a sample CSV)")
+    parser.add_argument("--rows", type=int, default=200000, help="Rows in the generated sample")
+    parser.add_argument("--requests", type=int, default=2000, help="Total search requests")
+    parser.add_argument("--concurrency", type=int, default=8, help="Concurrent clients")
+    parser.add_argument("--output", help="Write results as JSON to this file")
+    args = parser.parse_args()
+    
+    queries = [
+        {'term': 'alice', 'columns': 'Name'},
+        {'term': 'paris', 'columns': 'City', 'exact_match': 'true'},
+        {'term': 'user12', 'columns': 'Email'},
+        {'term': '^Bob 9', 'columns': 'Name', 'use_regex': 'true', 'case_sensitive': 'true'}
+    ]
+    
+    temp_dir = None
+    file_path = args.file
+    if not file_path:
+        temp_dir = tempfile.mkdtemp()
+        file_path = os.path.join(temp_dir, 'bench.csv')
+        write_sample_csv(file_path, args.rows)
+    
+    try:
+        result = run_benchmark(os.path.abspath(file_path), args.requests, args.concurrency, queries)
+    finally:
+        if temp_dir:
+            os.unlink(file_path)
+            os.rmdir(temp_dir)
+    
+    print(json.dumps(result, indent=2))
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(result, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
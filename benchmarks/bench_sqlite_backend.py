@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+SQLite backend versus in-memory benchmark
+Loads the same file into ExcelSearchEngine and SQLiteSearchEngine and times every search mode on both
+"""
+
+import argparse
+import json
+import os
+import shutil
+import sys
+import tempfile
+
+# Allow importing the application modules from the repository root
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from search_engine import ExcelSearchEngine
+from sqlite_backend import SQLiteSearchEngine, fts5_available
+from generate_data import generate_file
+from run_benchmarks import search_scenarios, time_call
+
+
+def short_term_scenarios(df):
+    """A term under three characters, which the SQLite backend answers by scanning"""
+    return [('short_term', {'search_term': str(df['City'].iloc[len(df) // 2])[:2], 'search_columns': ['City']})]
+
+
+def run_benchmark(file_path, repeat, db_path):
+    """
+    Load the file into both backends and time the same searches on each
+    
+    Returns:
+        Dictionary with load timings, storage sizes and per-scenario timings
+    """
+    def load(make_engine):
+        engine = make_engine()
+        success, message = engine.load_file(file_path)
+        if not success:
+            raise RuntimeError(message)
+        return engine
+    
+    pandas_load, memory_engine = time_call(lambda: load(ExcelSearchEngine), 1)
+    sqlite_load, sqlite_engine = time_call(lambda: load(lambda: SQLiteSearchEngine(db_path)), 1)
+    # Opening an unchanged file again reuses the database
+    reopen, sqlite_engine = time_call(lambda: load(lambda: SQLiteSearchEngine(db_path)), 1)
+    
+    scenarios = []
+    for name, kwargs in search_scenarios(memory_engine.df) + short_term_scenarios(memory_engine.df):
+        def memory_search():
+            # Drop cached results so every timed run really scans
+            memory_engine._get_cache(memory_engine.df)['results'].clear()
+            return memory_engine.search(max_results=1000, **kwargs)
+        
+        memory_engine.search(max_results=1000, **kwargs)  # Builds the normalized columns once
+        memory_timing, (_, memory_stats) = time_call(memory_search, repeat)
+        sqlite_timing, (_, sqlite_stats) = time_call(
+            lambda: sqlite_engine.search(max_results=1000, **kwargs), repeat)
+        for stats in (memory_stats, sqlite_stats):
+            if 'error' in stats:
+                raise RuntimeError(f"{name}: {stats['error']}")
+        scenarios.append({
+            'scenario': f'search_{name}',
+            'pandas_median_s': memory_timing['median_s'],
+            'sqlite_median_s': sqlite_timing['median_s'],
+            'speedup': memory_timing['median_s'] / sqlite_timing['median_s'] if sqlite_timing['median_s'] else None,
+            'total_results': memory_stats['total_results'],
+            'sqlite_total_results': sqlite_stats['total_results']
+        })
+    
+    info = sqlite_engine.get_file_info()
+    return {
+        'rows': info['rows'],
+        'file_mb': info['file_size_mb'],
+        'load': {
+            'pandas_s': pandas_load['median_s'],
+            'sqlite_s': sqlite_load['median_s'],
+            'sqlite_reopen_s': reopen['median_s']
+        },
+        'storage': {
+            'pandas_memory_mb': memory_engine.get_memory_usage()['total_bytes'] / (1024 * 1024),
+            'sqlite_memory_mb': sqlite_engine.get_memory_usage()['total_bytes'] / (1024 * 1024),
+            'sqlite_database_mb': info['database_mb']
+        },
+        'results': scenarios
+    }
+
+
+def main():
+    """Command-line entry point"""
+    parser = argparse.ArgumentParser(description="Benchmark the SQLite backend against the in-memory engine")
+    parser.add_argument("--rows", type=int, default=500000, help="Rows in the generated dataset")
+    parser.add_argument("--file", help="Benchmark an existing file instead of generating one")
+    parser.add_argument("--repeat", type=int, default=3, help="Timed runs per scenario")
+    parser.add_argument("--output", help="Write results as JSON to this file")
+    args = parser.parse_args()
+    
+    if not fts5_available():
+        print("❌ This Python's SQLite has no FTS5 trigram tokenizer (needs SQLite 3.34+)", file=sys.stderr)
+        sys.exit(1)
+    
+    work_dir = tempfile.mkdtemp()
+    try:
+        file_path = args.file
+        if file_path is None:
+            file_path = os.path.join(work_dir, 'dataset.csv')
+            generate_file(file_path, args.rows)
+        report = run_benchmark(file_path, args.repeat, os.path.join(work_dir, 'dataset.sqlite'))
+    finally:
+        shutil.rmtree(work_dir)
+    
+    mismatched = [r['scenario'] for r in report['results'] if r['total_results'] != r['sqlite_total_results']]
+    report['mismatched_scenarios'] = mismatched
+    print(json.dumps(report, indent=2))
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
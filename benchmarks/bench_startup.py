@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Startup-time benchmark for the fast command-line paths
+Times --help, --version and daemon client searches against STARTUP_BUDGETS
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Allow importing the application modules from the repository root
+sys.path.insert(0, ROOT)
+
+from startup_profile import HEAVY_MODULES, STARTUP_BUDGETS, parse_importtime
+
+
+def startup_commands(socket_path):
+    """Command line for each budgeted path"""
+    main = os.path.join(ROOT, 'main.py')
+    cli = os.path.join(ROOT, 'excel_search_cli.py')
+    return {
+        'main --help': [main, '--help'],
+        'main --version': [main, '--version'],
+        'cli --help': [cli, '--help'],
+        'cli --version': [cli, '--version'],
+        # No daemon listens here, so this measures the client's own startup and connect attempt
+        'cli --daemon search': [cli, 'data.xlsx', '-s', 'john', '--daemon', '--socket', socket_path]
+    }
+
+
+def time_command(argv, runs):
+    """
+    Run a command repeatedly and measure wall-clock time
+    
+    Returns:
+        Dictionary with median/min seconds and the heavy modules it imported
+    """
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run([sys.executable] + argv, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        timings.append(time.perf_counter() - start)
+    
+    profile = subprocess.run([sys.executable, '-X', 'importtime'] + argv,
+                             stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
+    entries, _ = parse_importtime(profile.stderr)
+    return {
+        'median_s': statistics.median(timings),
+        'min_s': min(timings),
+        'import_ms': sum(self_us for _, self_us, _ in entries) / 1000,
+        'heavy_modules': [name for name, _, _ in entries if name in HEAVY_MODULES]
+    }
+
+
+def main():
+    """Command-line entry point"""
+    parser = argparse.ArgumentParser(description="Check startup time of the fast CLI paths against budgets")
+    parser.add_argument("--runs", type=int, default=7, help="Runs per command (median is compared)")
+    parser.add_argument("--output", help="Write results as JSON to this file")
+    args = parser.parse_args()
+    
+    socket_path = os.path.join(tempfile.gettempdir(), f"excelsearch-bench-{os.getpid()}.sock")
+    results = []
+    for name, argv in startup_commands(socket_path).items():
+        result = time_command(argv, args.runs)
+        result.update({
+            'path': name,
+            'budget_s': STARTUP_BUDGETS[name],
+            'within_budget': result['median_s'] <= STARTUP_BUDGETS[name] and not result['heavy_modules']
+        })
+        results.append(result)
+    
+    report = {'python': sys.version.split()[0], 'runs': args.runs, 'results': results}
+    print(json.dumps(report, indent=2))
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+    
+    sys.exit(0 if all(result['within_budget'] for result in results) else 1)
+
+
+if __name__ == "__main__":
+    main()
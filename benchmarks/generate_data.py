@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+"""
+Synthetic workbook generator for the benchmark suite
+Writes large .csv/.xlsx datasets with configurable cardinality, string lengths and Unicode mix
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+# Allow importing the application modules from the repository root
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import exporters
+
+# Rows generated and written per chunk
+GENERATE_CHUNK_ROWS = 100000
+
+# Word pools per script; the Unicode mix decides how often non-Latin pools are used
+LATIN_WORDS = ['alpha', 'bravo', 'delta', 'echo', 'harbor', 'silver', 'market', 'orange',
+               'river', 'stone', 'north', 'garden', 'copper', 'violet', 'summit', 'meadow']
+UNICODE_WORDS = {
+    'accented': ['café', 'jalapeño', 'über', 'façade', 'smørrebrød', 'crème', 'naïve', 'Zürich'],
+    'arabic': ['مرحبا', 'القاهرة', 'سوق', 'كتاب', 'شارع', 'مدينة', 'بيت', 'نهر'],
+    'cjk': ['東京', '市場', '銀行', '北京', '서울', '会社', '図書館', '駅前'],
+    'emoji': ['🚀', '📦', '🔍', '✅', '🌍', '💡', '📈', '🎯']
+}
+FIRST_NAMES = ['Alice', 'Bob', 'Carol', 'David', 'Eve', 'Frank', 'Grace', 'Heidi', 'Ivan',
+               'Judy', 'Mallory', 'Niaj', 'Olivia', 'Peggy', 'Rupert', 'Sybil', 'Trent', 'Walter']
+CITIES = ['Paris', 'Rome', 'Oslo', 'Lima', 'Cairo', 'Tokyo', 'Austin', 'Dubai', 'Lagos',
+          'Seoul', 'Quito', 'Perth', 'Hanoi', 'Porto', 'Accra', 'Turin']
+
+
+def make_vocabulary(size, min_length, max_length, unicode_mix, rng):
+    """
+    Build a pool of distinct strings
+    
+    Args:
+        size: Number of distinct strings (the column's cardinality)
+        min_length: Minimum string length in characters
+        max_length: Maximum string length in characters
+        unicode_mix: Fraction of strings that contain non-ASCII words (0-1)
+        rng: numpy random Generator
+    
+    Returns:
+        Object array of unique strings
+    """
+    scripts = list(UNICODE_WORDS)
+    values = []
+    for i in range(size):
+        pool = UNICODE_WORDS[scripts[i % len(scripts)]] if rng.random() < unicode_mix else LATIN_WORDS
+        target = int(rng.integers(min_length, max_length + 1))
+        words = []
+        length = 0
+        while length < target:
+            word = pool[int(rng.integers(len(pool)))] if words else LATIN_WORDS[int(rng.integers(len(LATIN_WORDS)))]
+            words.append(word)
+            length += len(word) + 1
+        # The numeric suffix keeps values distinct; trimming keeps lengths in range
+        suffix = f" {i}"
+        text = ' '.join(words)[:max(1, target - len(suffix))]
+        values.append(text + suffix)
+    return np.array(values, dtype=object)
+
+
+def generate_chunks(rows, cardinality, min_length, max_length, unicode_mix, null_fraction,
+                    seed, chunk_rows=GENERATE_CHUNK_ROWS):
+    """
+    Yield DataFrame chunks of synthetic people/transactions data
+    
+    Columns:
+        ID: unique integer; Name: person names (high cardinality);
+        City: 16 values; Category: ``cardinality`` distinct strings;
+        Email: unique; Notes: free text of the requested length and Unicode mix;
+        Amount: float with gaps; Date: timestamps
+    """
+    rng = np.random.default_rng(seed)
+    categories = make_vocabulary(cardinality, min_length, max_length, unicode_mix, rng)
+    notes_pool = make_vocabulary(max(cardinality, 5000), min_length, max_length, unicode_mix, rng)
+    first_names = np.array(FIRST_NAMES, dtype=object)
+    cities = np.array(CITIES, dtype=object)
+    
+    for start in range(0, rows, chunk_rows):
+        n = min(chunk_rows, rows - start)
+        ids = np.arange(start, start + n)
+        names = pd.Series(first_names[rng.integers(0, len(first_names), n)]) + ' ' + \
+            pd.Series(rng.integers(0, max(cardinality, 1) * 10, n)).astype(str)
+        notes = pd.Series(notes_pool[rng.integers(0, len(notes_pool), n)])
+        notes[rng.random(n) < null_fraction] = None
+        amounts = rng.gamma(2.0, 150.0, n).round(2)
+        amounts[rng.random(n) < null_fraction] = np.nan
+        
+        yield pd.DataFrame({
+            'ID': ids,
+            'Name': names,
+            'City': cities[rng.integers(0, len(cities), n)],
+            'Category': categories[rng.integers(0, len(categories), n)],
+            'Email': [f"user{i}@example.com" for i in ids],
+            'Notes': notes,
+            'Amount': amounts,
+            'Date': pd.Timestamp('2015-01-01') + pd.to_timedelta(rng.integers(0, 3650 * 24, n), unit='h')
+        })
+
+
+def generate_file(output_path, rows, cardinality=1000, min_length=8, max_length=40,
+                  unicode_mix=0.1, null_fraction=0.02, seed=42):
+    """
+    Write a synthetic dataset; the format follows the extension (.csv, .xlsx, ...)
+    
+    Args:
+        output_path: File to create
+        rows: Number of data rows (capped at Excel's limit for .xlsx/.xls)
+        cardinality: Distinct values in the Category column
+        min_length: Minimum length of Category and Notes strings
+        max_length: Maximum length of Category and Notes strings
+        unicode_mix: Fraction of strings with accented, Arabic, CJK or emoji words
+        null_fraction: Fraction of empty Notes and Amount cells
+        seed: Random seed, so the same arguments always produce the same file
+    
+    Returns:
+        Dictionary describing the generated file
+    """
+    file_ext = exporters.export_format(output_path)
+    writer = exporters.WRITERS.get(file_ext)
+    if writer is None:
+        raise ValueError(f"Unsupported format: {file_ext}")
+    if writer is exporters.write_xlsx and rows > exporters.EXCEL_MAX_DATA_ROWS:
+        print(f"⚠️ Excel sheets hold at most {exporters.EXCEL_MAX_DATA_ROWS:,} rows; "
+              f"writing that many instead of {rows:,}", file=sys.stderr)
+        rows = exporters.EXCEL_MAX_DATA_ROWS
+    
+    start = time.perf_counter()
+    chunks = generate_chunks(rows, cardinality, min_length, max_length, unicode_mix,
+                             null_fraction, seed)
+    header = ['ID', 'Name', 'City', 'Category', 'Email', 'Notes', 'Amount', 'Date']
+    writer(output_path, header, chunks)
+    
+    return {
+        'path': output_path,
+        'rows': rows,
+        'cardinality': cardinality,
+        'min_length': min_length,
+        'max_length': max_length,
+        'unicode_mix': unicode_mix,
+        'null_fraction': null_fraction,
+        'seed': seed,
+        'file_mb': os.path.getsize(output_path) / (1024 * 1024),
+        'generate_time_s': time.perf_counter() - start
+    }
+
+
+def main():
+    """Command-line entry point"""
+    parser = argparse.ArgumentParser(description="Generate a synthetic dataset for benchmarks")
+    parser.add_argument("output", help="File to write (.csv, .xlsx, .csv.gz, .parquet, ...)")
+    parser.add_argument("--rows", type=int, default=1000000, help="Data rows (default: 1,000,000)")
+    parser.add_argument("--cardinality", type=int, default=1000,
+                        help="Distinct values in the Category column (default: 1000)")
+    parser.add_argument("--min-length", type=int, default=8, help="Minimum text length (default: 8)")
+    parser.add_argument("--max-length", type=int, default=40, help="Maximum text length (default: 40)")
+    parser.add_argument("--unicode-mix", type=float, default=0.1,
+                        help="Fraction of strings with non-ASCII text, 0-1 (default: 0.1)")
+    parser.add_argument("--null-fraction", type=float, default=0.02,
+                        help="Fraction of empty Notes/Amount cells (default: 0.02)")
+    parser.add_argument("--seed", type=int, default=42, help="Random seed (default: 42)")
+    args = parser.parse_args()
+    
+    if args.min_length < 1 or args.max_length < args.min_length:
+        parser.error("--max-length must be at least --min-length, which must be at least 1")
+    
+    info = generate_file(args.output, args.rows, args.cardinality, args.min_length, args.max_length,
+                         args.unicode_mix, args.null_fraction, args.seed)
+    print(f"✅ Wrote {info['rows']:,} rows ({info['file_mb']:.1f} MB) to {args.output} "
+          f"in {info['generate_time_s']:.1f} seconds")
+
+
+if __name__ == "__main__":
+    main()
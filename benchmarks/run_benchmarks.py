@@ -0,0 +1,243 @@
+#!/usr/bin/env python3
+"""
+Benchmark suite for the search engine
+Times load_file, every search mode, get_column_info and export_results on a
+synthetic dataset and writes machine-readable results for regression tracking
+"""
+
+import argparse
+import json
+import os
+import platform
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+# Allow importing the application modules from the repository root
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from search_engine import ExcelSearchEngine
+from generate_data import generate_file
+
+# Result format version, bumped when fields change meaning
+RESULTS_VERSION = 1
+
+
+def time_call(function, repeat):
+    """
+    Call a function repeatedly and collect wall-clock timings
+    
+    Returns:
+        Tuple of (timing summary dictionary, last return value)
+    """
+    timings = []
+    value = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        value = function()
+        timings.append(time.perf_counter() - start)
+    return {
+        'repeat': repeat,
+        'min_s': min(timings),
+        'median_s': statistics.median(timings),
+        'mean_s': statistics.fmean(timings),
+        'max_s': max(timings)
+    }, value
+
+
+def search_scenarios(df):
+    """
+    Searches covering each mode, with terms taken from the data so they match
+    
+    Returns:
+        List of (name, search keyword arguments)
+    """
+    middle = len(df) // 2
+    category = str(df['Category'].iloc[middle])
+    first_word = category.split()[0]
+    name = str(df['Name'].iloc[middle])
+    return [
+        ('contains_ignore_case', {'search_term': first_word.upper(), 'search_columns': ['Category']}),
+        ('contains_case_sensitive', {'search_term': first_word, 'search_columns': ['Category'],
+                                     'case_sensitive': True}),
+        ('contains_multi_column', {'search_term': 'river', 'search_columns': ['Category', 'Notes']}),
+        ('exact_match', {'search_term': category, 'search_columns': ['Category'], 'exact_match': True}),
+        ('exact_match_unique', {'search_term': name, 'search_columns': ['Name'], 'exact_match': True,
+                                'case_sensitive': True}),
+        ('regex', {'search_term': r'^user1\d{2}@', 'search_columns': ['Email'], 'use_regex': True}),
+        ('whole_word', {'search_term': first_word, 'search_columns': ['Category'], 'whole_word': True}),
+        ('word_prefix', {'search_term': first_word[:3] + '*', 'search_columns': ['Category', 'Notes'],
+                         'whole_word': True}),
+        ('no_match', {'search_term': 'zzzz-no-such-value', 'search_columns': ['Name', 'Notes']})
+    ]
+
+
+def run_suite(file_path, repeat, export_rows, work_dir):
+    """
+    Run every scenario against one file
+    
+    Returns:
+        List of scenario result dictionaries
+    """
+    results = []
+    file_mb = os.path.getsize(file_path) / (1024 * 1024)
+    
+    # Each load uses a fresh engine so no cached state carries over
+    def load():
+        engine = ExcelSearchEngine()
+        success, message = engine.load_file(file_path)
+        if not success:
+            raise RuntimeError(message)
+        return engine
+    
+    timing, engine = time_call(load, repeat)
+    rows = len(engine.df)
+    timing.update({'scenario': 'load_file', 'rows': rows,
+                   'rows_per_second': rows / timing['median_s'],
+                   'mb_per_second': file_mb / timing['median_s']})
+    results.append(timing)
+    
+    def uncached_search(kwargs):
+        # Drop cached results so every timed run really scans
+        engine._get_cache(engine.df)['results'].clear()
+        return engine.search(max_results=1000, **kwargs)
+    
+    for name, kwargs in search_scenarios(engine.df):
+        # The first run also builds the normalized column caches; it is reported as cold_s
+        engine._cache = None
+        cold, (_, stats) = time_call(lambda: uncached_search(kwargs), 1)
+        if 'error' in stats:
+            raise RuntimeError(f"{name}: {stats['error']}")
+        timing, _ = time_call(lambda: uncached_search(kwargs), repeat)
+        cached, _ = time_call(lambda: engine.search(max_results=1000, **kwargs), 1)
+        timing.update({'scenario': f'search_{name}', 'cold_s': cold['median_s'],
+                       'cached_s': cached['median_s'], 'total_results': stats['total_results'],
+                       'rows_per_second': rows / timing['median_s']})
+        results.append(timing)
+    
+    index_timing, _ = time_call(engine.build_indexes, 1)
+    index_timing['scenario'] = 'build_indexes'
+    results.append(index_timing)
+    for name, kwargs in search_scenarios(engine.df):
+        if kwargs.get('exact_match'):
+            timing, _ = time_call(lambda: uncached_search(kwargs), repeat)
+            timing['scenario'] = f'search_{name}_indexed'
+            results.append(timing)
+    
+    timing, column_info = time_call(engine.get_column_info, repeat)
+    timing.update({'scenario': 'get_column_info', 'columns': len(column_info)})
+    results.append(timing)
+    
+    export_data = engine.df.head(export_rows)
+    for file_ext in ('.csv', '.xlsx'):
+        output_path = os.path.join(work_dir, f"export{file_ext}")
+        timing, (success, message) = time_call(
+            lambda: engine.export_results(export_data, output_path), 1)
+        if not success:
+            raise RuntimeError(message)
+        timing.update({'scenario': f'export_results_{file_ext[1:]}', 'rows': len(export_data),
+                       'rows_per_second': len(export_data) / timing['median_s']})
+        results.append(timing)
+    
+    return results
+
+
+def environment():
+    """Machine and library details stored with the results"""
+    return {
+        'python': platform.python_version(),
+        'pandas': pd.__version__,
+        'numpy': np.__version__,
+        'platform': platform.platform(),
+        'machine': platform.machine(),
+        'cpu_count': os.cpu_count()
+    }
+
+
+def compare(report, baseline, threshold):
+    """
+    Find scenarios that got slower than the baseline by more than threshold
+    
+    Returns:
+        List of regression descriptions
+    """
+    regressions = []
+    for dataset in report['datasets']:
+        base = next((b for b in baseline.get('datasets', []) if b['name'] == dataset['name']), None)
+        if base is None:
+            continue
+        base_times = {r['scenario']: r['median_s'] for r in base['results']}
+        for result in dataset['results']:
+            before = base_times.get(result['scenario'])
+            if before and result['median_s'] > before * (1 + threshold):
+                regressions.append(f"{dataset['name']}/{result['scenario']}: "
+                                   f"{before:.4f}s -> {result['median_s']:.4f}s")
+    return regressions
+
+
+def main():
+    """Command-line entry point"""
+    parser = argparse.ArgumentParser(description="Run the search engine benchmark suite")
+    parser.add_argument("--rows", type=int, default=1000000, help="Rows per generated dataset")
+    parser.add_argument("--formats", default="csv,xlsx",
+                        help="Comma-separated dataset formats to generate (default: csv,xlsx)")
+    parser.add_argument("--xlsx-rows", type=int, default=200000,
+                        help="Rows for the .xlsx dataset, which loads far slower (default: 200,000)")
+    parser.add_argument("--cardinality", type=int, default=1000, help="Distinct Category values")
+    parser.add_argument("--min-length", type=int, default=8, help="Minimum text length")
+    parser.add_argument("--max-length", type=int, default=40, help="Maximum text length")
+    parser.add_argument("--unicode-mix", type=float, default=0.1, help="Fraction of non-ASCII strings")
+    parser.add_argument("--file", action="append", help="Benchmark an existing file instead (repeatable)")
+    parser.add_argument("--repeat", type=int, default=3, help="Timed runs per scenario")
+    parser.add_argument("--export-rows", type=int, default=100000, help="Rows written by export scenarios")
+    parser.add_argument("--output", help="Write results as JSON to this file")
+    parser.add_argument("--baseline", help="Earlier results JSON to compare against")
+    parser.add_argument("--threshold", type=float, default=0.25,
+                        help="Allowed slowdown versus the baseline before failing (default: 0.25)")
+    args = parser.parse_args()
+    
+    work_dir = tempfile.mkdtemp()
+    report = {'version': RESULTS_VERSION, 'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+              'environment': environment(), 'datasets': []}
+    try:
+        datasets = []
+        for file_path in args.file or []:
+            datasets.append({'name': os.path.basename(file_path), 'path': file_path})
+        if not args.file:
+            for file_format in [f.strip() for f in args.formats.split(',') if f.strip()]:
+                rows = args.xlsx_rows if file_format in ('xlsx', 'xls') else args.rows
+                path = os.path.join(work_dir, f"bench.{file_format}")
+                print(f"📝 Generating {rows:,} rows of {file_format}...", file=sys.stderr)
+                info = generate_file(path, rows, args.cardinality, args.min_length, args.max_length,
+                                     args.unicode_mix)
+                datasets.append({'name': f"synthetic.{file_format}", 'path': path, 'generator': info})
+        
+        for dataset in datasets:
+            print(f"⏱️ Benchmarking {dataset['name']}...", file=sys.stderr)
+            entry = {key: value for key, value in dataset.items() if key != 'path'}
+            entry['file_mb'] = os.path.getsize(dataset['path']) / (1024 * 1024)
+            entry['results'] = run_suite(dataset['path'], args.repeat, args.export_rows, work_dir)
+            report['datasets'].append(entry)
+    finally:
+        shutil.rmtree(work_dir)
+    
+    print(json.dumps(report, indent=2, default=str))
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2, default=str)
+    
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            regressions = compare(report, json.load(f), args.threshold)
+        for regression in regressions:
+            print(f"❌ Regression: {regression}", file=sys.stderr)
+        sys.exit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
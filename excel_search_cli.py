@@ -7,16 +7,45 @@ Ultra-fast searching for power users and automation
 import argparse
 import os
 import sys
+import json
+import time
 from datetime import datetime
-from search_engine import ExcelSearchEngine
+from search_daemon import SearchDaemon, daemon_request, DEFAULT_SOCKET_PATH
+from search_service import DEFAULT_HOST, DEFAULT_PORT
+from version import __version__
+
+# pandas (via search_engine), the HTTP server and thread pools are imported where
+# they are used, so --help, --version and daemon client searches start quickly
+
+# Result rows printed after a search
+DISPLAY_ROWS = 10
 
 class ExcelSearchCLI:
     """Command-line interface for Excel database searching"""
     
-    def __init__(self):
-        self.search_engine = ExcelSearchEngine()
+    def __init__(self, backend='pandas', database=None):
+        """
+        Args:
+            backend: 'pandas' keeps the data in memory, 'sqlite' in an indexed SQLite database
+            database: SQLite database file for the sqlite backend (default: a temporary file)
+        """
+        self.backend = backend
+        self.database = database
+        self._search_engine = None
         self.last_results = None
     
+    @property
+    def search_engine(self):
+        """Search engine, created on first use so pandas only loads when data does"""
+        if self._search_engine is None:
+            if self.backend == 'sqlite':
+                from sqlite_backend import SQLiteSearchEngine
+                self._search_engine = SQLiteSearchEngine(self.database)
+            else:
+                from search_engine import ExcelSearchEngine
+                self._search_engine = ExcelSearchEngine()
+        return self._search_engine
+    
     def print_header(self):
         """Print application header"""
         print("🔍 EXCEL DATABASE SEARCH TOOL - CLI")
@@ -53,21 +82,44 @@ class ExcelSearchCLI:
             else:
                 print(f"❌ {message}\n")
     
+    @staticmethod
+    def load_options(args):
+        """load_file keyword arguments for --load-columns, --lazy and --compact"""
+        lazy = getattr(args, 'lazy', False)
+        columns = getattr(args, 'load_columns', None)
+        if lazy and columns is None:
+            # Load the searched columns; load_file defaults to the first two
+            columns = args.columns
+        return {'columns': columns, 'lazy': lazy, 'compact': getattr(args, 'compact', False)}
+    
     def print_file_summary(self):
         """Print loaded file summary"""
-        file_info = self.search_engine.get_file_info()
+        file_info = self.search_engine.get_file_info(include_memory=True)
         
         print(f"\n📊 FILE SUMMARY:")
         print(f"   📏 Size: {file_info['file_size_mb']:.2f} MB")
         print(f"   📐 Dimensions: {file_info['rows']:,} rows × {file_info['columns']} columns")
         print(f"   ⏱️  Load time: {file_info['load_time']:.2f} seconds")
+        if file_info.get('lazy_columns'):
+            print(f"   💤 Not loaded yet: {len(file_info['lazy_columns'])} columns (read when needed)")
+        if 'memory' in file_info:
+            from utils import format_memory_usage
+            print(f"   💾 Memory: {format_memory_usage(file_info['memory'])}")
+        if file_info.get('database'):
+            print(f"   🗄️  SQLite database: {file_info['database']} ({file_info['database_mb']:.2f} MB)")
+        if file_info.get('compaction'):
+            from utils import format_file_size
+            compaction = file_info['compaction']
+            print(f"   🗜️  Compacted: {format_file_size(compaction['before_bytes'])} → "
+                  f"{format_file_size(compaction['after_bytes'])} "
+                  f"({len(compaction['columns'])} columns converted)")
         print(f"   🗂️  Columns: {', '.join(file_info['column_names'][:5])}")
         if len(file_info['column_names']) > 5:
             print(f"            ... and {len(file_info['column_names']) - 5} more")
         print()
     
-    def interactive_mode(self):
-        """Run in interactive mode"""
+    def interactive_mode(self, watch=False):
+        """Run in interactive mode; with watch set the file is reloaded whenever it changes"""
         self.print_header()
         
         # Load file
@@ -75,6 +127,10 @@ class ExcelSearchCLI:
             print("👋 Goodbye!")
             return
         
+        if watch:
+            self.toggle_watch()
+            print()
+        
         print("🎯 INTERACTIVE SEARCH MODE")
         print("-" * 30)
         print("Commands:")
@@ -83,9 +139,13 @@ class ExcelSearchCLI:
         print("  search <term> -e                 - Exact match")
         print("  search <term> -i                 - Case insensitive")
         print("  search <term> -r                 - Regex search")
+        print("  search <term> -w                 - Whole words (end with * for prefixes)")
         print("  columns                          - Show all columns")
         print("  info                             - Show file information")
         print("  export <filename>                - Export last results")
+        print("  stats                            - Show latency percentiles (with --instrument)")
+        print("  reload                           - Pick up changes to the file")
+        print("  watch                            - Reload automatically when the file changes (on/off)")
         print("  help                             - Show this help")
         print("  quit                             - Exit")
         print()
@@ -109,6 +169,16 @@ class ExcelSearchCLI:
                 elif command.lower() == 'info':
                     self.show_file_info()
                 
+                elif command.lower() == 'stats':
+                    self.show_instrumentation_stats()
+                
+                elif command.lower() == 'reload':
+                    success, message = self.search_engine.refresh()
+                    print(f"{'✅' if success else '❌'} {message}\n")
+                
+                elif command.lower() == 'watch':
+                    self.toggle_watch()
+                
                 elif command.startswith('export '):
                     filename = command[7:].strip()
                     self.export_last_results(filename)
@@ -127,43 +197,35 @@ class ExcelSearchCLI:
             except Exception as e:
                 print(f"❌ Error: {e}")
     
+    def toggle_watch(self):
+        """Start or stop reloading the loaded file in the background when it changes"""
+        engine = self.search_engine
+        if engine.watching:
+            engine.stop_watching()
+            print("⏹️  Stopped watching for file changes")
+            return
+        
+        def report(success, message):
+            # Printed from the watcher thread, possibly while a command is being typed
+            print(f"\n🔄 File changed: {'✅' if success else '❌'} {message}")
+        
+        success, message = engine.watch(report)
+        print(f"{'👀' if success else '❌'} {message}")
+    
     def process_search_command(self, args_str):
         """Process search command with arguments"""
         if not args_str.strip():
             print("❌ Please provide a search term")
             return
         
-        # Parse arguments
-        args = args_str.split()
-        search_term = args[0]
-        
-        # Default parameters
-        columns = None
-        case_sensitive = True  # Default to case sensitive
-        exact_match = False
-        use_regex = False
-        
-        # Parse flags
-        i = 1
-        while i < len(args):
-            if args[i] == '-c' and i + 1 < len(args):
-                # Column specification
-                i += 1
-                columns = []
-                while i < len(args) and not args[i].startswith('-'):
-                    columns.append(args[i])
-                    i += 1
-            elif args[i] == '-e':
-                exact_match = True
-                i += 1
-            elif args[i] == '-i':
-                case_sensitive = False
-                i += 1
-            elif args[i] == '-r':
-                use_regex = True
-                i += 1
-            else:
-                i += 1
+        query = self.parse_search_args(args_str)
+        search_term = query['search_term']
+        columns = query['columns']
+        case_sensitive = query['case_sensitive']
+        exact_match = query['exact_match']
+        use_regex = query['use_regex']
+        whole_word = query['whole_word']
+        explain = query['explain']
         
         # Default to first 2 columns if none specified
         if columns is None:
@@ -187,7 +249,9 @@ class ExcelSearchCLI:
             search_columns=columns,
             case_sensitive=case_sensitive,
             exact_match=exact_match,
-            use_regex=use_regex
+            use_regex=use_regex,
+            explain=explain,
+            whole_word=whole_word
         )
         
         if 'error' in stats:
@@ -195,30 +259,102 @@ class ExcelSearchCLI:
             return
         
         # Display results
-        self.display_search_results(results, stats)
+        self.display_search_results(results, stats, self.search_engine)
+        if explain:
+            self.print_search_explain(stats)
         self.last_results = results
     
-    def display_search_results(self, results, stats):
-        """Display search results"""
+    def parse_search_args(self, args_str, case_sensitive=True):
+        """
+        Parse "<term> [-c col1 col2] [-e] [-i] [-r] [-w] [-x]" into search options
+        
+        Args:
+            args_str: Search command text without the leading "search"
+            case_sensitive: Case sensitivity when -i is not given
+            
+        Returns:
+            Dictionary with search_term, columns (None for default),
+            case_sensitive, exact_match, use_regex, whole_word and explain
+        """
+        # Parse arguments
+        args = args_str.split()
+        query = {
+            'search_term': args[0],
+            'columns': None,
+            'case_sensitive': case_sensitive,
+            'exact_match': False,
+            'use_regex': False,
+            'whole_word': False,
+            'explain': False
+        }
+        
+        # Parse flags
+        i = 1
+        while i < len(args):
+            if args[i] == '-c' and i + 1 < len(args):
+                # Column specification
+                i += 1
+                query['columns'] = []
+                while i < len(args) and not args[i].startswith('-'):
+                    query['columns'].append(args[i])
+                    i += 1
+            elif args[i] == '-e':
+                query['exact_match'] = True
+                i += 1
+            elif args[i] == '-i':
+                query['case_sensitive'] = False
+                i += 1
+            elif args[i] == '-r':
+                query['use_regex'] = True
+                i += 1
+            elif args[i] == '-w':
+                query['whole_word'] = True
+                i += 1
+            elif args[i] in ('-x', '--explain'):
+                query['explain'] = True
+                i += 1
+            else:
+                i += 1
+        
+        return query
+    
+    def display_search_results(self, results, stats, engine=None):
+        """Display search results, reading lazily loaded columns of engine for the shown rows"""
         print(f"✅ Found {stats['total_results']:,} results in {stats['search_time']:.3f} seconds")
         
         if stats['total_results'] == 0:
             print("🔍 No matches found")
             return
         
-        # Show first few results
-        display_limit = 10
-        print(f"\n📋 Results (showing first {min(len(results), display_limit)}):")
+        shown = results.head(DISPLAY_ROWS)
+        if engine is not None:
+            shown = engine.complete_rows(shown)
+        self.print_results_table(shown.columns.tolist(), shown.values.tolist(),
+                                 stats.get('returned_results', len(results)))
+    
+    @staticmethod
+    def count_exported_results(stats, max_results):
+        """Report the rows written by an -o export as the returned results, since only the shown rows were built"""
+        total = stats['total_results']
+        stats['returned_results'] = min(total, max_results) if max_results else total
+    
+    def print_search_explain(self, stats):
+        """Print the per-phase and per-column timing breakdown of a search"""
+        from utils import format_search_breakdown
+        
+        print("\n🔬 Search breakdown:")
+        for line in format_search_breakdown(stats):
+            print(f"  {line}")
+    
+    def print_results_table(self, columns, rows, returned_count):
+        """Print the first result rows as a fixed-width table"""
+        print(f"\n📋 Results (showing first {len(rows)}):")
         print("-" * 80)
         
         # Get column widths for formatting
-        columns = results.columns.tolist()
         col_widths = {}
-        for col in columns:
-            max_width = max(
-                len(str(col)),
-                results[col].astype(str).str.len().max() if len(results) > 0 else 0
-            )
+        for i, col in enumerate(columns):
+            max_width = max([len(str(col))] + [len(str(row[i])) for row in rows])
             col_widths[col] = min(max_width, 20)  # Limit column width
         
         # Print header
@@ -227,15 +363,15 @@ class ExcelSearchCLI:
         print("-" * len(header))
         
         # Print rows
-        for i, (_, row) in enumerate(results.head(display_limit).iterrows()):
+        for row in rows:
             row_str = " | ".join(
-                f"{str(row[col]):<{col_widths[col]}}"[:col_widths[col]]
-                for col in columns
+                f"{str(value):<{col_widths[col]}}"[:col_widths[col]]
+                for col, value in zip(columns, row)
             )
             print(row_str)
         
-        if len(results) > display_limit:
-            print(f"... and {len(results) - display_limit:,} more results")
+        if returned_count > len(rows):
+            print(f"... and {returned_count - len(rows):,} more results")
     
     def show_columns(self):
         """Show all available columns"""
@@ -246,7 +382,7 @@ class ExcelSearchCLI:
     
     def show_file_info(self):
         """Show detailed file information"""
-        file_info = self.search_engine.get_file_info()
+        file_info = self.search_engine.get_file_info(include_memory=True)
         column_info = self.search_engine.get_column_info()
         
         print("📊 DETAILED FILE INFORMATION")
@@ -256,6 +392,9 @@ class ExcelSearchCLI:
         print(f"📏 Size: {file_info['file_size_mb']:.2f} MB")
         print(f"⏱️  Load Time: {file_info['load_time']:.2f} seconds")
         print(f"📐 Dimensions: {file_info['rows']:,} rows × {file_info['columns']} columns")
+        if 'memory' in file_info:
+            from utils import format_memory_usage
+            print(f"💾 Memory: {format_memory_usage(file_info['memory'])}")
         print(f"🕒 Loaded: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
         
         print(f"\n📋 COLUMN DETAILS")
@@ -293,6 +432,18 @@ class ExcelSearchCLI:
         else:
             print(f"❌ {message}")
     
+    def show_instrumentation_stats(self):
+        """Show latency histograms and slow-query counts"""
+        instrumentation = self.search_engine.instrumentation
+        if instrumentation is None:
+            print("ℹ️ Instrumentation is off. Start with --instrument to record latencies")
+            return
+        
+        print("⏱️ LATENCY STATISTICS")
+        print("-" * 70)
+        for line in instrumentation.format_report():
+            print(line)
+    
     def show_help(self):
         """Show help information"""
         print("🎯 COMMAND HELP")
@@ -304,11 +455,18 @@ class ExcelSearchCLI:
         print("  search 'John Doe' -e             - Exact match")
         print("  search user@email.com -c Email   - Search in Email column")
         print("  search '^\\d+$' -r               - Regex search")
+        print("  search john -w                   - Whole word: John Smith, not Johnson")
+        print("  search smi* -w                   - Words starting with smi")
+        print("  search john -x                   - Show timing breakdown (explain)")
         print()
         print("Other Commands:")
         print("  columns                          - List all columns")
         print("  info                             - Show file details")
         print("  export results.xlsx              - Export last results")
+        print("  export results.parquet           - Also .csv, .csv.gz, .csv.zst, .jsonl, .feather, .arrow")
+        print("  stats                            - Show load/search/export latency percentiles")
+        print("  reload                           - Pick up file changes (appended CSV rows load incrementally)")
+        print("  watch                            - Toggle reloading in the background whenever the file changes")
         print("  help                             - Show this help")
         print("  quit                             - Exit program")
     
@@ -318,9 +476,14 @@ class ExcelSearchCLI:
             print("❌ Please provide a file path")
             return False
         
+        if getattr(args, 'out_of_core', False):
+            return self.run_out_of_core_search(args)
+        if getattr(args, 'all_sheets', False):
+            return self.run_workbook_search(args)
+        
         # Load file
         print(f"📥 Loading file: {args.file}")
-        success, message = self.search_engine.load_file(args.file)
+        success, message = self.search_engine.load_file(args.file, **self.load_options(args))
         
         if not success:
             print(f"❌ {message}")
@@ -331,14 +494,19 @@ class ExcelSearchCLI:
         # Determine search columns
         columns = args.columns if args.columns else self.search_engine.get_file_info()['column_names'][:2]
         
-        # Perform search
+        # Perform search; with -o only the rows shown are built, the export streams by position
+        max_results = args.max_results
+        if args.output:
+            max_results = min(max_results, DISPLAY_ROWS) if max_results else DISPLAY_ROWS
         results, stats = self.search_engine.search(
             search_term=args.search,
             search_columns=columns,
             case_sensitive=not args.ignore_case,
             exact_match=args.exact,
             use_regex=args.regex,
-            max_results=args.max_results
+            max_results=max_results,
+            explain=args.explain,
+            whole_word=args.whole_word
         )
         
         if 'error' in stats:
@@ -346,17 +514,323 @@ class ExcelSearchCLI:
             return False
         
         # Display results
-        self.display_search_results(results, stats)
+        if args.output:
+            self.count_exported_results(stats, args.max_results)
+        self.display_search_results(results, stats, self.search_engine)
+        if args.explain:
+            self.print_search_explain(stats)
         
         # Export if requested
         if args.output:
-            success, message = self.search_engine.export_results(results, args.output)
+            # Answered from the result cache filled by the search above
+            positions, _ = self.search_engine.search_positions(
+                args.search, columns, not args.ignore_case, args.exact, args.regex,
+                whole_word=args.whole_word)
+            if args.max_results:
+                positions = positions[:args.max_results]
+            success, message = self.search_engine.export_rows(positions, args.output)
             if success:
                 print(f"\n✅ {message}")
             else:
                 print(f"\n❌ {message}")
         
         return True
+    
+    def run_out_of_core_search(self, args):
+        """Search a file chunk by chunk without loading it (--out-of-core)"""
+        print(f"📥 Searching without loading: {args.file}")
+        
+        def show_progress(progress):
+            print(f"\r⏳ {progress['percent']:.0f}% · {progress['rows_scanned']:,} rows · "
+                  f"{progress['matches']:,} matches · {progress['mb_per_second']:.1f} MB/s",
+                  end='', flush=True)
+        
+        # Matches go straight to --output; only the rows shown are kept in memory
+        results, stats = self.search_engine.search_file(
+            args.file,
+            search_term=args.search,
+            search_columns=args.columns,
+            case_sensitive=not args.ignore_case,
+            exact_match=args.exact,
+            use_regex=args.regex,
+            output_path=args.output,
+            max_results=args.max_results or 10,
+            progress_callback=show_progress,
+            whole_word=args.whole_word
+        )
+        print()
+        
+        if 'error' in stats:
+            print(f"❌ {stats['error']}")
+            return False
+        
+        self.display_search_results(results, stats)
+        print(f"\n⚡ Scanned {stats['bytes_read'] / (1024 * 1024):,.1f} MB, {stats['rows_scanned']:,} rows "
+              f"at {stats['mb_per_second']:.1f} MB/s ({stats['rows_per_second']:,.0f} rows/s)")
+        if args.output:
+            print(f"✅ Wrote {stats['total_results']:,} matches to {args.output}")
+        return True
+    
+    def run_workbook_search(self, args):
+        """Search every sheet of a workbook (--all-sheets)"""
+        from workbook_search import WorkbookSearch
+        
+        print(f"📥 Loading all sheets: {args.file}")
+        workbook = WorkbookSearch()
+        success, message = workbook.load_workbook(args.file)
+        if not success:
+            print(f"❌ {message}")
+            return False
+        print(f"✅ {message}")
+        
+        try:
+            results, stats = workbook.search(
+                search_term=args.search,
+                search_columns=args.columns,
+                case_sensitive=not args.ignore_case,
+                exact_match=args.exact,
+                use_regex=args.regex,
+                max_results=args.max_results,
+                whole_word=args.whole_word,
+                output_path=args.output,
+                return_rows=DISPLAY_ROWS if args.output else None
+            )
+            if 'error' in stats:
+                print(f"❌ {stats['error']}")
+                return False
+            
+            if args.output:
+                self.count_exported_results(stats, args.max_results)
+            self.display_search_results(results, stats)
+            print("\n📑 Matches per sheet:")
+            for name, sheet in stats['sheets'].items():
+                print(f"   {name}: {sheet['total_results']:,} ({', '.join(map(str, sheet['search_columns']))})")
+            
+            if args.output:
+                print(f"\n{'✅' if stats['export']['ok'] else '❌'} {stats['export']['message']}")
+            return True
+        finally:
+            workbook.close()
+    
+    def run_folder_search(self, args):
+        """Catalog a folder and search every file in it (--dir)"""
+        from folder_catalog import FolderCatalog
+        
+        catalog = FolderCatalog(args.catalog) if args.catalog else FolderCatalog()
+        try:
+            print(f"📂 Scanning folder: {args.dir}")
+            scan = catalog.scan(args.dir)
+            if 'error' in scan:
+                print(f"❌ {scan['error']}")
+                return False
+            print(f"✅ {scan['files']:,} files ({scan['scanned']:,} read, {scan['unchanged']:,} unchanged, "
+                  f"{scan['removed']:,} removed) in {scan['scan_time']:.2f} seconds")
+            if scan['errors']:
+                print(f"⚠️ {scan['errors']:,} files could not be read")
+            
+            if not args.search:
+                for entry in catalog.files(args.dir):
+                    sheets = ', '.join(f"{sheet['name'] or 'data'} ({sheet['rows']:,} rows)"
+                                       for sheet in entry['sheets'])
+                    print(f"   📄 {os.path.relpath(entry['path'], args.dir)}: {sheets or entry['error']}")
+                return True
+            
+            results, stats = catalog.search(
+                args.dir,
+                search_term=args.search,
+                search_columns=args.columns,
+                case_sensitive=not args.ignore_case,
+                exact_match=args.exact,
+                use_regex=args.regex,
+                max_results=args.max_results,
+                whole_word=args.whole_word,
+                output_path=args.output,
+                return_rows=DISPLAY_ROWS if args.output else None
+            )
+            if 'error' in stats:
+                print(f"❌ {stats['error']}")
+                return False
+            
+            if args.output:
+                self.count_exported_results(stats, args.max_results)
+            self.display_search_results(results, stats)
+            print(f"\n📂 Searched {stats['files_searched']:,} files, skipped {stats['files_skipped']:,} "
+                  f"without the requested columns")
+            for path, error in stats.get('file_errors', {}).items():
+                print(f"   ⚠️ {os.path.relpath(path, args.dir)}: {error}")
+            for path, sheet_errors in stats.get('sheet_errors', {}).items():
+                for sheet, error in sheet_errors.items():
+                    print(f"   ⚠️ {os.path.relpath(path, args.dir)} [{sheet}]: {error}")
+            
+            if args.output:
+                print(f"\n{'✅' if stats['export']['ok'] else '❌'} {stats['export']['message']}")
+            return True
+        finally:
+            catalog.close()
+    
+    def run_batch_queries(self, args):
+        """
+        Run every query from a file (or stdin) against one loaded file
+        
+        Each non-empty line is either a JSON object (term, columns, case_sensitive,
+        exact_match, use_regex, whole_word, max_results) or text in the interactive
+        search syntax: "<term> [-c col1 col2] [-e] [-i] [-r] [-w]". Lines starting with # are
+        skipped. One JSON Lines record per query is written in input order.
+        """
+        if not args.file:
+            print("❌ Please provide a file path", file=sys.stderr)
+            return False
+        
+        try:
+            if args.queries == '-':
+                lines = sys.stdin.read().splitlines()
+            else:
+                with open(args.queries, 'r', encoding='utf-8') as f:
+                    lines = f.read().splitlines()
+        except OSError as e:
+            print(f"❌ Could not read queries: {e}", file=sys.stderr)
+            return False
+        
+        queries = [line.strip() for line in lines if line.strip() and not line.strip().startswith('#')]
+        
+        # Progress goes to stderr so stdout carries only JSON Lines
+        print(f"📥 Loading file: {args.file}", file=sys.stderr)
+        success, message = self.search_engine.load_file(args.file, **self.load_options(args))
+        if not success:
+            print(f"❌ {message}", file=sys.stderr)
+            return False
+        print(f"✅ {message}", file=sys.stderr)
+        
+        default_columns = args.columns or self.search_engine.get_file_info()['column_names'][:2]
+        explain = getattr(args, 'explain', False)
+        whole_word = getattr(args, 'whole_word', False)
+        
+        def run_query(line):
+            start_time = time.time()
+            record = {'query': line}
+            try:
+                if line.startswith('{'):
+                    spec = json.loads(line)
+                    query = {
+                        'search_term': spec['term'],
+                        'columns': spec.get('columns'),
+                        'case_sensitive': spec.get('case_sensitive', not args.ignore_case),
+                        'exact_match': spec.get('exact_match', args.exact),
+                        'use_regex': spec.get('use_regex', args.regex),
+                        'whole_word': spec.get('whole_word', whole_word)
+                    }
+                    max_results = spec.get('max_results', args.max_results)
+                else:
+                    query = self.parse_search_args(line, case_sensitive=not args.ignore_case)
+                    query['exact_match'] = query['exact_match'] or args.exact
+                    query['use_regex'] = query['use_regex'] or args.regex
+                    query['whole_word'] = query['whole_word'] or whole_word
+                    max_results = args.max_results
+                
+                results, stats = self.search_engine.search(
+                    search_term=query['search_term'],
+                    search_columns=query['columns'] or default_columns,
+                    case_sensitive=query['case_sensitive'],
+                    exact_match=query['exact_match'],
+                    use_regex=query['use_regex'],
+                    max_results=max_results,
+                    explain=explain,
+                    whole_word=query['whole_word']
+                )
+                
+                if 'error' in stats:
+                    record['error'] = stats['error']
+                else:
+                    record.update({
+                        'term': query['search_term'],
+                        'columns': query['columns'] or default_columns,
+                        'total_results': stats['total_results'],
+                        'returned_results': stats.get('returned_results', len(results)),
+                        'search_time': stats.get('search_time', 0.0),
+                        **({'phases': stats.get('phases'), 'explain': stats.get('explain')} if explain else {}),
+                        # to_json handles NaN, numpy and timestamp values
+                        'rows': json.loads(self.search_engine.complete_rows(results).to_json(
+                            orient='records', date_format='iso'))
+                    })
+            except (ValueError, KeyError) as e:
+                record['error'] = f"Invalid query: {e}"
+            except Exception as e:
+                record['error'] = f"Query failed: {e}"
+            record['elapsed'] = time.time() - start_time
+            return record
+        
+        output = open(args.batch_output, 'w', encoding='utf-8') if args.batch_output else sys.stdout
+        failed = 0
+        batch_start = time.time()
+        pool = None
+        try:
+            if args.workers > 1:
+                from concurrent.futures import ThreadPoolExecutor
+                pool = ThreadPoolExecutor(max_workers=args.workers)
+                records = pool.map(run_query, queries)
+            else:
+                records = map(run_query, queries)
+            
+            # Records are written in input order as soon as each one is ready
+            for record in records:
+                failed += 'error' in record
+                output.write(json.dumps(record, ensure_ascii=False, default=str) + '\n')
+        finally:
+            if pool is not None:
+                pool.shutdown()
+            if output is not sys.stdout:
+                output.close()
+        
+        print(f"✅ Ran {len(queries):,} queries in {time.time() - batch_start:.2f} seconds"
+              f" ({failed} failed)", file=sys.stderr)
+        return failed == 0
+    
+    def run_daemon_search(self, args):
+        """Run single search through a running query daemon"""
+        if not args.file:
+            print("❌ Please provide a file path")
+            return False
+        
+        request = {
+            'op': 'search',
+            'file': os.path.abspath(args.file),
+            'term': args.search,
+            'columns': args.columns,
+            'case_sensitive': not args.ignore_case,
+            'exact_match': args.exact,
+            'use_regex': args.regex,
+            'whole_word': args.whole_word,
+            'max_results': args.max_results,
+            'explain': args.explain,
+            'output': os.path.abspath(args.output) if args.output else None
+        }
+        
+        try:
+            response = daemon_request(args.socket, request)
+        except OSError as e:
+            print(f"❌ Could not reach query daemon at {args.socket}: {e}")
+            print("   Start one with: python excel_search_cli.py --serve-daemon")
+            return False
+        
+        if not response['ok']:
+            print(f"❌ {response['error']}")
+            return False
+        
+        stats = response['stats']
+        print(f"✅ Found {stats['total_results']:,} results in {stats['search_time']:.3f} seconds")
+        if stats['total_results'] == 0:
+            print("🔍 No matches found")
+        else:
+            self.print_results_table(response['columns'], response['rows'], stats['returned_results'])
+        if args.explain:
+            self.print_search_explain(stats)
+        
+        if 'export' in response:
+            export = response['export']
+            print(f"\n{'✅' if export['ok'] else '❌'} {export['message']}")
+            return export['ok']
+        
+        return True
 
 def main():
     """Main entry point"""
@@ -366,8 +840,22 @@ def main():
         epilog="""
 Examples:
   python excel_search_cli.py --interactive
+  python excel_search_cli.py --interactive --watch
   python excel_search_cli.py data.xlsx -s "john" -i
   python excel_search_cli.py data.xlsx -s "user@email.com" -c Email -o results.xlsx
+  python excel_search_cli.py data.xlsx -s "smi*" -c Name -i -w
+  python excel_search_cli.py --serve-daemon data.xlsx
+  python excel_search_cli.py data.xlsx -s "john" -i --daemon
+  python excel_search_cli.py --serve-http data.xlsx --port 8765
+  python excel_search_cli.py --serve-daemon data.xlsx --persist-indexes
+  python excel_search_cli.py data.xlsx --queries queries.txt --workers 4 > results.jsonl
+  python excel_search_cli.py data.feather -s "john" -c Name --load-columns Name Email
+  python excel_search_cli.py wide.csv -s "john" -c Name --lazy -o results.csv
+  python excel_search_cli.py data.xlsx -s "paris" -c City --compact
+  python excel_search_cli.py huge.csv -s "john" -c Name --out-of-core -o matches.csv
+  python excel_search_cli.py huge.csv -s "john" -c Name --backend sqlite --database huge.sqlite
+  python excel_search_cli.py workbook.xlsx -s "paris" --all-sheets
+  python excel_search_cli.py --dir reports/ -s "ACME Corp" -c Customer -i
         """
     )
     
@@ -377,17 +865,144 @@ Examples:
     parser.add_argument("-e", "--exact", action="store_true", help="Exact match")
     parser.add_argument("-i", "--ignore-case", action="store_true", help="Case insensitive")
     parser.add_argument("-r", "--regex", action="store_true", help="Use regex")
+    parser.add_argument("-w", "--whole-word", action="store_true",
+                        help="Match whole words; end the term with * to match words starting with it")
     parser.add_argument("-o", "--output", help="Output file for results")
     parser.add_argument("-m", "--max-results", type=int, help="Maximum results to show")
     parser.add_argument("--interactive", action="store_true", help="Interactive mode")
+    parser.add_argument("--explain", action="store_true",
+                        help="Show per-phase timings and how each column was searched")
+    parser.add_argument("--queries", metavar="FILE",
+                        help="Run one query per line from FILE ('-' for stdin), writing JSON Lines")
+    parser.add_argument("--batch-output", metavar="FILE", help="JSON Lines output for --queries (default: stdout)")
+    parser.add_argument("--workers", type=int, default=1, help="Parallel queries for --queries (default: 1)")
+    parser.add_argument("--serve-daemon", action="store_true",
+                        help="Run a query daemon that keeps files loaded (file argument is preloaded)")
+    parser.add_argument("--daemon", action="store_true",
+                        help="Send the search to a running query daemon instead of loading the file")
+    parser.add_argument("--stop-daemon", action="store_true", help="Stop a running query daemon")
+    parser.add_argument("--socket", default=DEFAULT_SOCKET_PATH,
+                        help=f"Query daemon socket path (default: {DEFAULT_SOCKET_PATH})")
+    parser.add_argument("--serve-http", action="store_true",
+                        help="Run the HTTP/JSON search API (file argument is preloaded)")
+    parser.add_argument("--host", default=DEFAULT_HOST, help=f"HTTP API host (default: {DEFAULT_HOST})")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help=f"HTTP API port (default: {DEFAULT_PORT})")
+    parser.add_argument("--export-dir", metavar="FOLDER",
+                        help="With --serve-http, allow server-side exports ('output') into FOLDER only "
+                             "(default: server-side exports disabled)")
+    parser.add_argument("--instrument", action="store_true",
+                        help="Record load/search/export latency histograms and log slow queries")
+    parser.add_argument("--slow-query-ms", type=float, default=500,
+                        help="With --instrument, log searches at least this slow (default: 500)")
+    parser.add_argument("--slow-query-log", metavar="FILE",
+                        help="With --instrument, rotating slow-query log (default: ~/.excelsearchpro/slow_queries.log)")
+    parser.add_argument("--load-columns", nargs='+', metavar="COLUMN",
+                        help="Only read these columns from the file")
+    parser.add_argument("--lazy", action="store_true",
+                        help="Load only the searched columns (or --load-columns); read the others "
+                             "for matching rows when results are shown or exported")
+    parser.add_argument("--dir", metavar="FOLDER",
+                        help="Catalog every workbook in FOLDER and search them all in parallel")
+    parser.add_argument("--catalog", metavar="FILE",
+                        help="Folder catalog database for --dir (default: ~/.excelsearchpro/catalog.sqlite)")
+    parser.add_argument("--all-sheets", action="store_true",
+                        help="Load every sheet of the workbook (in parallel) and search them all; "
+                             "results get a Sheet column")
+    parser.add_argument("--out-of-core", action="store_true",
+                        help="Search the file chunk by chunk without loading it, for files larger "
+                             "than memory; matches stream to --output")
+    parser.add_argument("--watch", action="store_true",
+                        help="Reload the file in the background whenever it changes (interactive mode, "
+                             "--serve-daemon and --serve-http)")
+    parser.add_argument("--backend", choices=("pandas", "sqlite"), default="pandas",
+                        help="Keep the data in memory (pandas, default) or in a SQLite database with a "
+                             "full-text index, for datasets too large for memory")
+    parser.add_argument("--database", metavar="FILE",
+                        help="SQLite database for --backend sqlite; reused while the file is unchanged "
+                             "(default: a temporary file)")
+    parser.add_argument("--persist-indexes", action="store_true",
+                        help="With --serve-daemon or --serve-http, save indexes next to each file "
+                             "(FILE.esidx) and map them on the next start instead of rebuilding")
+    parser.add_argument("--compact", action="store_true",
+                        help="Downcast numbers and store text as categoricals or Arrow strings after loading")
+    parser.add_argument("--memory-budget", type=float, metavar="MB",
+                        help="Evict caches and indexes, least recently used first, to stay under this many MB "
+                             "(default: $EXCELSEARCHPRO_MEMORY_BUDGET_MB or unlimited)")
+    parser.add_argument("--profile-imports", action="store_true",
+                        help="Run the command under -X importtime and report the slowest imports")
+    parser.add_argument("--version", action="version", version=f"%(prog)s {__version__}")
+    
+    # Checked before parsing so it also profiles paths that exit early, like --help
+    if "--profile-imports" in sys.argv[1:]:
+        argv = [arg for arg in sys.argv[1:] if arg != "--profile-imports"]
+        from startup_profile import profile_imports
+        sys.exit(profile_imports(os.path.abspath(__file__), argv))
     
     args = parser.parse_args()
     
-    cli = ExcelSearchCLI()
+    if args.memory_budget is not None:
+        from memory_budget import set_memory_budget
+        set_memory_budget(args.memory_budget)
+    
+    if args.serve_http:
+        try:
+            from search_server import SearchAPIServer
+            server = SearchAPIServer(args.host, args.port, export_dir=args.export_dir)
+            server.watch_files = args.watch
+            server.persist_indexes = args.persist_indexes
+            if args.instrument:
+                server.enable_instrumentation(args.slow_query_ms / 1000, args.slow_query_log)
+            server.serve_forever([args.file] if args.file else [])
+        except OSError as e:
+            print(f"❌ {e}")
+            sys.exit(1)
+        except KeyboardInterrupt:
+            print("\n👋 Search API stopped")
+        return
+    
+    if args.serve_daemon:
+        try:
+            daemon = SearchDaemon(args.socket)
+            daemon.watch_files = args.watch
+            daemon.persist_indexes = args.persist_indexes
+            if args.instrument:
+                daemon.enable_instrumentation(args.slow_query_ms / 1000, args.slow_query_log)
+            daemon.serve_forever([args.file] if args.file else [])
+        except OSError as e:
+            print(f"❌ {e}")
+            sys.exit(1)
+        except KeyboardInterrupt:
+            print("\n👋 Daemon stopped")
+        return
+    
+    if args.stop_daemon:
+        try:
+            daemon_request(args.socket, {'op': 'shutdown'}, timeout=5)
+            print("✅ Query daemon stopped")
+        except OSError as e:
+            print(f"❌ Could not reach query daemon at {args.socket}: {e}")
+            sys.exit(1)
+        return
+    
+    cli = ExcelSearchCLI(args.backend, args.database)
+    if args.instrument:
+        cli.search_engine.enable_instrumentation(args.slow_query_ms / 1000, args.slow_query_log)
+    
+    if args.queries:
+        success = cli.run_batch_queries(args)
+        sys.exit(0 if success else 1)
+    
+    if args.daemon and args.search:
+        success = cli.run_daemon_search(args)
+        sys.exit(0 if success else 1)
+    
+    if args.dir:
+        success = cli.run_folder_search(args)
+        sys.exit(0 if success else 1)
     
     # Interactive mode or no search term provided
     if args.interactive or not args.search:
-        cli.interactive_mode()
+        cli.interactive_mode(watch=args.watch)
     else:
         # Command line search
         if not args.file:
@@ -11,6 +11,35 @@ import os
 import pandas as pd
 from datetime import datetime
 from search_engine import ExcelSearchEngine
+from utils import load_recent_files, add_recent_file, warm_file_cache, format_search_breakdown, format_memory_usage
+
+class ToolTip:
+    """Hover text for a widget; empty text shows nothing"""
+    
+    def __init__(self, widget, text=""):
+        self.widget = widget
+        self.text = text
+        self.window = None
+        widget.bind('<Enter>', self.show, add='+')
+        widget.bind('<Leave>', self.hide, add='+')
+    
+    def show(self, event=None):
+        """Show the tooltip below the widget"""
+        if not self.text or self.window is not None:
+            return
+        x = self.widget.winfo_rootx() + 10
+        y = self.widget.winfo_rooty() + self.widget.winfo_height() + 5
+        self.window = tk.Toplevel(self.widget)
+        self.window.wm_overrideredirect(True)
+        self.window.wm_geometry(f"+{x}+{y}")
+        tk.Label(self.window, text=self.text, justify='left', background="#ffffe0",
+                 relief='solid', borderwidth=1, font=('Consolas', 9)).pack(ipadx=4, ipady=2)
+    
+    def hide(self, event=None):
+        """Remove the tooltip"""
+        if self.window is not None:
+            self.window.destroy()
+            self.window = None
 
 class ExcelSearchGUI:
     """Main GUI application for Excel database searching"""
@@ -19,9 +48,20 @@ class ExcelSearchGUI:
         self.search_engine = ExcelSearchEngine()
         self.current_results = None
         self.search_timer = None
+        self.load_cancel_event = None
+        self.loading_path = ""
+        self.export_cancel_event = None
         
         self.setup_gui()
         
+        # Pull recently used files into the OS cache so reopening them is fast
+        threading.Thread(target=self.warm_recent_files, daemon=True).start()
+        
+    def warm_recent_files(self):
+        """Read the most recently used files once in the background"""
+        for file_path in load_recent_files(limit=3):
+            warm_file_cache(file_path)
+        
     def setup_gui(self):
         """Initialize the main GUI window"""
         self.root = tk.Tk()
@@ -100,6 +140,15 @@ class ExcelSearchGUI:
                                   command=self.load_file, state='disabled')
         self.load_btn.grid(row=0, column=2, padx=(10, 0))
         
+        # Cancel button, enabled only while a load is running
+        self.cancel_load_btn = ttk.Button(section, text="✖ Cancel",
+                                         command=self.cancel_load, state='disabled')
+        self.cancel_load_btn.grid(row=0, column=3, padx=(10, 0))
+        
+        # Load progress bar
+        self.load_progress_bar = ttk.Progressbar(section, mode='determinate', maximum=100)
+        self.load_progress_bar.grid(row=1, column=0, columnspan=4, sticky='ew', pady=(8, 0))
+        
         return section
     
     def create_config_section(self, parent):
@@ -158,6 +207,7 @@ class ExcelSearchGUI:
         self.case_sensitive_var = tk.BooleanVar()
         self.exact_match_var = tk.BooleanVar()
         self.regex_var = tk.BooleanVar()
+        self.whole_word_var = tk.BooleanVar()
         
         ttk.Checkbutton(options_frame, text="Case sensitive", 
                        variable=self.case_sensitive_var).grid(row=0, column=0, 
@@ -166,7 +216,10 @@ class ExcelSearchGUI:
                        variable=self.exact_match_var).grid(row=0, column=1, 
                                                           sticky='w', padx=(0, 20))
         ttk.Checkbutton(options_frame, text="Regex search", 
-                       variable=self.regex_var).grid(row=0, column=2, sticky='w')
+                       variable=self.regex_var).grid(row=0, column=2, 
+                                                     sticky='w', padx=(0, 20))
+        ttk.Checkbutton(options_frame, text="Whole words (smi* for prefixes)", 
+                       variable=self.whole_word_var).grid(row=0, column=3, sticky='w')
         
         return section
     
@@ -177,6 +230,9 @@ class ExcelSearchGUI:
         self.status_label = ttk.Label(section, text="No file loaded")
         self.status_label.grid(row=0, column=0, sticky='w')
         
+        # Hovering the status shows where the last search spent its time
+        self.status_tooltip = ToolTip(self.status_label)
+        
         return section
     
     def create_results_section(self, parent):
@@ -217,6 +273,20 @@ class ExcelSearchGUI:
         self.result_count_label = ttk.Label(section, text="")
         self.result_count_label.grid(row=0, column=1, sticky='w')
         
+        # Export progress, shown while an export runs in the background
+        self.export_progress_bar = ttk.Progressbar(section, mode='determinate', maximum=100,
+                                                  length=200)
+        self.export_progress_bar.grid(row=0, column=2, padx=(10, 0))
+        
+        self.cancel_export_btn = ttk.Button(section, text="✖ Cancel Export",
+                                           command=self.cancel_export, state='disabled')
+        self.cancel_export_btn.grid(row=0, column=3, padx=(10, 0))
+        
+        self.export_status_label = ttk.Label(section, text="")
+        self.export_status_label.grid(row=0, column=4, sticky='w', padx=(10, 0))
+        
+        section.columnconfigure(1, weight=1)
+        
         return section
     
     def create_info_tab(self):
@@ -241,6 +311,7 @@ class ExcelSearchGUI:
             filetypes=[
                 ("Excel files", "*.xlsx *.xls"),
                 ("CSV files", "*.csv"),
+                ("Parquet/Feather/Arrow files", "*.parquet *.feather *.arrow"),
                 ("All files", "*.*")
             ],
             initialdir="D:\\"  # Start in D drive as requested
@@ -255,6 +326,8 @@ class ExcelSearchGUI:
                     self.file_label.config(text=f"Selected: {display_name}")
                     self.search_engine.file_path = file_path
                     self.load_btn.config(state='normal')
+                    # Start parsing right away; "Load File" picks up this load
+                    self.search_engine.preload(file_path)
                 else:
                     messagebox.showerror("Error", f"Cannot access file: {display_name}")
             except UnicodeError:
@@ -271,12 +344,23 @@ class ExcelSearchGUI:
         # Show loading indicator
         self.status_label.config(text="Loading file... Please wait")
         self.load_btn.config(text="Loading...", state='disabled')
+        self.cancel_load_btn.config(state='normal')
+        self.load_progress_bar.config(value=0)
         self.root.config(cursor="wait")
         self.root.update()
         
-        # Load file in separate thread to keep GUI responsive
+        cancel_event = threading.Event()
+        self.load_cancel_event = cancel_event
+        self.loading_path = self.search_engine.file_path
+        
+        # Load file in separate thread to keep GUI responsive. The first rows
+        # arrive quickly, the rest stream in and report progress as they load.
         def load_thread():
-            success, message = self.search_engine.load_file(self.search_engine.file_path)
+            success, message = self.search_engine.load_file_progressive(
+                self.search_engine.file_path,
+                progress_callback=lambda progress: self.root.after(0, self.on_load_progress, progress),
+                cancel_event=cancel_event
+            )
             
             # Update GUI in main thread
             self.root.after(0, self.on_file_loaded, success, message)
@@ -284,22 +368,96 @@ class ExcelSearchGUI:
         threading.Thread(target=load_thread, daemon=True).start()
     
     def on_file_loaded(self, success, message):
-        """Handle file loading completion"""
+        """Handle file loading completion (or preview availability when loading progressively)"""
         self.root.config(cursor="")
         self.load_btn.config(text="📥 Load File", state='normal')
         
         if success:
+            add_recent_file(self.search_engine.file_path)
+            if not self.search_engine.loading:
+                self.finish_load_progress()
             self.status_label.config(text=message)
             self.setup_column_selection()
             self.setup_treeview()
             self.display_initial_data()
             self.enable_search_controls()
             self.update_file_info()
-            messagebox.showinfo("Success", message)
+            if not self.search_engine.loading:
+                messagebox.showinfo("Success", message)
         else:
+            self.finish_load_progress()
+            if self.load_cancel_event is not None and self.load_cancel_event.is_set():
+                self.status_label.config(text="Load cancelled")
+                return
             self.status_label.config(text="File loading failed")
             messagebox.showerror("Error", message)
     
+    def on_load_progress(self, progress):
+        """Handle progress updates from a background load"""
+        self.load_progress_bar.config(value=progress['percent'])
+        
+        if progress.get('done'):
+            self.finish_load_progress()
+        
+        if progress.get('cancelled'):
+            # The engine dropped the partial data; keep the file selected for a retry
+            self.search_engine.file_path = self.loading_path
+            self.clear_loaded_data()
+            self.status_label.config(text="Load cancelled")
+            return
+        
+        if progress.get('error'):
+            self.status_label.config(text="File loading failed")
+            messagebox.showerror("Error", progress['error'])
+            return
+        
+        if progress.get('done'):
+            self.status_label.config(text=progress['message'])
+            self.update_file_info()
+            # Re-run the current search so it covers the complete dataset
+            if self.search_var.get().strip():
+                self.perform_search()
+            else:
+                self.display_initial_data()
+            return
+        
+        # Don't overwrite search results status while the user is searching
+        if self.search_var.get().strip():
+            return
+        
+        eta = progress.get('eta_seconds')
+        self.status_label.config(
+            text=(f"Loading file... {progress['percent']:.1f}% | "
+                  f"{progress['rows_loaded']:,} rows | "
+                  f"{progress['rows_per_second']:,.0f} rows/s"
+                  + (f" | ~{eta:.0f}s left" if eta is not None else ""))
+        )
+    
+    def cancel_load(self):
+        """Cancel the running file load"""
+        if self.load_cancel_event is not None:
+            self.load_cancel_event.set()
+            self.cancel_load_btn.config(state='disabled')
+            self.status_label.config(text="Cancelling load...")
+    
+    def finish_load_progress(self):
+        """Reset load progress controls once a load ends"""
+        self.cancel_load_btn.config(state='disabled')
+        self.load_progress_bar.config(value=0)
+    
+    def clear_loaded_data(self):
+        """Clear columns and results after the loaded data was discarded"""
+        for widget in self.columns_frame.winfo_children():
+            widget.destroy()
+        self.column_vars = {}
+        self.tree.delete(*self.tree.get_children())
+        self.current_results = None
+        self.result_count_label.config(text="")
+        self.export_btn.config(state='disabled')
+        self.search_btn.config(state='disabled')
+        self.clear_btn.config(state='disabled')
+        self.info_text.delete(1.0, tk.END)
+    
     def setup_column_selection(self):
         """Setup column selection checkboxes"""
         # Clear existing checkboxes
@@ -401,7 +559,9 @@ class ExcelSearchGUI:
             self.result_count_label.config(text=f"Showing {total:,} results")
         
         self.current_results = data
-        self.export_btn.config(state='normal' if total > 0 else 'disabled')
+        # Only one export at a time; the button comes back when it finishes
+        exporting = self.export_cancel_event is not None
+        self.export_btn.config(state='normal' if total > 0 and not exporting else 'disabled')
     
     def enable_search_controls(self):
         """Enable search-related controls"""
@@ -473,7 +633,9 @@ class ExcelSearchGUI:
                 case_sensitive=self.case_sensitive_var.get(),
                 exact_match=self.exact_match_var.get(),
                 use_regex=self.regex_var.get(),
-                max_results=10000  # Limit for GUI display
+                max_results=10000,  # Limit for GUI display
+                explain=True,
+                whole_word=self.whole_word_var.get()
             )
             
             if 'error' in stats:
@@ -492,7 +654,15 @@ class ExcelSearchGUI:
                 status_text = (f"All data: {file_info['rows']:,} rows, "
                               f"{file_info['columns']} columns")
             
+            # Searches during a progressive load only cover the rows loaded so far
+            if stats.get('partial'):
+                status_text = (f"[Partial: rows 1–{stats['rows_searched']:,}, "
+                              f"{stats['load_percent']:.0f}% loaded] {status_text}")
+            
             self.status_label.config(text=status_text)
+            self.status_tooltip.text = (
+                "Search breakdown\n" + "\n".join(format_search_breakdown(stats)) if search_term else ""
+            )
             
             # Display results
             self.display_data(results)
@@ -523,23 +693,73 @@ class ExcelSearchGUI:
             defaultextension=".xlsx",
             filetypes=[
                 ("Excel files", "*.xlsx"),
-                ("CSV files", "*.csv")
+                ("CSV files", "*.csv"),
+                ("Compressed CSV", "*.csv.gz *.csv.zst"),
+                ("Parquet files", "*.parquet"),
+                ("Feather/Arrow files", "*.feather *.arrow"),
+                ("JSON Lines", "*.jsonl")
             ]
         )
         
-        if file_path:
-            success, message = self.search_engine.export_results(self.current_results, file_path)
-            if success:
-                messagebox.showinfo("Success", message)
-            else:
-                messagebox.showerror("Error", message)
+        if not file_path:
+            return
+        
+        results = self.current_results
+        cancel_event = threading.Event()
+        self.export_cancel_event = cancel_event
+        self.export_btn.config(state='disabled')
+        self.cancel_export_btn.config(state='normal')
+        self.export_progress_bar.config(value=0)
+        
+        # Write on a worker thread so searching stays responsive; the file only
+        # appears under its final name once it is completely written
+        def export_thread():
+            success, message = self.search_engine.export_results(
+                results, file_path,
+                progress_callback=lambda progress: self.root.after(0, self.on_export_progress, progress),
+                cancel_event=cancel_event
+            )
+            self.root.after(0, self.on_export_finished, success, message)
+        
+        threading.Thread(target=export_thread, daemon=True).start()
+    
+    def on_export_progress(self, progress):
+        """Handle progress updates from a background export"""
+        self.export_progress_bar.config(value=progress['percent'])
+        self.export_status_label.config(
+            text=f"Exporting... {progress['rows_written']:,} of {progress['total_rows']:,} rows"
+        )
+    
+    def on_export_finished(self, success, message):
+        """Handle export completion, failure or cancellation"""
+        self.export_cancel_event = None
+        self.cancel_export_btn.config(state='disabled')
+        self.export_progress_bar.config(value=0)
+        self.export_btn.config(
+            state='normal' if self.current_results is not None and not self.current_results.empty
+            else 'disabled')
+        self.export_status_label.config(text="")
+        
+        if success:
+            messagebox.showinfo("Success", message)
+        elif message == "Export cancelled":
+            self.export_status_label.config(text=message)
+        else:
+            messagebox.showerror("Error", message)
+    
+    def cancel_export(self):
+        """Cancel the running export"""
+        if self.export_cancel_event is not None:
+            self.export_cancel_event.set()
+            self.cancel_export_btn.config(state='disabled')
+            self.export_status_label.config(text="Cancelling export...")
     
     def update_file_info(self):
         """Update the file info tab"""
         if self.search_engine.df is None:
             return
         
-        file_info = self.search_engine.get_file_info()
+        file_info = self.search_engine.get_file_info(include_memory=True)
         column_info = self.search_engine.get_column_info()
         
         info_text = f"""📊 FILE INFORMATION
@@ -550,6 +770,7 @@ class ExcelSearchGUI:
 📏 Size: {file_info['file_size_mb']:.2f} MB
 ⏱️  Load Time: {file_info['load_time']:.2f} seconds
 📐 Dimensions: {file_info['rows']:,} rows × {file_info['columns']} columns
+💾 Memory: {format_memory_usage(file_info['memory'])}
 🕒 Loaded: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
 
 📋 COLUMN INFORMATION
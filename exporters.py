@@ -0,0 +1,444 @@
+"""
+Streaming exporters for search results
+Write rows chunk by chunk so memory stays flat no matter how many rows match
+"""
+
+import gzip
+import io
+import os
+import threading
+import uuid
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+# Rows converted and written per chunk
+EXPORT_CHUNK_ROWS = 50000
+
+# Excel writers are ~20x slower per row; smaller chunks keep progress and cancel responsive
+EXCEL_CHUNK_ROWS = 2000
+
+# Excel's hard limit is 1,048,576 rows per sheet, one of which is the header
+EXCEL_MAX_DATA_ROWS = 1048575
+
+
+class ExportCancelled(Exception):
+    """Raised inside a writer when the export's cancel event is set"""
+
+
+def export_dataframe(df: pd.DataFrame,
+                     output_path: str,
+                     positions: Optional[np.ndarray] = None,
+                     columns: Optional[List[str]] = None,
+                     chunk_rows: Optional[int] = None,
+                     progress_callback: Optional[Callable[[Dict[str, Any]], None]] = None,
+                     cancel_event: Optional[threading.Event] = None,
+                     fetch_rows: Optional[Callable[[np.ndarray], pd.DataFrame]] = None) -> Tuple[bool, str]:
+    """
+    Export rows of a DataFrame with a streaming writer chosen by file extension
+    
+    Only one chunk of rows is materialized at a time, taken straight from
+    ``df`` by position, so no full copy of the selected rows is made.
+    
+    Args:
+        df: Source DataFrame
+        output_path: Output file; the extension picks the format (see WRITERS)
+        positions: Row positions to export (default: all rows)
+        columns: Columns to export (default: all columns)
+        chunk_rows: Rows written per chunk (default depends on the format)
+        progress_callback: Called after each chunk with rows_written,
+            total_rows and percent
+        cancel_event: Export stops and the partial file is removed when set
+        fetch_rows: Builds each chunk from its row positions instead of taking
+            the rows from ``df``; columns must then be given
+    
+    The output only appears once it is complete (see write_chunks).
+    
+    Returns:
+        Tuple of (success, message)
+    """
+    file_ext = export_format(output_path)
+    writer = WRITERS.get(file_ext)
+    if writer is None:
+        return False, f"Unsupported export format: {file_ext}"
+    if chunk_rows is None:
+        chunk_rows = EXCEL_CHUNK_ROWS if writer is write_xlsx else EXPORT_CHUNK_ROWS
+    
+    if columns is not None and fetch_rows is None:
+        df = df[columns]
+    header = [str(col) for col in (df.columns if fetch_rows is None else columns)]
+    total_rows = len(df) if positions is None else len(positions)
+    
+    def chunks():
+        rows_written = 0
+        for start in range(0, total_rows, chunk_rows):
+            if cancel_event is not None and cancel_event.is_set():
+                raise ExportCancelled()
+            if fetch_rows is not None:
+                if positions is None:
+                    chunk = fetch_rows(np.arange(start, min(start + chunk_rows, total_rows)))
+                else:
+                    chunk = fetch_rows(positions[start:start + chunk_rows])
+            elif positions is None:
+                chunk = df.iloc[start:start + chunk_rows]
+            else:
+                chunk = df.iloc[positions[start:start + chunk_rows]]
+            yield chunk
+            rows_written += len(chunk)
+            if progress_callback:
+                progress_callback({
+                    'rows_written': rows_written,
+                    'total_rows': total_rows,
+                    'percent': rows_written / total_rows * 100 if total_rows else 100.0
+                })
+    
+    return write_chunks(output_path, header, chunks())
+
+
+def export_parts(parts: List[Tuple[pd.DataFrame, Optional[np.ndarray], Dict[str, Any]]],
+                 output_path: str,
+                 max_rows: Optional[int] = None,
+                 chunk_rows: Optional[int] = None,
+                 progress_callback: Optional[Callable[[Dict[str, Any]], None]] = None,
+                 cancel_event: Optional[threading.Event] = None) -> Tuple[bool, str]:
+    """
+    Export rows of several DataFrames into one file, one part after another
+    
+    Used for matches from several sheets or files: each part is written a
+    chunk at a time, so the parts are never concatenated into one results
+    DataFrame. The file has the union of the parts' columns, typed the way
+    pd.concat would type them.
+    
+    Args:
+        parts: List of (DataFrame, row positions or None for all rows,
+            columns to prepend with a constant value, e.g. {'Sheet': name})
+        output_path: Output file; the extension picks the format (see WRITERS)
+        max_rows: Stop after this many rows across all parts
+        chunk_rows: Rows written per chunk (default depends on the format)
+        progress_callback: Called after each chunk with rows_written,
+            total_rows and percent
+        cancel_event: Export stops and the partial file is removed when set
+    
+    Returns:
+        Tuple of (success, message)
+    """
+    writer = WRITERS.get(export_format(output_path))
+    if writer is None:
+        return False, f"Unsupported export format: {export_format(output_path)}"
+    if chunk_rows is None:
+        chunk_rows = EXCEL_CHUNK_ROWS if writer is write_xlsx else EXPORT_CHUNK_ROWS
+    
+    def with_constants(rows: pd.DataFrame, constants: Dict[str, Any]) -> pd.DataFrame:
+        rows = rows.copy(deep=False)
+        for i, (name, value) in enumerate(constants.items()):
+            rows.insert(i, name, value, allow_duplicates=True)
+        return rows
+    
+    # Concatenating the empty parts gives the columns and dtypes of concatenating their rows
+    template = pd.concat([with_constants(df.iloc[:0], constants) for df, _, constants in parts]) \
+        if parts else pd.DataFrame()
+    total_rows = sum(len(df) if positions is None else len(positions) for df, positions, _ in parts)
+    if max_rows:
+        total_rows = min(total_rows, max_rows)
+    
+    def chunks():
+        rows_written = 0
+        for df, positions, constants in parts:
+            count = min(len(df) if positions is None else len(positions), total_rows - rows_written)
+            for start in range(0, count, chunk_rows):
+                if cancel_event is not None and cancel_event.is_set():
+                    raise ExportCancelled()
+                stop = min(start + chunk_rows, count)
+                rows = df.iloc[start:stop] if positions is None else df.iloc[positions[start:stop]]
+                chunk = with_constants(rows, constants)
+                if template.columns.is_unique:
+                    chunk = chunk.reindex(columns=template.columns).astype(template.dtypes.to_dict())
+                yield chunk
+                rows_written += len(chunk)
+                if progress_callback:
+                    progress_callback({
+                        'rows_written': rows_written,
+                        'total_rows': total_rows,
+                        'percent': rows_written / total_rows * 100 if total_rows else 100.0
+                    })
+    
+    return write_chunks(output_path, [str(col) for col in template.columns], chunks())
+
+
+def write_chunks(output_path: str, header: List[str], chunks) -> Tuple[bool, str]:
+    """
+    Write DataFrame chunks with the writer chosen by file extension
+    
+    Chunks are consumed one at a time, so they can come from a generator
+    that is still reading its input. Raising ExportCancelled from the
+    generator stops the export.
+    
+    The output only appears once it is complete: rows go to a temporary file
+    that is renamed over output_path at the end.
+    
+    Args:
+        output_path: Output file; the extension picks the format (see WRITERS)
+        header: Column names
+        chunks: Iterable of DataFrames with the header's columns
+    
+    Returns:
+        Tuple of (success, message)
+    """
+    writer = WRITERS.get(export_format(output_path))
+    if writer is None:
+        return False, f"Unsupported export format: {export_format(output_path)}"
+    
+    rows_written = 0
+    
+    def counted():
+        nonlocal rows_written
+        for chunk in chunks:
+            yield chunk
+            rows_written += len(chunk)
+    
+    # Write next to the target and rename at the end, so a cancelled or failed
+    # export never leaves a half-written file or clobbers an existing one
+    temp_path = partial_path(output_path)
+    try:
+        writer(temp_path, header, counted())
+        os.replace(temp_path, output_path)
+    except ExportCancelled:
+        _remove_quietly(temp_path)
+        return False, "Export cancelled"
+    except BaseException:
+        _remove_quietly(temp_path)
+        raise
+    
+    return True, f"Successfully exported {rows_written} rows to {output_path}"
+
+
+def partial_path(output_path: str) -> str:
+    """Hidden temporary path in the output's directory, keeping its extension"""
+    directory, name = os.path.split(os.path.abspath(output_path))
+    file_ext = export_format(name)
+    return os.path.join(directory, f".{name}.{uuid.uuid4().hex[:8]}.partial{file_ext}")
+
+
+def _remove_quietly(path: str) -> None:
+    """Delete a file if it exists"""
+    try:
+        os.unlink(path)
+    except OSError:
+        pass
+
+
+def export_format(output_path: str) -> str:
+    """
+    Get the export format key for a path, including compound extensions like .csv.gz
+    
+    Args:
+        output_path: Output file path
+    
+    Returns:
+        Lowercase extension as used in WRITERS
+    """
+    lower = output_path.lower()
+    for compound in ('.csv.gz', '.csv.zst'):
+        if lower.endswith(compound):
+            return compound
+    return os.path.splitext(lower)[1]
+
+
+def write_csv(output_path: str, header: List[str], chunks) -> None:
+    """Append each chunk to a CSV file"""
+    with open(output_path, 'w', encoding='utf-8', newline='') as f:
+        _write_csv_chunks(f, header, chunks)
+
+
+def write_csv_gzip(output_path: str, header: List[str], chunks) -> None:
+    """Append each chunk to a gzip-compressed CSV file"""
+    # Level 6 is gzip's usual default; 9 costs far more time for little gain
+    with gzip.open(output_path, 'wt', encoding='utf-8', newline='', compresslevel=6) as f:
+        _write_csv_chunks(f, header, chunks)
+
+
+def write_csv_zstd(output_path: str, header: List[str], chunks) -> None:
+    """Append each chunk to a zstd-compressed CSV file (needs zstandard or pyarrow)"""
+    try:
+        import zstandard
+    except ImportError:
+        zstandard = None
+    
+    if zstandard is not None:
+        with open(output_path, 'wb') as raw:
+            with zstandard.ZstdCompressor(level=3).stream_writer(raw) as compressed:
+                with io.TextIOWrapper(compressed, encoding='utf-8', newline='') as f:
+                    _write_csv_chunks(f, header, chunks)
+        return
+    
+    pa = _require_pyarrow('zstd CSV', alternative='zstandard')
+    with pa.CompressedOutputStream(output_path, 'zstd') as compressed:
+        with io.TextIOWrapper(compressed, encoding='utf-8', newline='') as f:
+            _write_csv_chunks(f, header, chunks)
+
+
+def _write_csv_chunks(f, header: List[str], chunks) -> None:
+    """Write the header line then every chunk to an open text file"""
+    f.write(pd.DataFrame(columns=header).to_csv(index=False))
+    for chunk in chunks:
+        chunk.to_csv(f, header=False, index=False)
+
+
+def write_jsonl(output_path: str, header: List[str], chunks) -> None:
+    """Write one JSON object per row (JSON Lines)"""
+    with open(output_path, 'w', encoding='utf-8', newline='\n') as f:
+        for chunk in chunks:
+            if len(chunk):
+                f.write(chunk.to_json(orient='records', lines=True, date_format='iso',
+                                      force_ascii=False).rstrip('\n') + '\n')
+
+
+def write_parquet(output_path: str, header: List[str], chunks) -> None:
+    """Write each chunk as a Parquet row group"""
+    pa = _require_pyarrow('Parquet')
+    import pyarrow.parquet as pq
+    
+    writer = None
+    try:
+        for chunk in chunks:
+            table = _arrow_table(pa, chunk, writer.schema if writer else None)
+            if writer is None:
+                writer = pq.ParquetWriter(output_path, table.schema, compression='snappy')
+            writer.write_table(table)
+        if writer is None:
+            pq.write_table(pa.table({name: pa.array([], pa.string()) for name in header}), output_path)
+    finally:
+        if writer is not None:
+            writer.close()
+
+
+def write_arrow(output_path: str, header: List[str], chunks) -> None:
+    """Write each chunk as a record batch of a Feather v2 / Arrow IPC file"""
+    pa = _require_pyarrow('Feather/Arrow')
+    
+    # Feather files default to lz4 like pyarrow.feather; plain .arrow stays uncompressed
+    compression = 'lz4' if output_path.lower().endswith('.feather') else None
+    options = pa.ipc.IpcWriteOptions(compression=compression)
+    
+    writer = None
+    schema = None
+    try:
+        for chunk in chunks:
+            table = _arrow_table(pa, chunk, schema)
+            if writer is None:
+                schema = table.schema
+                writer = pa.ipc.new_file(output_path, schema, options=options)
+            writer.write_table(table)
+        if writer is None:
+            schema = pa.schema([(name, pa.string()) for name in header])
+            pa.ipc.new_file(output_path, schema, options=options).close()
+    finally:
+        if writer is not None:
+            writer.close()
+
+
+def _require_pyarrow(format_name: str, alternative: Optional[str] = None):
+    """Import pyarrow or explain which format needs it"""
+    try:
+        import pyarrow
+    except ImportError:
+        packages = f"pyarrow or {alternative}" if alternative else "pyarrow"
+        raise ImportError(f"{format_name} export requires {packages} (pip install {alternative or 'pyarrow'})")
+    return pyarrow
+
+
+def _arrow_table(pa, chunk: pd.DataFrame, schema=None):
+    """
+    Convert a chunk to an Arrow table with a schema that stays the same across chunks
+    
+    Columns of mixed Python objects (common in spreadsheets) are written as
+    strings, since Arrow columns must have a single type.
+    """
+    chunk = chunk.copy(deep=False)
+    chunk.columns = [str(col) for col in chunk.columns]
+    for col in chunk.columns:
+        if chunk[col].dtype == object:
+            chunk[col] = chunk[col].astype('string')
+    
+    table = pa.Table.from_pandas(chunk, preserve_index=False)
+    return table if schema is None else table.cast(schema)
+
+
+def write_xlsx(output_path: str, header: List[str], chunks) -> None:
+    """Write an .xlsx file with xlsxwriter's constant_memory mode, or openpyxl write-only"""
+    try:
+        import xlsxwriter
+    except ImportError:
+        xlsxwriter = None
+    
+    if xlsxwriter is not None:
+        workbook = xlsxwriter.Workbook(output_path, {
+            'constant_memory': True,
+            'nan_inf_to_errors': True,
+            'remove_timezone': True,
+            'default_date_format': 'yyyy-mm-dd hh:mm:ss'
+        })
+        add_sheet = workbook.add_worksheet
+        
+        def append_rows(sheet, first_row, rows):
+            for offset, row in enumerate(rows):
+                sheet.write_row(first_row + offset, 0, row)
+    else:
+        from openpyxl import Workbook
+        
+        workbook = Workbook(write_only=True)
+        add_sheet = workbook.create_sheet
+        
+        def append_rows(sheet, first_row, rows):
+            for row in rows:
+                sheet.append(row)
+    
+    sheet = None
+    sheet_rows = 0
+    sheet_count = 0
+    
+    try:
+        for chunk in chunks:
+            rows = _excel_rows(chunk)
+            start = 0
+            # Results beyond Excel's row limit continue on additional sheets
+            while start < len(rows):
+                if sheet is None or sheet_rows == EXCEL_MAX_DATA_ROWS:
+                    sheet_count += 1
+                    sheet = add_sheet(f'Sheet{sheet_count}')
+                    append_rows(sheet, 0, [header])
+                    sheet_rows = 0
+                take = min(len(rows) - start, EXCEL_MAX_DATA_ROWS - sheet_rows)
+                append_rows(sheet, sheet_rows + 1, rows[start:start + take])
+                sheet_rows += take
+                start += take
+        
+        if sheet is None:
+            append_rows(add_sheet('Sheet1'), 0, [header])
+    finally:
+        if xlsxwriter is not None:
+            workbook.close()
+        else:
+            workbook.save(output_path)
+
+
+def _excel_rows(chunk: pd.DataFrame) -> List[list]:
+    """Convert a chunk to lists of cell values Excel writers accept"""
+    # object dtype plus where() turns NaN/NaT/NA into None and numpy scalars into Python values
+    values = chunk.astype(object).where(chunk.notna(), None)
+    return values.values.tolist()
+
+
+# File extension -> writer(output_path, header, chunks)
+WRITERS = {
+    '.csv': write_csv,
+    '.csv.gz': write_csv_gzip,
+    '.csv.zst': write_csv_zstd,
+    '.xlsx': write_xlsx,
+    '.xls': write_xlsx,
+    '.jsonl': write_jsonl,
+    '.parquet': write_parquet,
+    '.feather': write_arrow,
+    '.arrow': write_arrow
+}
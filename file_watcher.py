@@ -0,0 +1,164 @@
+"""
+File change notifications for the search engine
+Uses inotify on Linux and falls back to polling the file's size and modification time
+"""
+
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import sys
+import threading
+from typing import Callable, Optional, Tuple
+
+# inotify event flags (linux/inotify.h)
+IN_MODIFY = 0x00000002
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+
+# The directory is watched rather than the file, so editors that save by
+# writing a new file and renaming it over the old one are still noticed
+WATCH_MASK = (IN_MODIFY | IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO
+              | IN_CREATE | IN_DELETE)
+
+# struct inotify_event header: wd, mask, cookie, len (the name follows)
+_EVENT_HEADER = struct.Struct('iIII')
+
+
+def file_fingerprint(file_path: str) -> Optional[Tuple[int, int, int]]:
+    """Size, modification time and inode of a file, or None if it does not exist"""
+    try:
+        stat = os.stat(file_path)
+    except OSError:
+        return None
+    return stat.st_size, stat.st_mtime_ns, stat.st_ino
+
+
+def _open_inotify(directory: str) -> Optional[int]:
+    """inotify descriptor watching a directory, or None where inotify is unavailable"""
+    if not sys.platform.startswith('linux'):
+        return None
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library('c') or None, use_errno=True)
+        fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+    except (OSError, AttributeError):
+        return None
+    if fd < 0:
+        return None
+    if libc.inotify_add_watch(fd, os.fsencode(directory), WATCH_MASK) < 0:
+        os.close(fd)
+        return None
+    return fd
+
+
+class FileWatcher:
+    """
+    Calls a function from a background thread whenever a file changes
+    
+    A change is reported once the file has stopped changing for ``settle``
+    seconds, so a workbook still being saved is not picked up half written.
+    Deleting the file is not reported; recreating it is.
+    """
+    
+    def __init__(self, file_path: str, on_change: Callable[[], None],
+                 interval: float = 1.0, settle: float = 0.5, use_inotify: bool = True):
+        """
+        Args:
+            file_path: File to watch
+            on_change: Called with no arguments after each change
+            interval: Seconds between checks when polling
+            settle: Seconds the file must stay unchanged before it is reported
+            use_inotify: Use inotify where available instead of polling
+        """
+        self.file_path = os.path.abspath(file_path)
+        self.on_change = on_change
+        self.interval = interval
+        self.settle = settle
+        self.changes = 0
+        self._fd = _open_inotify(os.path.dirname(self.file_path)) if use_inotify else None
+        self._fingerprint = file_fingerprint(self.file_path)
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+    
+    @property
+    def backend(self) -> str:
+        """'inotify' or 'polling'"""
+        return 'inotify' if self._fd is not None else 'polling'
+    
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+    
+    def start(self):
+        """Start watching in a daemon thread"""
+        if self.running:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name='file-watcher', daemon=True)
+        self._thread.start()
+    
+    def stop(self):
+        """Stop watching and release the inotify descriptor"""
+        self._stop.set()
+        thread = self._thread
+        if thread is not None and thread is not threading.current_thread():
+            thread.join()
+        self._thread = None
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+    
+    def _run(self):
+        while not self._stop.is_set():
+            if not self._wait_for_event():
+                continue
+            if file_fingerprint(self.file_path) == self._fingerprint:
+                continue
+            
+            fingerprint = self._settled_fingerprint()
+            if fingerprint is None:
+                continue
+            self._fingerprint = fingerprint
+            self.changes += 1
+            try:
+                self.on_change()
+            except Exception:
+                pass  # A failed reload must not stop the watcher
+    
+    def _wait_for_event(self) -> bool:
+        """Block until the file may have changed; False if it surely did not"""
+        if self._fd is None:
+            return not self._stop.wait(self.interval)
+        
+        # The timeout only bounds how long stop() waits for this thread
+        ready, _, _ = select.select([self._fd], [], [], self.interval)
+        if not ready:
+            return False
+        try:
+            data = os.read(self._fd, 64 * 1024)
+        except BlockingIOError:
+            return False
+        name = os.fsencode(os.path.basename(self.file_path))
+        offset = 0
+        while offset + _EVENT_HEADER.size <= len(data):
+            _, _, _, length = _EVENT_HEADER.unpack_from(data, offset)
+            offset += _EVENT_HEADER.size
+            if data[offset:offset + length].rstrip(b'\0') == name:
+                return True
+            offset += length
+        return False
+    
+    def _settled_fingerprint(self) -> Optional[Tuple[int, int, int]]:
+        """Wait until the file stops changing; None if it is gone or watching stopped"""
+        fingerprint = file_fingerprint(self.file_path)
+        while not self._stop.wait(self.settle):
+            current = file_fingerprint(self.file_path)
+            if current == fingerprint:
+                return current
+            fingerprint = current
+        return None
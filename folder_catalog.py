@@ -0,0 +1,410 @@
+"""
+Folder-wide catalog of workbooks for the search engine
+Records every file's sheets, headers and row counts in SQLite and searches
+the matching files of a folder in a process pool
+"""
+
+import json
+import os
+import re
+import sqlite3
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+
+import pandas as pd
+
+from exporters import export_parts
+from search_engine import ExcelSearchEngine, ARROW_EXTENSIONS
+
+# Default catalog database
+DEFAULT_CATALOG_PATH = os.path.join(os.path.expanduser('~'), '.excelsearchpro', 'catalog.sqlite')
+
+# Files a folder scan picks up
+CATALOG_EXTENSIONS = ('.xlsx', '.xls', '.csv') + ARROW_EXTENSIONS
+
+# Columns added to folder-wide results holding where each row came from
+FILE_COLUMN = 'File'
+SHEET_COLUMN = 'Sheet'
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    path TEXT PRIMARY KEY,
+    folder TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    scanned_at REAL NOT NULL,
+    error TEXT
+);
+CREATE TABLE IF NOT EXISTS sheets (
+    path TEXT NOT NULL REFERENCES files(path) ON DELETE CASCADE,
+    sheet TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    columns TEXT NOT NULL,
+    rows INTEGER NOT NULL,
+    PRIMARY KEY (path, sheet)
+);
+CREATE INDEX IF NOT EXISTS files_folder ON files(folder);
+"""
+
+
+def _excel_engine(file_path: str) -> str:
+    """pandas reader for a workbook extension"""
+    return 'openpyxl' if file_path.lower().endswith('.xlsx') else 'xlrd'
+
+
+def _count_lines(file_path: str, block_size: int = 1024 * 1024) -> int:
+    """Number of lines in a text file (a last line without newline counts)"""
+    lines = 0
+    last = b'\n'
+    with open(file_path, 'rb') as f:
+        while True:
+            block = f.read(block_size)
+            if not block:
+                break
+            lines += block.count(b'\n')
+            last = block[-1:]
+    return lines + (last != b'\n')
+
+
+def read_file_metadata(file_path: str) -> List[Tuple[str, List[str], int]]:
+    """
+    Sheets, headers and row counts of one file; runs in a worker process
+    
+    CSV, Parquet, Feather and Arrow files have a single sheet named ''. CSV
+    row counts are line counts, so quoted cells spanning lines count extra.
+    
+    Returns:
+        List of (sheet name, column names, data rows) in tab order
+    """
+    lower_path = file_path.lower()
+    if lower_path.endswith(('.xlsx', '.xls')):
+        sheets = []
+        with pd.ExcelFile(file_path, engine=_excel_engine(file_path)) as workbook:
+            for name in workbook.sheet_names:
+                # Read the row count before parsing, which resets read-only sheet dimensions
+                if lower_path.endswith('.xlsx'):
+                    sheet = workbook.book[name]
+                    rows = sheet.max_row
+                    if rows is None:
+                        rows = sum(1 for _ in sheet.iter_rows(values_only=True))
+                else:
+                    rows = workbook.book.sheet_by_name(name).nrows
+                columns = [str(col) for col in workbook.parse(name, nrows=0).columns]
+                sheets.append((str(name), columns, max(rows - 1, 0)))
+        return sheets
+    
+    columns = [str(col) for col in ExcelSearchEngine()._file_columns(file_path)]
+    if lower_path.endswith('.parquet'):
+        import pyarrow.parquet as pq
+        rows = pq.ParquetFile(file_path).metadata.num_rows
+    elif lower_path.endswith(ARROW_EXTENSIONS):
+        import pyarrow as pa
+        reader = pa.ipc.open_file(pa.memory_map(file_path))
+        rows = sum(reader.get_batch(i).num_rows for i in range(reader.num_record_batches))
+    else:
+        rows = max(_count_lines(file_path) - 1, 0)
+    return [('', columns, rows)]
+
+
+def search_file_sheets(file_path: str, sheets: Dict[str, List[str]], search_term: str,
+                       case_sensitive: bool, exact_match: bool, use_regex: bool,
+                       max_results: Optional[int], whole_word: bool = False
+                       ) -> Tuple[pd.DataFrame, Dict[str, int], Dict[str, str]]:
+    """
+    Search some sheets of one file; runs in a worker process
+    
+    A sheet that can't be searched is reported in the errors and the other
+    sheets are still searched.
+    
+    Args:
+        file_path: File to search
+        sheets: Sheet name ('' for single-sheet formats) -> columns to search,
+            as the text headers stored in the catalog
+        search_term, case_sensitive, exact_match, use_regex, max_results, whole_word:
+            As for ExcelSearchEngine.search()
+    
+    Returns:
+        Tuple of (matching rows with File and Sheet columns first,
+        sheet name -> total matches, sheet name -> error)
+    """
+    engine = ExcelSearchEngine()
+    frames = {}
+    if file_path.lower().endswith(('.xlsx', '.xls')):
+        frames = pd.read_excel(file_path, sheet_name=list(sheets), engine=_excel_engine(file_path))
+    else:
+        success, message = engine.load_file(file_path)
+        if not success:
+            raise ValueError(message)
+    
+    found = []
+    totals = {}
+    errors = {}
+    for sheet, names in sheets.items():
+        if sheet in frames:
+            success, message = engine.load_dataframe(frames[sheet], file_path)
+            if not success:
+                errors[sheet] = message
+                continue
+        # Map the catalog's text headers back to the sheet's labels (e.g. the year 2023)
+        labels = {str(col): col for col in engine.df.columns}
+        columns = [labels.get(name, name) for name in names]
+        results, stats = engine.search(search_term, columns, case_sensitive, exact_match,
+                                       use_regex, max_results, whole_word=whole_word)
+        if 'error' in stats:
+            errors[sheet] = stats['error']
+            continue
+        totals[sheet] = stats['total_results']
+        if len(results):
+            results = results.copy()
+            results.insert(0, SHEET_COLUMN, sheet, allow_duplicates=True)
+            results.insert(0, FILE_COLUMN, file_path, allow_duplicates=True)
+            found.append(results)
+    
+    return (pd.concat(found) if found else pd.DataFrame()), totals, errors
+
+
+class FolderCatalog:
+    """Persistent SQLite index of the files, sheets and headers in folders"""
+    
+    def __init__(self, db_path: str = DEFAULT_CATALOG_PATH):
+        """
+        Args:
+            db_path: SQLite database file, created if missing
+        """
+        self.db_path = db_path
+        if db_path != ':memory:':
+            os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+        self._connection = sqlite3.connect(db_path)
+        self._connection.execute("PRAGMA foreign_keys = ON")
+        self._connection.executescript(SCHEMA)
+    
+    def scan(self, folder: str, recursive: bool = True,
+             processes: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Bring the catalog of a folder up to date
+        
+        Files whose size and modification time are unchanged are not opened;
+        new and changed files are read in a process pool and files that are
+        gone are dropped.
+        
+        Args:
+            folder: Folder to scan
+            recursive: Include subfolders
+            processes: Worker processes (default: CPU count; 1 reads in this process)
+        
+        Returns:
+            Dictionary with files, scanned, unchanged, removed, errors and scan_time
+        """
+        start_time = time.time()
+        folder = os.path.abspath(folder)
+        if not os.path.isdir(folder):
+            return {'error': f"Folder not found: {folder}"}
+        
+        found = {}
+        for root, dirs, names in os.walk(folder):
+            if not recursive:
+                dirs.clear()
+            for name in names:
+                # Skip Office lock files and our own partial exports
+                if name.lower().endswith(CATALOG_EXTENSIONS) and not name.startswith(('~$', '.')):
+                    path = os.path.join(root, name)
+                    stat = os.stat(path)
+                    found[path] = (stat.st_size, stat.st_mtime_ns)
+        
+        known = {path: (size, mtime_ns) for path, size, mtime_ns in self._connection.execute(
+            "SELECT path, size, mtime_ns FROM files WHERE folder = ?", (folder,))}
+        changed = [path for path, version in found.items() if known.get(path) != version]
+        removed = [path for path in known if path not in found]
+        
+        workers = min(len(changed), processes or os.cpu_count() or 1)
+        if workers > 1:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                futures = {path: pool.submit(read_file_metadata, path) for path in changed}
+                outcomes = {path: self._outcome(future.result) for path, future in futures.items()}
+        else:
+            outcomes = {path: self._outcome(lambda path=path: read_file_metadata(path)) for path in changed}
+        
+        errors = 0
+        with self._connection:
+            self._connection.executemany("DELETE FROM files WHERE path = ?", [(path,) for path in removed])
+            for path, (sheets, error) in outcomes.items():
+                size, mtime_ns = found[path]
+                errors += error is not None
+                self._connection.execute("DELETE FROM files WHERE path = ?", (path,))
+                self._connection.execute(
+                    "INSERT INTO files (path, folder, size, mtime_ns, scanned_at, error) VALUES (?, ?, ?, ?, ?, ?)",
+                    (path, folder, size, mtime_ns, time.time(), error))
+                self._connection.executemany(
+                    "INSERT INTO sheets (path, sheet, position, columns, rows) VALUES (?, ?, ?, ?, ?)",
+                    [(path, sheet, position, json.dumps(columns), rows)
+                     for position, (sheet, columns, rows) in enumerate(sheets)])
+        
+        return {
+            'files': len(found),
+            'scanned': len(changed),
+            'unchanged': len(found) - len(changed),
+            'removed': len(removed),
+            'errors': errors,
+            'scan_time': time.time() - start_time
+        }
+    
+    @staticmethod
+    def _outcome(read) -> Tuple[List[Tuple[str, List[str], int]], Optional[str]]:
+        """Run a metadata read, turning a failure into an error message"""
+        try:
+            return read(), None
+        except Exception as e:
+            return [], str(e)
+    
+    def files(self, folder: str) -> List[Dict[str, Any]]:
+        """
+        Catalog entries of a folder
+        
+        Returns:
+            One dictionary per file with path, size, mtime_ns, error and
+            sheets (name, columns and rows of each)
+        """
+        folder = os.path.abspath(folder)
+        entries = {}
+        for path, size, mtime_ns, error in self._connection.execute(
+                "SELECT path, size, mtime_ns, error FROM files WHERE folder = ? ORDER BY path", (folder,)):
+            entries[path] = {'path': path, 'size': size, 'mtime_ns': mtime_ns, 'error': error, 'sheets': []}
+        for path, sheet, columns, rows in self._connection.execute(
+                "SELECT sheets.path, sheet, columns, rows FROM sheets JOIN files USING (path) "
+                "WHERE folder = ? ORDER BY sheets.path, position", (folder,)):
+            entries[path]['sheets'].append({'name': sheet, 'columns': json.loads(columns), 'rows': rows})
+        return list(entries.values())
+    
+    def search(self,
+               folder: str,
+               search_term: str,
+               search_columns: Optional[List[str]] = None,
+               case_sensitive: bool = False,
+               exact_match: bool = False,
+               use_regex: bool = False,
+               max_results: Optional[int] = None,
+               processes: Optional[int] = None,
+               whole_word: bool = False,
+               output_path: Optional[str] = None,
+               return_rows: Optional[int] = None) -> Tuple[pd.DataFrame, Dict[str, Any]]:
+        """
+        Search every cataloged file of a folder in a process pool
+        
+        Only sheets whose headers contain at least one of the search columns
+        are opened; the others are skipped using the catalog alone. Run
+        scan() first so the catalog matches the folder.
+        
+        Args:
+            folder: Cataloged folder
+            search_term: Text to search for
+            search_columns: Columns to search in (default: each sheet's first two)
+            case_sensitive: Whether search should be case sensitive
+            exact_match: Whether to match exact strings only
+            use_regex: Whether to treat search_term as regex
+            max_results: Maximum number of results to return
+            processes: Worker processes (default: CPU count; 1 searches in this process)
+            whole_word: Match whole words only (see ExcelSearchEngine.search)
+            output_path: Also write every match (up to max_results) to this file,
+                one file's matches after another; stats['export'] holds the outcome
+            return_rows: Build at most this many result rows (default: max_results)
+        
+        Returns:
+            Tuple of (results with File and Sheet columns first, search_stats
+            with files_searched, files_skipped and per-file match counts;
+            file_errors and sheet_errors hold files and sheets that failed)
+        """
+        start_time = time.time()
+        if use_regex:
+            try:
+                re.compile(search_term if case_sensitive else search_term.lower())
+            except re.error as e:
+                return pd.DataFrame(), {'error': f'Invalid regex pattern: {e}'}
+        
+        tasks: Dict[str, Dict[str, List[str]]] = {}
+        skipped = 0
+        for entry in self.files(folder):
+            sheets = {}
+            for sheet in entry['sheets']:
+                columns = sheet['columns'][:2] if search_columns is None else \
+                    [col for col in search_columns if col in sheet['columns']]
+                if columns:
+                    sheets[sheet['name']] = columns
+            if sheets:
+                tasks[entry['path']] = sheets
+            else:
+                skipped += 1
+        
+        args = (search_term, case_sensitive, exact_match, use_regex, max_results, whole_word)
+        workers = min(len(tasks), processes or os.cpu_count() or 1)
+        if workers > 1:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                futures = {path: pool.submit(search_file_sheets, path, sheets, *args)
+                           for path, sheets in tasks.items()}
+                outcomes = {path: self._outcome(future.result) for path, future in futures.items()}
+        else:
+            outcomes = {path: self._outcome(lambda path=path, sheets=sheets: search_file_sheets(path, sheets, *args))
+                        for path, sheets in tasks.items()}
+        
+        frames = []
+        files = {}
+        errors = {}
+        sheet_errors = {}
+        for path, (outcome, error) in outcomes.items():
+            if error is not None:
+                errors[path] = error
+                continue
+            results, totals, failed_sheets = outcome
+            files[path] = totals
+            if failed_sheets:
+                sheet_errors[path] = failed_sheets
+            if len(results):
+                frames.append(results)
+        
+        # Only the frames needed for the returned rows are combined
+        limit = min(return_rows, max_results) if return_rows and max_results else return_rows or max_results
+        needed = frames
+        if limit:
+            needed, rows = [], 0
+            for frame in frames:
+                if rows >= limit:
+                    break
+                needed.append(frame)
+                rows += len(frame)
+        results = pd.concat(needed) if needed else pd.DataFrame(columns=[FILE_COLUMN, SHEET_COLUMN])
+        if limit:
+            results = results.iloc[:limit]
+        
+        stats = {
+            'search_time': time.time() - start_time,
+            'total_results': sum(sum(totals.values()) for totals in files.values()),
+            'returned_results': len(results),
+            'search_term': search_term,
+            'search_columns': search_columns,
+            'case_sensitive': case_sensitive,
+            'exact_match': exact_match,
+            'use_regex': use_regex,
+            'whole_word': whole_word,
+            'files_searched': len(files),
+            'files_skipped': skipped,
+            'files': files
+        }
+        if errors:
+            stats['file_errors'] = errors
+        if sheet_errors:
+            stats['sheet_errors'] = sheet_errors
+        if output_path:
+            if not frames:
+                stats['export'] = {'ok': False, 'message': "No results to export"}
+            else:
+                try:
+                    success, message = export_parts([(frame, None, {}) for frame in frames], output_path,
+                                                    max_rows=max_results)
+                except Exception as e:
+                    success, message = False, f"Export failed: {str(e)}"
+                stats['export'] = {'ok': success, 'message': message}
+        return results, stats
+    
+    def close(self):
+        """Close the catalog database"""
+        self._connection.close()
@@ -0,0 +1,132 @@
+"""
+Persistent search indexes for the search engine
+Writes per-column indexes to a versioned sidecar file next to the workbook and memory-maps them back
+"""
+
+import json
+import mmap
+import os
+import struct
+import uuid
+from typing import Any, Dict, Optional, Tuple
+
+import numpy as np
+
+from search_index import TokenIndex, ValueIndex
+
+# Sidecar file name: the workbook's name plus this suffix
+INDEX_SUFFIX = '.esidx'
+
+# First bytes of every index file
+INDEX_MAGIC = b'ESPIDX\0\0'
+
+# Bumped whenever the layout changes; files with another version are ignored
+INDEX_FORMAT_VERSION = 2
+
+# Index classes by the name stored in the file
+INDEX_TYPES = {'value': ValueIndex, 'token': TokenIndex}
+
+# Magic, format version, header length; the JSON header and the arrays follow
+_PREAMBLE = struct.Struct('<8sIQ')
+
+# Arrays start on multiples of this, so they can be mapped without copying
+_ALIGNMENT = 64
+
+
+def index_path(file_path: str) -> str:
+    """Sidecar index file for a data file"""
+    return file_path + INDEX_SUFFIX
+
+
+def _aligned(offset: int) -> int:
+    return -(-offset // _ALIGNMENT) * _ALIGNMENT
+
+
+def save_index_file(path: str, fingerprint: Dict[str, int],
+                    indexes: Dict[Tuple[str, Any, bool], Tuple[Any, str]]) -> int:
+    """
+    Write indexes to an index file, replacing it atomically
+    
+    Args:
+        path: Index file to write
+        fingerprint: Size and modification time of the data file the indexes
+            were built from ({'size': ..., 'mtime_ns': ...})
+        indexes: (index type, column, case_sensitive) -> (index, column dtype
+            name); index types are the names in INDEX_TYPES
+    
+    Returns:
+        Number of indexes written
+    """
+    entries = []
+    arrays = []
+    offset = 0
+    for (kind, column, case_sensitive), (index, dtype) in indexes.items():
+        meta, index_arrays = index.to_arrays()
+        layout = {}
+        for name, array in index_arrays.items():
+            array = np.ascontiguousarray(array)
+            offset = _aligned(offset)
+            layout[name] = [offset, array.dtype.str, len(array)]
+            arrays.append((offset, array))
+            offset += array.nbytes
+        entries.append({'column': column, 'case_sensitive': case_sensitive, 'type': kind,
+                        'dtype': dtype, 'meta': meta, 'arrays': layout})
+    
+    header = json.dumps({'fingerprint': fingerprint, 'indexes': entries}).encode('utf-8')
+    data_start = _aligned(_PREAMBLE.size + len(header))
+    
+    temp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+    try:
+        with open(temp_path, 'wb') as f:
+            f.write(_PREAMBLE.pack(INDEX_MAGIC, INDEX_FORMAT_VERSION, len(header)))
+            f.write(header)
+            for array_offset, array in arrays:
+                f.seek(data_start + array_offset)
+                f.write(array.tobytes())
+        os.replace(temp_path, path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.unlink(temp_path)
+        raise
+    return len(entries)
+
+
+def load_index_file(path: str, fingerprint: Dict[str, int]) -> Optional[Dict[Tuple[str, Any, bool], Tuple[Any, str]]]:
+    """
+    Memory-map the indexes in an index file
+    
+    The arrays are views of the mapped file, so nothing is read until a
+    lookup touches it.
+    
+    Args:
+        path: Index file to read
+        fingerprint: Size and modification time the data file has now
+    
+    Returns:
+        (index type, column, case_sensitive) -> (index, column dtype name),
+        or None when the file is missing, has another format version or was
+        built from a different version of the data file
+    """
+    try:
+        with open(path, 'rb') as f:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError):
+        return None
+    
+    if len(mapped) < _PREAMBLE.size:
+        return None
+    magic, version, header_length = _PREAMBLE.unpack_from(mapped)
+    if magic != INDEX_MAGIC or version != INDEX_FORMAT_VERSION:
+        return None
+    header = json.loads(mapped[_PREAMBLE.size:_PREAMBLE.size + header_length])
+    if header['fingerprint'] != fingerprint:
+        return None
+    
+    data_start = _aligned(_PREAMBLE.size + header_length)
+    indexes = {}
+    for entry in header['indexes']:
+        arrays = {name: np.frombuffer(mapped, dtype=np.dtype(dtype), count=count, offset=data_start + offset)
+                  for name, (offset, dtype, count) in entry['arrays'].items()}
+        index = INDEX_TYPES[entry['type']].from_arrays(entry['meta'], arrays)
+        indexes[(entry['type'], entry['column'], entry['case_sensitive'])] = (index, entry['dtype'])
+    return indexes
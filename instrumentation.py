@@ -0,0 +1,190 @@
+"""
+Opt-in instrumentation for the search engine
+Latency histograms for load, search and export plus a rotating slow-query log
+"""
+
+import json
+import logging
+import logging.handlers
+import math
+import os
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+# Default slow-query log location
+DEFAULT_SLOW_QUERY_LOG = os.path.join(os.path.expanduser('~'), '.excelsearchpro', 'slow_queries.log')
+
+# Operations that get a latency histogram
+OPERATIONS = ('load', 'search', 'export')
+
+# Percentiles reported by LatencyHistogram.summary()
+SUMMARY_PERCENTILES = (50, 90, 99, 99.9)
+
+
+class LatencyHistogram:
+    """
+    HDR-style latency histogram: log-spaced buckets, each split linearly
+    
+    Values are recorded in microseconds. Every power of two is divided into
+    ``sub_buckets`` linear steps, so any recorded value is reproduced within
+    1/sub_buckets relative error while memory stays fixed however many values
+    are recorded.
+    """
+    
+    def __init__(self, sub_buckets: int = 64, max_seconds: float = 3600.0):
+        """
+        Args:
+            sub_buckets: Linear steps per power of two (precision)
+            max_seconds: Largest trackable value; larger values are clamped
+        """
+        self.sub_buckets = sub_buckets
+        self.max_us = int(max_seconds * 1_000_000)
+        self._sub_bits = int(math.log2(sub_buckets))
+        magnitudes = max(1, self.max_us.bit_length() - self._sub_bits + 1)
+        self.counts = [0] * (magnitudes * sub_buckets)
+        self.total_count = 0
+        self.total_us = 0
+        self.min_us: Optional[int] = None
+        self.max_recorded_us = 0
+        self._lock = threading.Lock()
+    
+    def _bucket(self, value_us: int) -> int:
+        """Bucket index for a value in microseconds"""
+        if value_us < self.sub_buckets:
+            return value_us
+        shift = value_us.bit_length() - self._sub_bits - 1
+        return (shift + 1) * self.sub_buckets + (value_us >> shift) - self.sub_buckets
+    
+    def _bucket_value(self, index: int) -> int:
+        """Highest value (microseconds) that falls in a bucket"""
+        if index < self.sub_buckets:
+            return index
+        shift = index // self.sub_buckets - 1
+        mantissa = index % self.sub_buckets + self.sub_buckets
+        return ((mantissa + 1) << shift) - 1
+    
+    def record(self, seconds: float) -> None:
+        """Add one latency measurement"""
+        value_us = min(max(int(seconds * 1_000_000), 0), self.max_us)
+        with self._lock:
+            self.counts[self._bucket(value_us)] += 1
+            self.total_count += 1
+            self.total_us += value_us
+            self.min_us = value_us if self.min_us is None else min(self.min_us, value_us)
+            self.max_recorded_us = max(self.max_recorded_us, value_us)
+    
+    def percentile(self, percent: float) -> float:
+        """
+        Latency at a percentile
+        
+        Args:
+            percent: Percentile between 0 and 100
+        
+        Returns:
+            Latency in seconds (0 when nothing was recorded)
+        """
+        with self._lock:
+            if self.total_count == 0:
+                return 0.0
+            target = max(1, math.ceil(self.total_count * percent / 100))
+            seen = 0
+            for index, count in enumerate(self.counts):
+                seen += count
+                if seen >= target:
+                    return min(self._bucket_value(index), self.max_recorded_us) / 1_000_000
+        return self.max_recorded_us / 1_000_000
+    
+    def summary(self) -> Dict[str, Any]:
+        """Count, mean, min/max and standard percentiles in seconds"""
+        summary = {
+            'count': self.total_count,
+            'mean': self.total_us / self.total_count / 1_000_000 if self.total_count else 0.0,
+            'min': (self.min_us or 0) / 1_000_000,
+            'max': self.max_recorded_us / 1_000_000
+        }
+        for percent in SUMMARY_PERCENTILES:
+            summary[f'p{percent:g}'] = self.percentile(percent)
+        return summary
+
+
+class Instrumentation:
+    """Latency histograms per operation and a slow-query log for one engine"""
+    
+    def __init__(self, slow_query_threshold: Optional[float] = 0.5,
+                 slow_query_log: str = DEFAULT_SLOW_QUERY_LOG,
+                 max_log_bytes: int = 1024 * 1024, log_backups: int = 3):
+        """
+        Args:
+            slow_query_threshold: Searches taking at least this many seconds are
+                logged (None disables the log)
+            slow_query_log: Log file path; rotated when it reaches max_log_bytes
+            max_log_bytes: Size at which the log rotates
+            log_backups: Rotated log files kept
+        """
+        self.histograms = {operation: LatencyHistogram() for operation in OPERATIONS}
+        self.slow_query_threshold = slow_query_threshold
+        self.slow_query_log = slow_query_log
+        self.slow_queries = 0
+        self.started = time.time()
+        self._logger: Optional[logging.Logger] = None
+        self._handler: Optional[logging.Handler] = None
+        
+        if slow_query_threshold is not None:
+            os.makedirs(os.path.dirname(os.path.abspath(slow_query_log)), exist_ok=True)
+            self._handler = logging.handlers.RotatingFileHandler(
+                slow_query_log, maxBytes=max_log_bytes, backupCount=log_backups, encoding='utf-8')
+            self._handler.setFormatter(logging.Formatter('%(message)s'))
+            # One logger per instance so engines with different logs don't share handlers
+            self._logger = logging.getLogger(f"excelsearchpro.slow_queries.{id(self)}")
+            self._logger.propagate = False
+            self._logger.setLevel(logging.INFO)
+            self._logger.addHandler(self._handler)
+    
+    def record(self, operation: str, seconds: float, **details: Any) -> None:
+        """
+        Record one operation's latency; slow searches also go to the slow-query log
+        
+        Args:
+            operation: 'load', 'search' or 'export'
+            seconds: Wall-clock duration
+            details: Query, columns, flags, rows scanned etc. for the log entry
+        """
+        self.histograms[operation].record(seconds)
+        
+        if (operation == 'search' and self._logger is not None
+                and seconds >= self.slow_query_threshold):
+            self.slow_queries += 1
+            entry = {'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'), 'time': round(seconds, 6)}
+            entry.update(details)
+            self._logger.info(json.dumps(entry, ensure_ascii=False, default=str))
+    
+    def snapshot(self) -> Dict[str, Any]:
+        """Latency summaries and slow-query counts as a dictionary"""
+        return {
+            'uptime': time.time() - self.started,
+            'latency': {operation: histogram.summary() for operation, histogram in self.histograms.items()},
+            'slow_query_threshold': self.slow_query_threshold,
+            'slow_queries': self.slow_queries,
+            'slow_query_log': self.slow_query_log if self._logger is not None else None
+        }
+    
+    def format_report(self) -> List[str]:
+        """Human-readable latency table, one line per operation"""
+        snapshot = self.snapshot()
+        lines = [f"{'operation':<10}{'count':>8}{'p50':>11}{'p90':>11}{'p99':>11}{'p99.9':>11}{'max':>11}"]
+        for operation, summary in snapshot['latency'].items():
+            lines.append(f"{operation:<10}{summary['count']:>8,}" + "".join(
+                f"{summary[key] * 1000:>9.1f}ms" for key in ('p50', 'p90', 'p99', 'p99.9', 'max')))
+        if snapshot['slow_query_log']:
+            lines.append(f"Slow queries (≥ {self.slow_query_threshold * 1000:.0f} ms): "
+                         f"{self.slow_queries:,}, logged to {snapshot['slow_query_log']}")
+        return lines
+    
+    def close(self) -> None:
+        """Flush and close the slow-query log"""
+        if self._handler is not None:
+            self._logger.removeHandler(self._handler)
+            self._handler.close()
+            self._handler = None
+            self._logger = None
@@ -14,6 +14,10 @@ import argparse
 # Add current directory to path to allow importing modules
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
+# Only lightweight modules at the top: the GUI and CLI (and with them pandas
+# and Tk) are imported when the user picks one
+from version import __version__
+
 def show_welcome():
     """Display welcome message and menu"""
     print("""
@@ -86,6 +90,7 @@ COMMAND LINE OPTIONS:
   python main.py --gui         - Launch GUI directly
   python main.py --cli         - Launch CLI directly  
   python main.py --interactive - Launch interactive CLI
+  python main.py --version     - Show the version
   python main.py --help        - Show this help
 
 DIRECT LAUNCH:
@@ -108,6 +113,7 @@ FEATURES:
 SUPPORTED FILE FORMATS:
 • Excel files (.xlsx, .xls)
 • CSV files (.csv)
+• Parquet, Feather and Arrow files (.parquet, .feather, .arrow; needs pyarrow)
 
 REQUIREMENTS:
 • Python 3.8 or higher
@@ -129,6 +135,7 @@ def main():
                        help="Launch CLI interface directly")
     parser.add_argument("--interactive", action="store_true",
                        help="Launch interactive CLI mode")
+    parser.add_argument("--version", action="version", version=f"ExcelSearchPro {__version__}")
     
     args = parser.parse_args()
     
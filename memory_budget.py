@@ -0,0 +1,201 @@
+"""
+Memory accounting and a process-wide memory budget for search engines
+Measures what every engine holds and frees the least recently used caches when over budget
+"""
+
+import itertools
+import os
+import threading
+import weakref
+from typing import Any, Dict, List, Optional
+
+# Environment variable giving the default budget in MB (unset means unlimited)
+MEMORY_BUDGET_ENV = 'EXCELSEARCHPRO_MEMORY_BUDGET_MB'
+
+# Cache kinds an engine can drop under memory pressure
+CACHE_KINDS = ('normalized', 'indexes', 'tokens', 'results')
+
+_ticks = itertools.count()
+
+# id(frame) -> (weak reference, bytes); sizes are measured once per DataFrame
+_frame_sizes: Dict[int, Any] = {}
+_frame_sizes_lock = threading.Lock()
+
+
+def next_tick() -> int:
+    """Increasing counter that orders cache entries by last use"""
+    return next(_ticks)
+
+
+def frame_bytes(df) -> int:
+    """
+    Memory held by a DataFrame, including Python string objects
+    
+    Measuring deep usage walks every object value, so the result is
+    remembered for as long as the DataFrame lives.
+    
+    Args:
+        df: DataFrame or None
+    
+    Returns:
+        Size in bytes
+    """
+    if df is None:
+        return 0
+    key = id(df)
+    with _frame_sizes_lock:
+        entry = _frame_sizes.get(key)
+        if entry is not None and entry[0]() is df:
+            return entry[1]
+    
+    nbytes = int(df.memory_usage(index=True, deep=True).sum())
+    with _frame_sizes_lock:
+        _frame_sizes[key] = (weakref.ref(df, lambda _, key=key: _frame_sizes.pop(key, None)), nbytes)
+    return nbytes
+
+
+def series_bytes(series) -> int:
+    """Memory held by a Series' values, including Python string objects"""
+    return int(series.memory_usage(index=False, deep=True))
+
+
+def default_limit_mb() -> Optional[float]:
+    """Budget from the EXCELSEARCHPRO_MEMORY_BUDGET_MB environment variable, if set"""
+    value = os.environ.get(MEMORY_BUDGET_ENV, '').strip()
+    try:
+        return float(value) if value else None
+    except ValueError:
+        return None
+
+
+class MemoryBudget:
+    """
+    Memory limit shared by every engine in the process
+    
+    When the engines together hold more than the limit, enforce() frees memory
+    in this order until usage fits:
+    
+    1. normalized columns, indexes and cached results, least recently used
+       first across all engines
+    2. the pristine ``original_df`` copies, least recently searched engine first
+    3. the loaded data itself, moved to a memory-mapped file so the operating
+       system can page it out (disk-backed mode; needs pyarrow)
+    """
+    
+    def __init__(self, limit_mb: Optional[float] = None, allow_spill: bool = True):
+        """
+        Args:
+            limit_mb: Budget in MB (None means unlimited)
+            allow_spill: Allow moving loaded data to disk-backed mode
+        """
+        self.limit_bytes: Optional[int] = None
+        self.set_limit(limit_mb)
+        self.allow_spill = allow_spill
+        self.evictions = 0
+        self.spills = 0
+        self.freed_bytes = 0
+        self._engines = weakref.WeakSet()
+        self._lock = threading.RLock()
+    
+    def set_limit(self, limit_mb: Optional[float]) -> None:
+        """Change the budget; None removes the limit"""
+        self.limit_bytes = None if limit_mb is None else int(limit_mb * 1024 * 1024)
+    
+    def register(self, engine) -> None:
+        """Count an engine's memory against this budget"""
+        with self._lock:
+            self._engines.add(engine)
+    
+    def unregister(self, engine) -> None:
+        """Stop counting an engine's memory"""
+        with self._lock:
+            self._engines.discard(engine)
+    
+    def resident_bytes(self, engines: Optional[List[Any]] = None) -> int:
+        """
+        Bytes held in RAM by the engines
+        
+        DataFrames shared by several engines (for example after a preload is
+        adopted) are counted once.
+        """
+        if engines is None:
+            engines = list(self._engines)
+        frames = {}
+        total = 0
+        for engine in engines:
+            for df in engine._resident_frames():
+                frames[id(df)] = df
+            total += engine._cache_bytes()
+        return total + sum(frame_bytes(df) for df in frames.values())
+    
+    def usage(self) -> Dict[str, Any]:
+        """Budget, resident bytes and eviction counters"""
+        with self._lock:
+            engines = list(self._engines)
+            return {
+                'budget_bytes': self.limit_bytes,
+                'resident_bytes': self.resident_bytes(engines),
+                'engines': len(engines),
+                'evictions': self.evictions,
+                'spills': self.spills,
+                'freed_bytes': self.freed_bytes
+            }
+    
+    def enforce(self) -> int:
+        """
+        Free memory until the engines fit the budget
+        
+        Returns:
+            Bytes freed (0 when within budget or unlimited)
+        """
+        limit = self.limit_bytes
+        if limit is None:
+            return 0
+        
+        with self._lock:
+            engines = list(self._engines)
+            resident = self.resident_bytes(engines)
+            if resident <= limit:
+                return 0
+            start = resident
+            
+            entries = sorted(
+                (tick, nbytes, index, kind, key)
+                for index, engine in enumerate(engines)
+                for tick, nbytes, kind, key in engine._cache_entries()
+            )
+            for tick, nbytes, index, kind, key in entries:
+                if resident <= limit:
+                    break
+                freed = engines[index]._evict(kind, key)
+                if freed:
+                    self.evictions += 1
+                    resident -= freed
+            
+            for engine in sorted(engines, key=lambda engine: engine._last_used):
+                if resident <= limit:
+                    break
+                if engine._release_original():
+                    resident = self.resident_bytes(engines)
+                if resident > limit and self.allow_spill and engine.spill_to_disk():
+                    self.spills += 1
+                    resident = self.resident_bytes(engines)
+            
+            freed = max(start - resident, 0)
+            self.freed_bytes += freed
+            return freed
+
+
+# Budget shared by all engines unless one is given its own
+GLOBAL_MEMORY_BUDGET = MemoryBudget(default_limit_mb())
+
+
+def set_memory_budget(limit_mb: Optional[float]) -> None:
+    """
+    Set the process-wide memory budget
+    
+    Args:
+        limit_mb: Budget in MB (None means unlimited)
+    """
+    GLOBAL_MEMORY_BUDGET.set_limit(limit_mb)
+    GLOBAL_MEMORY_BUDGET.enforce()
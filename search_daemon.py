@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Excel Database Search Tool - Query Daemon
+Keeps workbooks loaded and indexed, answering searches over a local Unix socket
+"""
+
+import json
+import os
+import socket
+import socketserver
+from typing import Any, Dict, List, Optional
+from search_service import SearchService
+
+# Default socket location, overridable with the EXCELSEARCH_DAEMON environment variable
+DEFAULT_SOCKET_PATH = os.environ.get(
+    'EXCELSEARCH_DAEMON',
+    os.path.join(os.path.expanduser('~'), '.excelsearchpro', 'daemon.sock')
+)
+
+
+class SearchDaemon(SearchService):
+    """Long-lived process holding loaded workbooks for fast repeated searches"""
+    
+    def __init__(self, socket_path: str = DEFAULT_SOCKET_PATH):
+        super().__init__()
+        self.socket_path = socket_path
+        self._server: Optional[socketserver.BaseServer] = None
+    
+    def serve_forever(self, preload_files: Optional[List[str]] = None):
+        """
+        Listen on the Unix socket until a shutdown request arrives
+        
+        Args:
+            preload_files: Files to load and index before accepting requests
+        """
+        if not hasattr(socket, 'AF_UNIX'):
+            raise OSError("The query daemon needs Unix domain sockets, which this platform lacks")
+        
+        for file_path in preload_files or []:
+            engine, message = self.get_engine(file_path)
+            print(f"{'✅' if engine else '❌'} {os.path.basename(file_path)}: {message}")
+        
+        os.makedirs(os.path.dirname(os.path.abspath(self.socket_path)), exist_ok=True)
+        if os.path.exists(self.socket_path):
+            if ping_daemon(self.socket_path):
+                raise OSError(f"A daemon is already listening on {self.socket_path}")
+            os.unlink(self.socket_path)  # Stale socket from a crashed daemon
+        
+        daemon = self
+        
+        class RequestHandler(socketserver.StreamRequestHandler):
+            """One JSON request per line, one JSON response per line"""
+            
+            def handle(self):
+                for line in self.rfile:
+                    if not line.strip():
+                        continue
+                    try:
+                        request = json.loads(line)
+                    except ValueError as e:
+                        response = {'ok': False, 'error': f"Invalid request: {e}"}
+                    else:
+                        response = daemon.handle_request(request)
+                    self.wfile.write(json.dumps(response, default=str).encode('utf-8') + b'\n')
+                    self.wfile.flush()
+        
+        class Server(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+            daemon_threads = True
+        
+        self._server = Server(self.socket_path, RequestHandler)
+        self.shutdown_callback = self._server.shutdown
+        os.chmod(self.socket_path, 0o600)  # Only the owning user may query
+        print(f"🚀 Query daemon listening on {self.socket_path}")
+        try:
+            self._server.serve_forever()
+        finally:
+            self._server.server_close()
+            if os.path.exists(self.socket_path):
+                os.unlink(self.socket_path)
+
+
+def daemon_request(socket_path: str, request: Dict[str, Any], timeout: Optional[float] = None) -> Dict[str, Any]:
+    """
+    Send one request to a running daemon and return its response
+    
+    Args:
+        socket_path: Path of the daemon's Unix socket
+        request: Request dictionary (see SearchService.handle_request)
+        timeout: Socket timeout in seconds (None waits indefinitely)
+    
+    Returns:
+        Response dictionary
+    
+    Raises:
+        OSError: If the daemon is not reachable
+    """
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.settimeout(timeout)
+        sock.connect(socket_path)
+        sock.sendall(json.dumps(request).encode('utf-8') + b'\n')
+        with sock.makefile('rb') as reader:
+            line = reader.readline()
+    
+    if not line:
+        raise OSError("Daemon closed the connection without a response")
+    return json.loads(line)
+
+
+def ping_daemon(socket_path: str) -> bool:
+    """Check whether a daemon answers on the socket"""
+    try:
+        return daemon_request(socket_path, {'op': 'ping'}, timeout=2).get('ok', False)
+    except (OSError, ValueError):
+        return False
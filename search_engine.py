@@ -4,10 +4,45 @@ Provides fast, efficient searching capabilities for large datasets
 """
 
 import pandas as pd
+import numpy as np
 import re
 import time
 import os
-from typing import List, Optional, Tuple, Dict, Any
+import gc
+import hashlib
+import io
+import mmap
+import threading
+import uuid
+import tempfile
+from collections import OrderedDict
+from typing import List, Optional, Tuple, Dict, Any, Iterator, Callable
+from search_index import TokenIndex, ValueIndex, parse_word_term
+from exporters import export_dataframe, write_chunks, ExportCancelled
+from file_watcher import FileWatcher
+from index_store import index_path, load_index_file, save_index_file
+from instrumentation import Instrumentation, DEFAULT_SLOW_QUERY_LOG
+from memory_budget import GLOBAL_MEMORY_BUDGET, CACHE_KINDS, frame_bytes, series_bytes, next_tick
+from utils import compact_dataframe, format_file_size
+
+# Cache kind holding each index type saved in index files
+INDEX_CACHE_KINDS = {'value': 'indexes', 'token': 'tokens'}
+
+# Phases reported in search stats['phases'], in execution order
+SEARCH_PHASES = ('validate', 'result_cache', 'string_conversion', 'lowercase', 'match',
+                 'combine', 'materialize')
+
+# Encodings tried, in order, when reading CSV files
+CSV_ENCODINGS = ['utf-8', 'utf-8-sig', 'cp1256', 'iso-8859-1']
+
+# Columnar formats opened memory-mapped with pyarrow
+ARROW_EXTENSIONS = ('.parquet', '.feather', '.arrow')
+
+# Columns loaded up front by a lazy load when none are given (the default search columns)
+LAZY_DEFAULT_COLUMNS = 2
+
+# Rows read per chunk by out-of-core searches (see search_file)
+OUT_OF_CORE_CHUNK_ROWS = 100000
 
 class ExcelSearchEngine:
     """High-performance search engine for Excel databases"""
@@ -18,31 +53,127 @@ class ExcelSearchEngine:
         self.file_path: str = ""
         self.load_time: float = 0
         self.file_info: Dict[str, Any] = {}
+        
+        # Progressive loading state
+        self.loading: bool = False
+        self.load_progress: Dict[str, Any] = {}
+        self._load_generation: int = 0
+        
+        # Speculative load started by preload()
+        self._preload: Optional[Dict[str, Any]] = None
+        
+        # Normalized columns, indexes and results derived from the current DataFrame
+        self._cache: Optional[Dict[str, Any]] = None
+        self._cache_lock = threading.Lock()
+        self.result_cache_size: int = 32
+    
+        # Latency histograms and slow-query log, off unless enable_instrumentation() is called
+        self.instrumentation: Optional[Instrumentation] = None
+        
+        # Memory limit shared with the other engines in the process
+        self.memory_budget = GLOBAL_MEMORY_BUDGET
+        self.memory_budget.register(self)
+        self._last_used: int = next_tick()
+        
+        # Memory-mapped file holding self.df in disk-backed mode
+        self.disk_backed: bool = False
+        self._spill_path: Optional[str] = None
+        
+        # Columns left in the file by a lazy load and how to read them back
+        self._lazy: Optional[Dict[str, Any]] = None
+        self._lazy_lock = threading.Lock()
+        
+        # Before/after report of the last dtype compaction (None when not compacted)
+        self.compaction: Optional[Dict[str, Any]] = None
+        
+        # File version and load options refresh() compares against, plus the
+        # size and hash it uses to spot rows appended to a CSV file
+        self._source: Optional[Dict[str, Any]] = None
+        self._refresh_lock = threading.Lock()
+        
+        # Background watcher reloading the file when it changes (see watch)
+        self._watch: Optional[Dict[str, Any]] = None
     
-    def load_file(self, file_path: str) -> Tuple[bool, str]:
+    def load_file(self,
+                  file_path: str,
+                  progress_callback: Optional[Callable[[Dict[str, Any]], None]] = None,
+                  cancel_event: Optional[threading.Event] = None,
+                  columns: Optional[List[str]] = None,
+                  lazy: bool = False,
+                  compact: bool = False) -> Tuple[bool, str]:
         """
         Load Excel file into memory for fast searching
         
+        When a progress callback or cancel event is given the file is parsed in
+        chunks, so progress can be reported and the load stopped between chunks.
+        A cancelled load leaves the previously loaded data untouched.
+        
+        Parquet, Feather and Arrow files are opened memory-mapped instead (see
+        _read_arrow_file), which takes milliseconds for uncompressed files.
+        
+        A lazy load parses only ``columns`` (by default the first two, which
+        are also the default search columns). The other columns stay in the
+        file: search() returns the loaded columns, complete_rows() and the
+        exports read the others for the rows shown or written only (see
+        fetch_rows), and searching one loads it in full (see load_columns).
+        
+        With compact set the loaded columns are stored in the smallest dtypes
+        that search the same (see utils.compact_dataframe); the before/after
+        memory is kept in ``self.compaction`` and file_info.
+        
         Args:
-            file_path: Path to Excel file
+            file_path: Path to Excel, CSV, Parquet, Feather or Arrow file
+            progress_callback: Called after every chunk with a progress dictionary
+                (bytes_read, total_bytes, rows_loaded, percent, eta_seconds, ...)
+            cancel_event: Load stops as soon as this event is set
+            columns: Columns to load (default: all); other columns are dropped
+                unless lazy is set
+            lazy: Keep the columns that are not loaded available on demand
+            compact: Downcast numbers and encode text compactly after loading
             
         Returns:
             Tuple of (success, message)
         """
         try:
             start_time = time.time()
+            disk_backed = False
+            lower_path = file_path.lower()
             
             # Handle Unicode filenames
             if not os.path.exists(file_path):
                 return False, f"File not found: {os.path.basename(file_path)}"
             
+            # Reuse a speculative load of the same file if one was started
+            preload = self._take_preload(file_path)
+            if preload is not None:
+                return self._adopt_preload(preload, progress_callback, cancel_event, wait=True)
+            
+            # Resolve the columns to parse, in file order
+            file_columns = None
+            if lazy or (columns is not None and not lower_path.endswith(ARROW_EXTENSIONS)):
+                file_columns = self._file_columns(file_path)
+                if columns is None:
+                    columns = file_columns[:LAZY_DEFAULT_COLUMNS]
+                unknown = [col for col in columns if col not in file_columns]
+                if unknown:
+                    return False, f"Unknown columns: {unknown}"
+                columns = [col for col in file_columns if col in columns]
+            
             # Determine file type and load accordingly
-            if file_path.lower().endswith('.csv'):
+            if ((progress_callback or cancel_event or columns is not None)
+                    and lower_path.endswith(('.csv', '.xlsx', '.xls'))):
+                df = self._read_chunked(file_path, start_time, progress_callback, cancel_event, columns)
+                if df is None:
+                    return False, "Load cancelled"
+            
+            elif lower_path.endswith(ARROW_EXTENSIONS):
+                df, disk_backed = self._read_arrow_file(file_path, columns)
+            
+            elif file_path.lower().endswith('.csv'):
                 # Try different encodings for CSV files
-                encodings = ['utf-8', 'utf-8-sig', 'cp1256', 'iso-8859-1']
-                for encoding in encodings:
+                for encoding in CSV_ENCODINGS:
                     try:
-                        self.df = pd.read_csv(file_path, encoding=encoding)
+                        df = pd.read_csv(file_path, encoding=encoding)
                         break
                     except UnicodeDecodeError:
                         continue
@@ -52,38 +183,1221 @@ class ExcelSearchEngine:
             elif file_path.lower().endswith(('.xlsx', '.xls')):
                 # Use openpyxl for .xlsx, xlrd for .xls
                 engine = 'openpyxl' if file_path.lower().endswith('.xlsx') else 'xlrd'
-                self.df = pd.read_excel(file_path, engine=engine)
+                df = pd.read_excel(file_path, engine=engine)
             else:
                 return False, f"Unsupported file format: {os.path.splitext(file_path)[1]}"
             
-            self.original_df = self.df.copy()
+            # Only now stop any progressive load still streaming into this engine, so a
+            # load that fails or is cancelled leaves the one in progress running
+            self._load_generation += 1
+            self.loading = False
+            self.df = df
+            
+            # Mapped Arrow columns are already compact and must stay mapped
+            self.compaction = None
+            if compact and not disk_backed:
+                self.df, self.compaction = compact_dataframe(self.df)
+            
+            # Mapped Arrow data is read-only, so it needs no pristine copy
+            self.original_df = self.df if disk_backed else self.df.copy()
+            self._drop_spill()
+            self.disk_backed = disk_backed
+            self._cache = None
+            self._lazy = None
+            if lazy and len(columns) < len(file_columns):
+                self._lazy = self._lazy_source(file_path, file_columns, columns, len(self.df))
+            self._source = {
+                'fingerprint': self._file_fingerprint(file_path),
+                'options': {'columns': columns, 'lazy': lazy, 'compact': compact},
+                'append': None
+            }
+            if lower_path.endswith('.csv') and columns is None:
+                self._source['append'] = self._csv_append_state(file_path)
             self.file_path = file_path
             self.load_time = time.time() - start_time
             
             # Gather file information
+            self._update_file_info()
             rows, cols = self.df.shape
-            file_size = os.path.getsize(file_path) / (1024 * 1024)  # MB
-            
-            self.file_info = {
-                'rows': rows,
-                'columns': cols,
-                'file_size_mb': file_size,
-                'load_time': self.load_time,
-                'column_names': list(self.df.columns)
-            }
+            self._record('load', self.load_time, file=file_path, rows=rows)
+            self.memory_budget.enforce()
             
-            return True, f"Successfully loaded {rows:,} rows and {cols} columns in {self.load_time:.2f} seconds"
+            message = f"Successfully loaded {rows:,} rows and {cols} columns in {self.load_time:.2f} seconds"
+            if self._lazy:
+                message += f" ({len(self._lazy['columns'])} more columns are read on demand)"
+            if self.compaction is not None:
+                message += (f", compacted {format_file_size(self.compaction['before_bytes'])} "
+                            f"-> {format_file_size(self.compaction['after_bytes'])}")
+            return True, message
             
         except Exception as e:
             return False, f"Error loading file: {str(e)}"
     
+    def load_dataframe(self, df: pd.DataFrame, file_path: str, load_time: float = 0.0) -> Tuple[bool, str]:
+        """
+        Use an already parsed DataFrame as the loaded data
+        
+        For data read elsewhere, such as one sheet of a workbook parsed in
+        another process (see workbook_search).
+        
+        Args:
+            df: Data to search
+            file_path: File the data came from
+            load_time: Seconds spent reading it
+            
+        Returns:
+            Tuple of (success, message)
+        """
+        self.discard_preload()
+        self._load_generation += 1
+        self.loading = False
+        self.load_progress = {}
+        
+        self.df = df
+        self.original_df = df.copy()
+        self._drop_spill()
+        self.disk_backed = False
+        self._cache = None
+        self._lazy = None
+        self.compaction = None
+        self._source = None
+        self.file_path = file_path
+        self.load_time = load_time
+        
+        self._update_file_info()
+        rows, cols = df.shape
+        self._record('load', load_time, file=file_path, rows=rows)
+        self.memory_budget.enforce()
+        return True, f"Loaded {rows:,} rows and {cols} columns"
+    
+    def refresh(self) -> Tuple[bool, str]:
+        """
+        Bring the loaded data up to date with its file
+        
+        When a CSV file only grew (its earlier bytes hash the same as when it
+        was loaded and it ended with a complete line), just the new rows are
+        parsed. The DataFrame is extended and the normalized columns and
+        indexes are extended rather than rebuilt; cached results are dropped.
+        Any other change reloads the file in full with the same options.
+        
+        Either way the new data and its indexes are built next to the old
+        ones and swapped in together, so searches already running finish on
+        the data they started with and later searches never see a half-built
+        state.
+        
+        Returns:
+            Tuple of (success, message)
+        """
+        with self._refresh_lock:
+            if self.df is None or not self.file_path:
+                return False, "No file loaded"
+            if self.loading:
+                return False, "File is still loading"
+            
+            source = self._source or {'fingerprint': None, 'options': {}, 'append': None}
+            fingerprint = self._file_fingerprint(self.file_path)
+            if fingerprint is None:
+                return False, f"File not found: {os.path.basename(self.file_path)}"
+            if fingerprint == source['fingerprint']:
+                return True, "File unchanged"
+            
+            if source['append'] is not None and not self.disk_backed:
+                try:
+                    appended = self._read_appended(source['append'])
+                    if appended is not None:
+                        result = self._append_rows(*appended)
+                        if result is not None:
+                            return result
+                except Exception:
+                    pass  # Anything unexpected in the new rows: reload in full
+            
+            return self._reload_and_swap(source['options'])
+    
+    def _reload_and_swap(self, options: Dict[str, Any]) -> Tuple[bool, str]:
+        """Load the file into a new engine, rebuild this engine's indexes there, then swap it all in"""
+        fresh = ExcelSearchEngine()
+        fresh.instrumentation = self.instrumentation
+        fresh.memory_budget.unregister(fresh)
+        fresh.memory_budget = self.memory_budget
+        self.memory_budget.register(fresh)
+        try:
+            success, message = fresh.load_file(self.file_path, **options)
+            if not success:
+                return False, message
+            
+            with self._cache_lock:
+                cache = self._cache
+                current = cache is not None and cache['df'] is self.df
+                keys = list(cache['indexes']) if current else []
+                token_keys = list(cache['tokens']) if current else []
+            for column, case_sensitive in keys:
+                if column in fresh.df.columns:
+                    fresh.build_indexes([column], (case_sensitive,))
+            for column, case_sensitive in token_keys:
+                if column in fresh.df.columns:
+                    fresh._token_index(fresh.df, fresh._get_cache(fresh.df), column, case_sensitive)
+            
+            with self._cache_lock:
+                self._drop_spill()
+                self._adopt_state(fresh)
+                self._spill_path = fresh._spill_path
+                self._cache = fresh._cache
+                fresh._spill_path = None
+            self.memory_budget.enforce()
+            return True, message
+        finally:
+            self.memory_budget.unregister(fresh)
+    
+    def watch(self, callback: Optional[Callable[[bool, str], None]] = None,
+              interval: float = 1.0, use_inotify: bool = True) -> Tuple[bool, str]:
+        """
+        Refresh the loaded data in the background whenever its file changes
+        
+        Changes are noticed through inotify on Linux and by polling the file's
+        size and modification time elsewhere. Each change runs refresh() on
+        the watcher thread, which swaps the new data and indexes in at once.
+        
+        Args:
+            callback: Called from the watcher thread with refresh()'s
+                (success, message) after each change
+            interval: Seconds between checks when polling
+            use_inotify: Use inotify where available instead of polling
+        
+        Returns:
+            Tuple of (success, message)
+        """
+        if self.df is None or not self.file_path:
+            return False, "No file loaded"
+        
+        self.stop_watching()
+        watcher = FileWatcher(self.file_path, self._on_file_change, interval, use_inotify=use_inotify)
+        self._watch = {'watcher': watcher, 'callback': callback}
+        watcher.start()
+        return True, f"Watching {os.path.basename(self.file_path)} for changes ({watcher.backend})"
+    
+    def stop_watching(self):
+        """Stop the watcher started by watch(), if any"""
+        watch, self._watch = self._watch, None
+        if watch is not None:
+            watch['watcher'].stop()
+    
+    @property
+    def watching(self) -> bool:
+        """Whether a watcher is refreshing the data on file changes"""
+        return self._watch is not None
+    
+    def _on_file_change(self):
+        """Watcher callback: refresh, unless another file was loaded since watching began"""
+        watch = self._watch
+        if watch is None or os.path.abspath(self.file_path or '') != watch['watcher'].file_path:
+            return
+        success, message = self.refresh()
+        if watch['callback'] is not None:
+            watch['callback'](success, message)
+    
+    def _csv_append_state(self, file_path: str) -> Dict[str, Any]:
+        """Size, content hash and encoding of a CSV file, for detecting appends later"""
+        hasher = hashlib.blake2b(digest_size=16)
+        size = 0
+        last = b'\n'
+        with open(file_path, 'rb') as f:
+            for block in iter(lambda: f.read(1024 * 1024), b''):
+                hasher.update(block)
+                size += len(block)
+                last = block[-1:]
+        return {
+            'size': size,
+            'hasher': hasher,
+            'newline_end': last == b'\n',
+            'encoding': self._detect_csv_encoding(file_path)
+        }
+    
+    def _read_appended(self, state: Dict[str, Any]) -> Optional[Tuple[Dict[str, Any], bytes]]:
+        """
+        Bytes appended to the file since it was loaded
+        
+        Returns:
+            Tuple of (new append state with the file's fingerprint, appended
+            bytes), or None if earlier content changed, the file shrank or its
+            last line was incomplete
+        """
+        if not state['newline_end'] or state['encoding'] is None:
+            return None
+        
+        # Taken first: a later append then shows up as a change on the next refresh
+        fingerprint = self._file_fingerprint(self.file_path)
+        hasher = hashlib.blake2b(digest_size=16)
+        with open(self.file_path, 'rb') as f:
+            remaining = state['size']
+            while remaining:
+                block = f.read(min(remaining, 1024 * 1024))
+                if not block:
+                    return None
+                hasher.update(block)
+                remaining -= len(block)
+            if hasher.digest() != state['hasher'].digest():
+                return None
+            tail = f.read()
+        
+        hasher.update(tail)
+        new_state = dict(state, size=state['size'] + len(tail), hasher=hasher, fingerprint=fingerprint,
+                         newline_end=tail.endswith(b'\n') if tail else True)
+        return new_state, tail
+    
+    def _append_rows(self, state: Dict[str, Any], tail: bytes) -> Optional[Tuple[bool, str]]:
+        """
+        Parse appended CSV rows and extend the data, normalized columns and indexes
+        
+        Text columns are parsed as text, so values like "00124" keep their
+        leading zeros. If the new rows change how another column would be
+        typed (text in a number column), the merged data would differ from a
+        fresh load, so nothing is changed and None is returned.
+        
+        Returns:
+            Tuple of (success, message), or None when the file must be reloaded in full
+        """
+        start_time = time.time()
+        fingerprint = state.pop('fingerprint')
+        if not tail.strip():
+            self._source = dict(self._source, fingerprint=fingerprint, append=state)
+            return True, "File unchanged"
+        
+        df = self.df
+        text_columns = {column: str for column in df.columns
+                        if pd.api.types.is_string_dtype(df[column].dtype)
+                        or isinstance(df[column].dtype, pd.CategoricalDtype)}
+        added = pd.read_csv(io.BytesIO(tail), header=None, names=list(df.columns),
+                            index_col=False, encoding=state['encoding'], dtype=text_columns)
+        added.index = pd.RangeIndex(len(df), len(df) + len(added))
+        merged = pd.concat([df, added])
+        for column in df.columns:
+            before, after = df[column].dtype.kind, merged[column].dtype.kind
+            # Integers widening to floats (a decimal or blank value) match a fresh load
+            if column not in text_columns and before != after and not (before in 'iu' and after == 'f'):
+                return None
+        
+        if self.compaction is not None:
+            merged, report = compact_dataframe(merged)
+            self.compaction = dict(report, before_bytes=report['before_bytes'] + self.compaction['before_bytes']
+                                   - self.compaction['after_bytes'],
+                                   columns={**self.compaction['columns'], **report['columns']})
+        
+        # Carry over caches of columns whose dtype (and so text form) did not change
+        old_cache = self._get_cache(df)
+        cache = {'df': merged, 'normalized': {}, 'indexes': {}, 'tokens': {}, 'results': OrderedDict(),
+                 'usage': {}}
+        tail_rows = merged.iloc[len(df):]
+        with self._cache_lock:
+            normalized = dict(old_cache['normalized'])
+            indexes = dict(old_cache['indexes'])
+            tokens = dict(old_cache['tokens'])
+        for key in set(normalized) | set(indexes) | set(tokens):
+            column, case_sensitive = key
+            if merged[column].dtype != df[column].dtype:
+                continue
+            added_values = tail_rows[column].astype(str).fillna("")
+            if not case_sensitive:
+                added_values = added_values.str.lower()
+            if key in normalized:
+                cache['normalized'][key] = pd.concat([normalized[key], added_values])
+                self._track(cache, 'normalized', key, series_bytes(cache['normalized'][key]))
+            if key in indexes:
+                cache['indexes'][key] = indexes[key].extend(added_values)
+                self._track(cache, 'indexes', key, cache['indexes'][key].nbytes)
+            if key in tokens:
+                cache['tokens'][key] = tokens[key].extend(added_values)
+                self._track(cache, 'tokens', key, cache['tokens'][key].nbytes)
+        
+        with self._cache_lock:
+            self.df = merged
+            self._cache = cache
+        if self.original_df is not None:
+            self.original_df = merged.copy()
+        self._source = dict(self._source, fingerprint=fingerprint, append=state)
+        self._update_file_info()
+        elapsed = time.time() - start_time
+        self._record('load', elapsed, file=self.file_path, rows=len(added), appended=True)
+        self.memory_budget.enforce()
+        return True, f"Appended {len(added):,} rows in {elapsed:.2f} seconds ({len(merged):,} rows total)"
+    
+    def _read_chunked(self, file_path: str, start_time: float,
+                      progress_callback: Optional[Callable[[Dict[str, Any]], None]],
+                      cancel_event: Optional[threading.Event],
+                      columns: Optional[List[str]] = None) -> Optional[pd.DataFrame]:
+        """
+        Read a whole file chunk by chunk, reporting progress
+        
+        Returns:
+            The loaded DataFrame, or None if the load was cancelled
+        """
+        chunks: List[pd.DataFrame] = []
+        rows_loaded = 0
+        reader = self._iter_chunks(file_path, columns=columns)
+        
+        try:
+            for chunk, raw_progress in reader:
+                if cancel_event is not None and cancel_event.is_set():
+                    break
+                chunks.append(chunk)
+                rows_loaded += len(chunk)
+                if progress_callback:
+                    progress_callback(self._make_progress(raw_progress, rows_loaded, start_time))
+            else:
+                if not chunks:
+                    return pd.DataFrame()
+                return pd.concat(chunks, ignore_index=True) if len(chunks) > 1 else chunks[0]
+        finally:
+            reader.close()
+        
+        # Cancelled: drop the partial chunks right away rather than on the next GC cycle
+        del chunks, chunk
+        gc.collect()
+        return None
+    
+    def load_file_progressive(self,
+                              file_path: str,
+                              preview_rows: int = 1000,
+                              chunk_rows: int = 50000,
+                              progress_callback: Optional[Callable[[Dict[str, Any]], None]] = None,
+                              cancel_event: Optional[threading.Event] = None
+                              ) -> Tuple[bool, str]:
+        """
+        Load the first rows of a file immediately and stream the rest in background
+        
+        The preview rows are available for display and search as soon as this
+        method returns. The remaining rows are parsed on a daemon thread and
+        published to ``self.df`` as they arrive; ``self.loading`` stays True and
+        ``self.load_progress`` is updated until the load finishes.
+        
+        Args:
+            file_path: Path to Excel or CSV file
+            preview_rows: Number of rows to load before returning
+            chunk_rows: Number of rows parsed per background chunk
+            progress_callback: Called from the loader thread with a progress
+                dictionary after every chunk and once more when done
+            cancel_event: Setting this event stops the background load and
+                releases everything loaded so far
+            
+        Returns:
+            Tuple of (success, message) for the preview load
+        """
+        if not os.path.exists(file_path):
+            return False, f"File not found: {os.path.basename(file_path)}"
+        
+        if not file_path.lower().endswith(('.csv', '.xlsx', '.xls') + ARROW_EXTENSIONS):
+            return False, f"Unsupported file format: {os.path.splitext(file_path)[1]}"
+        
+        preload = self._take_preload(file_path)
+        if preload is not None:
+            return self._adopt_preload(preload, progress_callback, cancel_event, wait=False)
+        
+        # Memory-mapped formats open at once; there is nothing to stream
+        if file_path.lower().endswith(ARROW_EXTENSIONS):
+            start_time = time.time()
+            success, message = self.load_file(file_path, cancel_event=cancel_event)
+            if success:
+                self.load_progress = self._make_progress(None, len(self.df), start_time)
+                self.load_progress.update(done=True, message=message)
+                if progress_callback:
+                    progress_callback(dict(self.load_progress))
+            return success, message
+        
+        start_time = time.time()
+        
+        try:
+            chunks = self._iter_chunks(file_path, chunk_rows, first_chunk_rows=preview_rows)
+            first_chunk, progress = next(chunks, (None, None))
+        except Exception as e:
+            return False, f"Error loading file: {str(e)}"
+        
+        if first_chunk is None:
+            return False, "File contains no data"
+        
+        if cancel_event is not None and cancel_event.is_set():
+            chunks.close()
+            return False, "Load cancelled"
+        
+        # Only now stop any previous background load, so a preview that fails leaves it running
+        self._load_generation += 1
+        generation = self._load_generation
+        self.df = first_chunk.reset_index(drop=True)
+        self.original_df = None
+        self.compaction = None
+        self._source = None
+        self._drop_spill()
+        self._cache = None
+        self._lazy = None
+        self.file_path = file_path
+        self.load_time = time.time() - start_time
+        self.loading = True
+        self.load_progress = self._make_progress(progress, len(self.df), start_time)
+        self._update_file_info()
+        
+        threading.Thread(
+            target=self._stream_remaining_chunks,
+            args=(generation, chunks, [first_chunk], start_time, progress_callback, cancel_event),
+            daemon=True
+        ).start()
+        
+        return True, (f"Loaded first {len(self.df):,} rows in {self.load_time:.2f} seconds, "
+                      f"loading the rest in background")
+    
+    def _stream_remaining_chunks(self, generation: int, chunks: Iterator,
+                                 loaded: List[pd.DataFrame], start_time: float,
+                                 progress_callback: Optional[Callable[[Dict[str, Any]], None]],
+                                 cancel_event: Optional[threading.Event] = None):
+        """Consume the chunk iterator of a progressive load on a background thread"""
+        rows_loaded = sum(len(chunk) for chunk in loaded)
+        published_rows = rows_loaded
+        progress = dict(self.load_progress)
+        
+        try:
+            for chunk, raw_progress in chunks:
+                if generation != self._load_generation:
+                    chunks.close()
+                    return
+                
+                if cancel_event is not None and cancel_event.is_set():
+                    chunks.close()
+                    del chunk
+                    loaded.clear()
+                    self.reset()
+                    gc.collect()
+                    progress['done'] = True
+                    progress['cancelled'] = True
+                    if progress_callback:
+                        progress_callback(dict(progress))
+                    return
+                
+                loaded.append(chunk)
+                rows_loaded += len(chunk)
+                progress = self._make_progress(raw_progress, rows_loaded, start_time)
+                
+                # Publish when the row count doubles so concatenation stays linear overall
+                if rows_loaded >= published_rows * 2:
+                    self.df = pd.concat(loaded, ignore_index=True)
+                    loaded[:] = [self.df]
+                    published_rows = rows_loaded
+                    self._update_file_info()
+                
+                self.load_progress = progress
+                if progress_callback:
+                    progress_callback(dict(progress))
+            
+            if generation != self._load_generation:
+                return
+            
+            self.df = pd.concat(loaded, ignore_index=True) if len(loaded) > 1 else loaded[0]
+            self.original_df = self.df.copy()
+            self.load_time = time.time() - start_time
+            self.loading = False
+            self._update_file_info()
+            self._record('load', self.load_time, file=self.file_path, rows=len(self.df))
+            self.memory_budget.enforce()
+            
+            progress.update(self._make_progress(None, len(self.df), start_time))
+            progress['done'] = True
+            progress['message'] = (f"Successfully loaded {len(self.df):,} rows and "
+                                   f"{len(self.df.columns)} columns in {self.load_time:.2f} seconds")
+        except Exception as e:
+            if generation != self._load_generation:
+                return
+            self.loading = False
+            progress['done'] = True
+            progress['error'] = f"Error loading file: {str(e)}"
+        
+        self.load_progress = progress
+        if progress_callback:
+            progress_callback(dict(progress))
+    
+    def preload(self, file_path: str) -> bool:
+        """
+        Start loading a file speculatively in the background
+        
+        The file is loaded progressively into a private engine, leaving the
+        currently loaded data untouched. A later load_file or load_file_progressive
+        call for the same unchanged file takes over this load, whether it is
+        still running or already finished. Only one speculative load is kept;
+        starting another discards the previous one.
+        
+        Args:
+            file_path: Path to Excel or CSV file
+            
+        Returns:
+            True if a speculative load is running or finished for the file
+        """
+        fingerprint = self._file_fingerprint(file_path)
+        if fingerprint is None or not file_path.lower().endswith(('.csv', '.xlsx', '.xls') + ARROW_EXTENSIONS):
+            return False
+        
+        if self._preload is not None and self._preload['fingerprint'] == fingerprint:
+            return True
+        
+        self.discard_preload()
+        
+        engine = ExcelSearchEngine()
+        preload = {
+            'fingerprint': fingerprint,
+            'engine': engine,
+            'cancel_event': threading.Event(),
+            'preview_ready': threading.Event(),
+            'finished': threading.Event(),
+            'lock': threading.Lock(),
+            'listener': None,
+            'progress': None,
+            'result': None
+        }
+        
+        def on_progress(progress):
+            with preload['lock']:
+                preload['progress'] = progress
+                listener = preload['listener']
+            if progress['done']:
+                preload['finished'].set()
+            if listener:
+                listener(progress)
+        
+        def run():
+            preload['result'] = engine.load_file_progressive(
+                file_path, progress_callback=on_progress, cancel_event=preload['cancel_event'])
+            preload['preview_ready'].set()
+            if not preload['result'][0]:
+                preload['finished'].set()
+        
+        self._preload = preload
+        threading.Thread(target=run, daemon=True).start()
+        return True
+    
+    def discard_preload(self):
+        """Cancel and drop the speculative load, if any"""
+        if self._preload is not None:
+            self._preload['cancel_event'].set()
+            self._preload = None
+    
+    def _take_preload(self, file_path: str) -> Optional[Dict[str, Any]]:
+        """Return the speculative load for file_path if the file is unchanged since it started"""
+        preload = self._preload
+        if preload is None:
+            return None
+        
+        self._preload = None
+        if preload['fingerprint'] != self._file_fingerprint(file_path):
+            preload['cancel_event'].set()
+            return None
+        return preload
+    
+    def _adopt_preload(self, preload: Dict[str, Any],
+                       progress_callback: Optional[Callable[[Dict[str, Any]], None]],
+                       cancel_event: Optional[threading.Event],
+                       wait: bool) -> Tuple[bool, str]:
+        """
+        Take over a speculative load started by preload()
+        
+        Args:
+            preload: Speculative load state
+            progress_callback: Receives the remaining progress updates
+            cancel_event: Cancels the speculative load when set
+            wait: Wait for the complete file instead of just the preview rows
+            
+        Returns:
+            Tuple of (success, message)
+        """
+        engine = preload['engine']
+        # The background stream can finish before the preview call returns, so
+        # the preview result is always awaited first
+        events = [preload['preview_ready'], preload['finished']] if wait else [preload['preview_ready']]
+        for ready in events:
+            while not ready.wait(0.05):
+                if cancel_event is not None and cancel_event.is_set():
+                    preload['cancel_event'].set()
+                    return False, "Load cancelled"
+        
+        success, message = preload['result']
+        if not success:
+            return False, message
+        
+        final_progress = preload['progress'] or {}
+        if wait and final_progress.get('error'):
+            return False, final_progress['error']
+        
+        self._load_generation += 1
+        generation = self._load_generation
+        
+        def forward(progress):
+            if generation != self._load_generation:
+                preload['cancel_event'].set()
+                return
+            if cancel_event is not None and cancel_event.is_set():
+                preload['cancel_event'].set()
+            
+            if progress.get('cancelled'):
+                self.reset()
+            else:
+                self._adopt_state(engine)
+            
+            if progress_callback:
+                progress_callback(progress)
+        
+        with preload['lock']:
+            self._adopt_state(engine)
+            if engine.loading:
+                preload['listener'] = forward
+        
+        if wait:
+            message = engine.load_progress.get('message', message)
+            if progress_callback:
+                progress_callback(dict(engine.load_progress))
+        return True, f"{message} (preloaded)"
+    
+    def _adopt_state(self, engine: 'ExcelSearchEngine'):
+        """Point this engine at the data loaded by another engine"""
+        self.df = engine.df
+        self.original_df = engine.original_df
+        self.disk_backed = engine.disk_backed
+        self._lazy = engine._lazy
+        self.compaction = engine.compaction
+        self._source = engine._source
+        self.file_path = engine.file_path
+        self.load_time = engine.load_time
+        self.loading = engine.loading
+        self.load_progress = dict(engine.load_progress)
+        if self.df is not None:
+            self._update_file_info()
+    
+    @staticmethod
+    def _file_fingerprint(file_path: str) -> Optional[Tuple[str, int, int]]:
+        """Identify a file version by absolute path, size and modification time"""
+        try:
+            stat = os.stat(file_path)
+        except OSError:
+            return None
+        return os.path.abspath(file_path), stat.st_size, stat.st_mtime_ns
+    
+    def _make_progress(self, raw_progress: Optional[Dict[str, Any]], rows_loaded: int,
+                       start_time: float) -> Dict[str, Any]:
+        """Build a progress dictionary from raw reader progress"""
+        elapsed = time.time() - start_time
+        fraction = min(raw_progress['fraction'], 1.0) if raw_progress else 1.0
+        total_bytes = raw_progress['total_bytes'] if raw_progress else os.path.getsize(self.file_path)
+        
+        # Linear extrapolation from the fraction read so far
+        eta_seconds = elapsed * (1 - fraction) / fraction if fraction > 0 else None
+        
+        return {
+            'rows_loaded': rows_loaded,
+            'bytes_read': raw_progress['bytes_read'] if raw_progress else total_bytes,
+            'total_bytes': total_bytes,
+            'percent': fraction * 100,
+            'rows_per_second': rows_loaded / elapsed if elapsed > 0 else 0,
+            'elapsed': elapsed,
+            'eta_seconds': eta_seconds,
+            'done': False
+        }
+    
+    def _iter_chunks(self, file_path: str, chunk_rows: int = 50000,
+                     first_chunk_rows: Optional[int] = None,
+                     columns: Optional[List[str]] = None,
+                     text: bool = False
+                     ) -> Iterator[Tuple[pd.DataFrame, Dict[str, Any]]]:
+        """
+        Read a supported file in row chunks
+        
+        Args:
+            file_path: Path to Excel, CSV, Parquet, Feather or Arrow file
+            chunk_rows: Number of rows per chunk
+            first_chunk_rows: Size of the first chunk, defaults to chunk_rows
+            columns: Columns to read, from _file_columns() (default: all)
+            text: Keep CSV cells as the text in the file instead of inferring
+                types per chunk, so every chunk reads a column the same way
+            
+        Yields:
+            Tuple of (chunk_dataframe, progress) where progress holds
+            bytes_read, total_bytes, rows_parsed and the completed fraction
+        """
+        total_bytes = os.path.getsize(file_path)
+        lower_path = file_path.lower()
+        rows_parsed = 0
+        size = first_chunk_rows or chunk_rows
+        # Projected columns by position, since header names may repeat
+        usecols = None
+        if columns is not None:
+            usecols = [i for i, col in enumerate(self._file_columns(file_path)) if col in columns]
+        
+        if lower_path.endswith('.csv'):
+            encoding = self._detect_csv_encoding(file_path)
+            if encoding is None:
+                raise ValueError("Could not read CSV file with any supported encoding")
+            
+            # The encoding is guessed from the start of the file; if a later row
+            # doesn't decode, read again with the next encoding and skip the rows
+            # already yielded (an ASCII prefix decodes the same in all of them)
+            for encoding in CSV_ENCODINGS[CSV_ENCODINGS.index(encoding):]:
+                skip = rows_parsed
+                try:
+                    with open(file_path, 'rb') as handle:
+                        with pd.read_csv(handle, encoding=encoding, chunksize=chunk_rows, usecols=usecols,
+                                         dtype=str if text else None) as reader:
+                            while skip:
+                                skip -= len(reader.get_chunk(min(skip, chunk_rows)))
+                            while True:
+                                try:
+                                    chunk = reader.get_chunk(size)
+                                except StopIteration:
+                                    break
+                                size = chunk_rows
+                                rows_parsed += len(chunk)
+                                bytes_read = handle.tell()
+                                yield chunk, {
+                                    'bytes_read': bytes_read,
+                                    'total_bytes': total_bytes,
+                                    'rows_parsed': rows_parsed,
+                                    'fraction': bytes_read / total_bytes if total_bytes else 1.0
+                                }
+                    break
+                except UnicodeDecodeError:
+                    continue
+            else:
+                raise ValueError("Could not read CSV file with any supported encoding")
+        
+        elif lower_path.endswith('.xlsx'):
+            from openpyxl import load_workbook
+            
+            workbook = load_workbook(file_path, read_only=True, data_only=True)
+            try:
+                sheet = workbook.worksheets[0]
+                total_rows = max((sheet.max_row or 0) - 1, 0)
+                rows = sheet.iter_rows(values_only=True)
+                header = next(rows, None)
+                if header is None:
+                    return
+                names = self._header_names(header)
+                width = len(names)
+                if usecols is not None:
+                    names = [names[i] for i in usecols]
+                
+                def make_chunk(batch):
+                    fraction = rows_parsed / total_rows if total_rows else 0.0
+                    return pd.DataFrame.from_records(batch, columns=names), {
+                        'bytes_read': int(total_bytes * min(fraction, 1.0)),
+                        'total_bytes': total_bytes,
+                        'rows_parsed': rows_parsed,
+                        'fraction': fraction
+                    }
+                
+                batch = []
+                for row in rows:
+                    # pd.read_excel skips fully blank rows
+                    if all(value is None for value in row):
+                        continue
+                    row = tuple(row[:width]) + (None,) * (width - len(row))
+                    if usecols is not None:
+                        row = tuple(row[i] for i in usecols)
+                    batch.append(row)
+                    if len(batch) >= size:
+                        rows_parsed += len(batch)
+                        yield make_chunk(batch)
+                        batch = []
+                        size = chunk_rows
+                
+                if batch or rows_parsed == 0:
+                    rows_parsed += len(batch)
+                    yield make_chunk(batch)
+            finally:
+                workbook.close()
+        
+        elif lower_path.endswith(ARROW_EXTENSIONS):
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+            
+            names = self._file_columns(file_path)
+            if usecols is not None:
+                names = [names[i] for i in usecols]
+            if lower_path.endswith('.parquet'):
+                parquet = pq.ParquetFile(file_path)
+                total_rows = parquet.metadata.num_rows
+                batches = parquet.iter_batches(batch_size=chunk_rows, columns=names)
+            else:
+                reader = pa.ipc.open_file(pa.memory_map(file_path))
+                total_rows = sum(reader.get_batch(i).num_rows for i in range(reader.num_record_batches))
+                batches = (reader.get_batch(i).select(names) for i in range(reader.num_record_batches))
+            
+            for batch in batches:
+                # IPC files may hold the whole table in one batch
+                for offset in range(0, batch.num_rows, chunk_rows):
+                    piece = batch.slice(offset, chunk_rows)
+                    rows_parsed += piece.num_rows
+                    fraction = rows_parsed / total_rows if total_rows else 1.0
+                    yield piece.to_pandas(types_mapper=pd.ArrowDtype), {
+                        'bytes_read': int(total_bytes * fraction),
+                        'total_bytes': total_bytes,
+                        'rows_parsed': rows_parsed,
+                        'fraction': fraction
+                    }
+        
+        else:
+            # Legacy .xls has no streaming reader; parse once and slice
+            df = pd.read_excel(file_path, engine='xlrd')
+            if usecols is not None:
+                df = df.iloc[:, usecols]
+            for start in range(0, max(len(df), 1), size):
+                end = start + size
+                size = chunk_rows
+                yield df.iloc[start:end], {
+                    'bytes_read': int(total_bytes * min(end, len(df)) / max(len(df), 1)),
+                    'total_bytes': total_bytes,
+                    'rows_parsed': min(end, len(df)),
+                    'fraction': min(end, len(df)) / max(len(df), 1)
+                }
+    
+    def _file_columns(self, file_path: str) -> List[Any]:
+        """
+        Column names of a file in file order, named as the loaders name them
+        
+        Args:
+            file_path: Path to a supported file
+        
+        Returns:
+            List of column names
+        """
+        lower_path = file_path.lower()
+        if lower_path.endswith('.csv'):
+            encoding = self._detect_csv_encoding(file_path)
+            if encoding is None:
+                raise ValueError("Could not read CSV file with any supported encoding")
+            return list(pd.read_csv(file_path, encoding=encoding, nrows=0).columns)
+        
+        if lower_path.endswith('.xlsx'):
+            from openpyxl import load_workbook
+            
+            workbook = load_workbook(file_path, read_only=True, data_only=True)
+            try:
+                header = next(workbook.worksheets[0].iter_rows(max_row=1, values_only=True), None)
+            finally:
+                workbook.close()
+            return self._header_names(header or ())
+        
+        if lower_path.endswith('.xls'):
+            return list(pd.read_excel(file_path, engine='xlrd', nrows=0).columns)
+        
+        if lower_path.endswith(ARROW_EXTENSIONS):
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+            
+            if lower_path.endswith('.parquet'):
+                names = pq.read_schema(file_path).names
+            else:
+                names = pa.ipc.open_file(pa.memory_map(file_path)).schema.names
+            # Skip the index columns pandas stores alongside the data
+            return [name for name in names if not name.startswith('__index_level_')]
+        
+        raise ValueError(f"Unsupported file format: {os.path.splitext(file_path)[1]}")
+    
+    def _lazy_source(self, file_path: str, file_columns: List[str], loaded: List[str],
+                     rows: int) -> Dict[str, Any]:
+        """
+        Describe where the columns left out of a lazy load can be read from
+        
+        For CSV files the byte range of every row is recorded, so single rows
+        can be re-read without parsing the whole file again.
+        """
+        lazy = {
+            'file_path': file_path,
+            'fingerprint': self._file_fingerprint(file_path),
+            'file_columns': file_columns,
+            'columns': [col for col in file_columns if col not in loaded],
+            'rows': rows,
+            'row_ranges': None
+        }
+        if file_path.lower().endswith('.csv'):
+            lazy['encoding'] = self._detect_csv_encoding(file_path)
+            lazy['row_ranges'] = self._csv_row_ranges(file_path, rows)
+        return lazy
+    
+    @staticmethod
+    def _csv_row_ranges(file_path: str, rows: int,
+                        block_bytes: int = 64 * 1024 * 1024) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+        """
+        Byte range of the header and every data row of a CSV file
+        
+        Lines are found by scanning for newline bytes block by block. When lines
+        and rows don't line up (line breaks inside quoted values), None is
+        returned and rows are found by parsing instead.
+        
+        Returns:
+            Tuple of (line starts, line ends), header first, or None
+        """
+        size = os.path.getsize(file_path)
+        if size == 0:
+            return None
+        
+        with open(file_path, 'rb') as handle:
+            with mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                data = np.frombuffer(mapped, dtype=np.uint8)
+                try:
+                    ends = [np.flatnonzero(data[start:start + block_bytes] == 10) + (start + 1)
+                            for start in range(0, size, block_bytes)]
+                    ends = np.concatenate(ends).astype(np.int64)
+                    if len(ends) == 0 or ends[-1] != size:
+                        ends = np.append(ends, size)
+                    starts = np.concatenate(([0], ends[:-1]))
+                    
+                    # pandas skips blank lines
+                    lengths = ends - starts
+                    blank = (lengths <= 1) | ((lengths == 2) & (data[np.minimum(starts, size - 1)] == 13))
+                finally:
+                    del data
+        
+        starts, ends = starts[~blank], ends[~blank]
+        if len(starts) != rows + 1:
+            return None
+        return starts, ends
+    
+    @property
+    def lazy_columns(self) -> List[str]:
+        """Columns of the file that a lazy load has not read yet"""
+        lazy = self._lazy
+        return list(lazy['columns']) if lazy else []
+    
+    def fetch_rows(self, positions: np.ndarray, columns: Optional[List[str]] = None) -> pd.DataFrame:
+        """
+        Full rows by position, reading columns a lazy load left in the file
+        
+        Only the requested rows of the unloaded columns are read: CSV rows by
+        their recorded byte ranges, Arrow formats by taking rows from the
+        mapped table, Excel rows by streaming the sheet.
+        
+        Args:
+            positions: Row positions
+            columns: Columns to return (default: all columns of the file)
+        
+        Returns:
+            DataFrame with columns in file order, indexed like the loaded data
+        """
+        df = self.df
+        lazy = self._lazy
+        if lazy is None:
+            return df.iloc[positions] if columns is None else df.iloc[positions][columns]
+        
+        if columns is None:
+            columns = lazy['file_columns']
+        loaded = df.iloc[positions][[col for col in columns if col in df.columns]]
+        missing = [col for col in lazy['columns'] if col in columns]
+        if not missing:
+            return loaded[columns]
+        
+        if self._file_fingerprint(lazy['file_path']) != lazy['fingerprint']:
+            raise ValueError("File changed since it was loaded; reload it to see all columns")
+        
+        positions = np.asarray(positions, dtype=np.int64)
+        fetched = self._read_rows(lazy, positions, missing)
+        fetched.index = loaded.index
+        return pd.concat([loaded, fetched], axis=1)[columns]
+    
+    def complete_rows(self, results: pd.DataFrame) -> pd.DataFrame:
+        """
+        Search results with the columns a lazy load left in the file
+        
+        Only these rows are read, so pass the rows being shown rather than a
+        whole result set.
+        
+        Args:
+            results: Rows of the loaded data, e.g. the head of search() results
+        
+        Returns:
+            The rows with all columns of the file (unchanged if nothing is lazy)
+        """
+        if self._lazy is None or results.empty:
+            return results
+        return self.fetch_rows(self.df.index.get_indexer(results.index))
+    
+    def _read_rows(self, lazy: Dict[str, Any], positions: np.ndarray,
+                   columns: List[str]) -> pd.DataFrame:
+        """Read the given rows of unloaded columns from the source file"""
+        file_path = lazy['file_path']
+        lower_path = file_path.lower()
+        usecols = [i for i, col in enumerate(lazy['file_columns']) if col in columns]
+        
+        if lazy['row_ranges'] is not None:
+            starts, ends = lazy['row_ranges']
+            with open(file_path, 'rb') as handle:
+                with mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                    lines = [mapped[starts[0]:ends[0]]]
+                    lines.extend(mapped[starts[i]:ends[i]] for i in positions + 1)
+            # The last line of a file may lack its line break
+            lines = [line if line.endswith(b'\n') else line + b'\n' for line in lines]
+            rows = pd.read_csv(io.BytesIO(b''.join(lines)), encoding=lazy['encoding'], usecols=usecols)
+            rows.columns = columns
+            return rows
+        
+        if lower_path.endswith(ARROW_EXTENSIONS):
+            import pyarrow as pa
+            import pyarrow.feather as feather
+            import pyarrow.parquet as pq
+            
+            source = pa.memory_map(file_path)
+            reader = pq.read_table if lower_path.endswith('.parquet') else feather.read_table
+            table = reader(source, columns=columns).take(pa.array(positions))
+            return table.to_pandas(types_mapper=pd.ArrowDtype)
+        
+        # Excel, or CSV with line breaks inside values: stream the file, keeping wanted rows
+        order = np.argsort(positions, kind='stable')
+        wanted = positions[order]
+        pieces = []
+        row_start = 0
+        chunks = self._iter_chunks(file_path, columns=columns)
+        try:
+            for chunk, _ in chunks:
+                row_end = row_start + len(chunk)
+                first, last = np.searchsorted(wanted, [row_start, row_end])
+                if last > first:
+                    pieces.append(chunk.iloc[wanted[first:last] - row_start])
+                row_start = row_end
+                if last == len(wanted):
+                    break
+        finally:
+            chunks.close()
+        
+        rows = pd.concat(pieces, ignore_index=True) if pieces else pd.DataFrame(columns=columns)
+        # Back to the caller's order
+        return rows.iloc[np.argsort(order, kind='stable')].reset_index(drop=True)
+    
+    def load_columns(self, columns: List[str]) -> Tuple[bool, str]:
+        """
+        Read columns a lazy load left in the file into the loaded data
+        
+        Args:
+            columns: Columns to load
+        
+        Returns:
+            Tuple of (success, message)
+        """
+        with self._lazy_lock:
+            return self._load_lazy_columns(columns)
+    
+    def _load_lazy_columns(self, columns: List[str]) -> Tuple[bool, str]:
+        """load_columns() body, run under the lazy-load lock"""
+        lazy = self._lazy
+        missing = [col for col in (lazy['columns'] if lazy else []) if col in columns]
+        if not missing:
+            return True, "Columns already loaded"
+        
+        try:
+            start_time = time.time()
+            if self._file_fingerprint(lazy['file_path']) != lazy['fingerprint']:
+                return False, "File changed since it was loaded; reload it to search other columns"
+            
+            if lazy['file_path'].lower().endswith(ARROW_EXTENSIONS):
+                added, _ = self._read_arrow_file(lazy['file_path'], missing)
+            else:
+                added = self._read_chunked(lazy['file_path'], start_time, None, None, missing)
+            if len(added) != len(self.df):
+                return False, f"Row count changed while loading columns: {missing}"
+            
+            added.index = self.df.index
+            if self.compaction is not None:
+                added, report = compact_dataframe(added)
+                self._merge_compaction(report)
+            loaded = [col for col in lazy['file_columns'] if col in self.df.columns or col in missing]
+            self.df = pd.concat([self.df, added], axis=1)[loaded]
+            if self.original_df is not None:
+                self.original_df = self.df.copy()
+            remaining = [col for col in lazy['columns'] if col not in missing]
+            self._lazy = dict(lazy, columns=remaining) if remaining else None
+            self._update_file_info()
+            self.memory_budget.enforce()
+            return True, f"Loaded {len(missing)} columns in {time.time() - start_time:.2f} seconds"
+        except Exception as e:
+            return False, f"Error loading columns: {str(e)}"
+    
+    @staticmethod
+    def _read_arrow_file(file_path: str,
+                         columns: Optional[List[str]] = None) -> Tuple[pd.DataFrame, bool]:
+        """
+        Open a Parquet, Feather or Arrow IPC file memory-mapped
+        
+        Uncompressed Feather/Arrow columns wrap the mapped file without a copy,
+        so opening is near-instant and the operating system reads pages in
+        only when a column is touched, e.g. by the first search over it.
+        Compressed files and Parquet are decoded, but only for the projected
+        columns.
+        
+        Args:
+            file_path: Path to a .parquet, .feather or .arrow file
+            columns: Columns to read (default: all)
+        
+        Returns:
+            Tuple of (DataFrame with Arrow-backed columns, whether the data is
+            still memory-mapped rather than copied into RAM)
+        """
+        try:
+            import pyarrow as pa
+            import pyarrow.feather as feather
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise ImportError(f"Reading {os.path.splitext(file_path)[1]} files requires pyarrow "
+                              f"(pip install pyarrow)")
+        
+        source = pa.memory_map(file_path)
+        if file_path.lower().endswith('.parquet'):
+            table = pq.read_table(source, columns=columns)
+        else:
+            table = feather.read_table(source, columns=columns)
+        # ArrowDtype columns keep Arrow's buffers as they are instead of converting
+        df = table.to_pandas(types_mapper=pd.ArrowDtype)
+        
+        # The data is still mapped when every buffer points into the file's mapping
+        source.seek(0)
+        region = source.read_buffer()
+        mapped = all(region.address <= buffer.address < region.address + region.size
+                     for column in table.columns for chunk in column.chunks
+                     for buffer in chunk.buffers() if buffer is not None and buffer.size)
+        return df, mapped
+    
+    @staticmethod
+    def _detect_csv_encoding(file_path: str, sample_bytes: int = 1024 * 1024) -> Optional[str]:
+        """Return the first supported encoding that decodes the start of a CSV file"""
+        with open(file_path, 'rb') as handle:
+            sample = handle.read(sample_bytes)
+        
+        # Drop a multi-byte character that may be cut off at the end of the sample
+        if len(sample) == sample_bytes:
+            sample = sample[:-4]
+        
+        for encoding in CSV_ENCODINGS:
+            try:
+                sample.decode(encoding)
+                return encoding
+            except UnicodeDecodeError:
+                continue
+        return None
+    
+    @staticmethod
+    def _header_names(header: Tuple[Any, ...]) -> List[Any]:
+        """
+        Label header cells exactly as pd.read_excel does
+        
+        Cells keep their values (the year 2020 stays a number), blank cells
+        become "Unnamed: n" and repeated labels get pandas' ".1" suffixes.
+        """
+        from pandas.io.parsers import TextParser
+        
+        if not header:
+            return []
+        # pandas' openpyxl reader turns blank cells into '' and whole floats into ints
+        cells = ['' if value is None else
+                 int(value) if isinstance(value, float) and value.is_integer() else value
+                 for value in header]
+        return list(TextParser([cells], header=0).read().columns)
+    
     def search(self, 
                search_term: str,
                search_columns: List[str],
                case_sensitive: bool = False,
                exact_match: bool = False,
                use_regex: bool = False,
-               max_results: Optional[int] = None) -> Tuple[pd.DataFrame, Dict[str, Any]]:
+               max_results: Optional[int] = None,
+               explain: bool = False,
+               whole_word: bool = False) -> Tuple[pd.DataFrame, Dict[str, Any]]:
         """
         Perform search operation on loaded data
         
@@ -94,81 +1408,643 @@ class ExcelSearchEngine:
             exact_match: Whether to match exact strings only
             use_regex: Whether to treat search_term as regex
             max_results: Maximum number of results to return
+            explain: Add stats['explain'] describing how each column was searched
+            whole_word: Match whole words only ("john" finds "John Smith" but
+                not "Johnson"); a trailing * matches words starting with the
+                term ("smi*"). Answered from a word index built per column on
+                first use. Ignored with exact_match or use_regex
             
         Returns:
-            Tuple of (results_dataframe, search_stats)
+            Tuple of (results_dataframe, search_stats); stats include 'phases'
+            (seconds per search phase) and 'column_times' (seconds per column).
+            After a lazy load the results hold the loaded columns only; pass
+            the rows shown to complete_rows() for the others
         """
-        if self.df is None:
-            return pd.DataFrame(), {'error': 'No data loaded'}
+        error = self._load_search_columns(search_columns)
+        if error:
+            return pd.DataFrame(), {'error': error}
         
+        # Take one reference so a background load swapping self.df can't split a search
+        df = self.df
         start_time = time.time()
+        positions, stats = self.search_positions(search_term, search_columns, case_sensitive,
+                                                 exact_match, use_regex, df=df, explain=explain,
+                                                 whole_word=whole_word)
+        if positions is None:
+            return pd.DataFrame(), stats
+        
+        try:
+            # Apply filter, materializing only the rows that are returned
+            phase_start = time.perf_counter()
+            if max_results:
+                positions = positions[:max_results]
+            results = df.iloc[positions]
+            stats['phases']['materialize'] = time.perf_counter() - phase_start
+        except Exception as e:
+            return pd.DataFrame(), {'error': f'Search failed: {str(e)}'}
+        
+        stats['search_time'] = time.time() - start_time
+        stats['returned_results'] = len(results)
+        self._record('search', stats['search_time'], query=search_term, columns=search_columns,
+                     case_sensitive=case_sensitive, exact_match=exact_match, use_regex=use_regex,
+                     whole_word=whole_word, rows_scanned=stats['rows_scanned'],
+                     total_results=stats['total_results'])
+        return results, stats
+    
+    def search_positions(self,
+                         search_term: str,
+                         search_columns: List[str],
+                         case_sensitive: bool = False,
+                         exact_match: bool = False,
+                         use_regex: bool = False,
+                         df: Optional[pd.DataFrame] = None,
+                         explain: bool = False,
+                         whole_word: bool = False) -> Tuple[Optional[np.ndarray], Dict[str, Any]]:
+        """
+        Find matching row positions without building a results DataFrame
+        
+        Takes the same options as search(). Useful when the matches are only
+        counted, paged or exported with export_rows().
+        
+        Returns:
+            Tuple of (ascending row positions or None on error, search_stats)
+        """
+        if df is None:
+            error = self._load_search_columns(search_columns)
+            if error:
+                return None, {'error': error}
+            df = self.df
+        if df is None:
+            return None, {'error': 'No data loaded'}
+        
+        start_time = time.time()
+        phases = dict.fromkeys(SEARCH_PHASES, 0.0)
         
         try:
             # Validate search columns
-            invalid_columns = [col for col in search_columns if col not in self.df.columns]
+            phase_start = time.perf_counter()
+            invalid_columns = [col for col in search_columns if col not in df.columns]
+            phases['validate'] = time.perf_counter() - phase_start
             if invalid_columns:
-                return pd.DataFrame(), {'error': f'Invalid columns: {invalid_columns}'}
+                return None, {'error': f'Invalid columns: {invalid_columns}'}
             
             if not search_term.strip():
-                return self.df.copy(), {'search_time': 0, 'total_results': len(self.df)}
+                # A blank term matches every row
+                stats = {'search_time': 0, 'total_results': len(df), 'rows_scanned': 0, 'phases': phases,
+                         'column_times': {}}
+                if explain:
+                    stats['explain'] = {'result_cache': 'none', 'columns': []}
+                return np.arange(len(df)), self._label_partial(stats, df)
             
-            # Prepare search term
-            processed_term = search_term if case_sensitive else search_term.lower()
+            cache = self._get_cache(df)
             
-            # Create boolean mask for filtering
-            mask = pd.Series([False] * len(self.df))
+            # Repeated queries are answered from the result cache
+            phase_start = time.perf_counter()
+            whole_word = whole_word and not exact_match and not use_regex
+            cache_key = (search_term, tuple(search_columns), case_sensitive, exact_match, use_regex, whole_word)
+            with self._cache_lock:
+                positions = cache['results'].get(cache_key)
+                if positions is not None:
+                    cache['results'].move_to_end(cache_key)
+                    self._touch(cache, 'results', cache_key)
+            self._last_used = next_tick()
+            phases['result_cache'] = time.perf_counter() - phase_start
             
-            # Search in each specified column
-            for column in search_columns:
-                if column not in self.df.columns:
-                    continue
+            column_times = {}
+            column_plans = []
+            rows_scanned = 0
+            if positions is None:
+                # Prepare search term
+                processed_term = search_term if case_sensitive else search_term.lower()
                 
-                # Convert column to string and handle NaN values
-                col_data = self.df[column].astype(str).fillna("")
-                
-                if not case_sensitive:
-                    col_data = col_data.str.lower()
+                # Create boolean mask for filtering
+                mask = np.zeros(len(df), dtype=bool)
                 
-                # Apply search logic
-                if use_regex:
+                # Search in each specified column
+                for column in search_columns:
+                    trace = {'column': column}
+                    column_start = time.perf_counter()
                     try:
-                        col_mask = col_data.str.contains(processed_term, regex=True, na=False)
+                        if whole_word:
+                            self._token_index(df, cache, column, case_sensitive, trace)
+                        col_mask = self._column_mask(df, cache, column, processed_term, case_sensitive,
+                                                     exact_match, use_regex, whole_word, trace)
                     except re.error as e:
-                        return pd.DataFrame(), {'error': f'Invalid regex pattern: {e}'}
-                elif exact_match:
-                    col_mask = col_data == processed_term
-                else:
-                    # Partial match (default)
-                    col_mask = col_data.str.contains(processed_term, regex=False, na=False)
+                        return None, {'error': f'Invalid regex pattern: {e}'}
+                    
+                    # Combine with existing mask using OR logic
+                    phase_start = time.perf_counter()
+                    mask |= col_mask
+                    phases['combine'] += time.perf_counter() - phase_start
+                    
+                    column_times[column] = time.perf_counter() - column_start
+                    if trace['strategy'] not in ('value_index', 'token_index'):
+                        rows_scanned += len(df)
+                    for phase in ('string_conversion', 'lowercase', 'match'):
+                        phases[phase] += trace.get(phase, 0.0)
+                    if explain:
+                        trace['matches'] = int(np.count_nonzero(col_mask))
+                        trace['time'] = column_times[column]
+                        column_plans.append(trace)
                 
-                # Combine with existing mask using OR logic
-                mask = mask | col_mask
-            
-            # Apply filter
-            results = self.df[mask].copy()
-            
-            # Limit results if specified
-            if max_results and len(results) > max_results:
-                results = results.head(max_results)
-            
-            search_time = time.time() - start_time
+                phase_start = time.perf_counter()
+                positions = np.flatnonzero(mask)
+                phases['combine'] += time.perf_counter() - phase_start
+                with self._cache_lock:
+                    cache['results'][cache_key] = positions
+                    self._track(cache, 'results', cache_key, positions.nbytes)
+                    while len(cache['results']) > self.result_cache_size:
+                        evicted_key, _ = cache['results'].popitem(last=False)
+                        cache['usage'].pop(('results', evicted_key), None)
+                self.memory_budget.enforce()
+                result_cache = 'miss'
+            else:
+                result_cache = 'hit'
             
             # Prepare search statistics
             stats = {
-                'search_time': search_time,
-                'total_results': len(self.df[mask]),
-                'returned_results': len(results),
+                'search_time': time.time() - start_time,
+                'total_results': len(positions),
                 'search_term': search_term,
                 'search_columns': search_columns,
                 'case_sensitive': case_sensitive,
                 'exact_match': exact_match,
-                'use_regex': use_regex
+                'use_regex': use_regex,
+                'whole_word': whole_word,
+                'rows_scanned': rows_scanned,
+                'phases': phases,
+                'column_times': column_times
             }
+            if explain:
+                stats['explain'] = {'result_cache': result_cache, 'columns': column_plans}
+            
+            return positions, self._label_partial(stats, df)
             
-            return results, stats
+        except Exception as e:
+            return None, {'error': f'Search failed: {str(e)}'}
+    
+    def search_file(self,
+                    file_path: str,
+                    search_term: str,
+                    search_columns: Optional[List[str]] = None,
+                    case_sensitive: bool = False,
+                    exact_match: bool = False,
+                    use_regex: bool = False,
+                    output_path: Optional[str] = None,
+                    max_results: Optional[int] = None,
+                    chunk_rows: int = OUT_OF_CORE_CHUNK_ROWS,
+                    progress_callback: Optional[Callable[[Dict[str, Any]], None]] = None,
+                    cancel_event: Optional[threading.Event] = None,
+                    whole_word: bool = False) -> Tuple[pd.DataFrame, Dict[str, Any]]:
+        """
+        Search a file chunk by chunk without loading it (out-of-core mode)
+        
+        For files larger than memory: only one chunk of rows is held at a time
+        and each chunk is matched like search() matches loaded data. CSV cells
+        are matched as the text in the file, since column types can't be
+        inferred from the whole file before reading it. The loaded data, if
+        any, is left untouched.
+        
+        With output_path every match is written there as it is found (any
+        export format), so memory stays bounded whatever the number of
+        matches; the returned DataFrame then holds only the first max_results
+        matches (none when max_results is not given). Without output_path the
+        matches are returned, up to max_results.
+        
+        Args:
+            file_path: Path to Excel, CSV, Parquet, Feather or Arrow file
+            search_term: Text to search for
+            search_columns: List of column names to search in (default: the
+                first two columns)
+            case_sensitive: Whether search should be case sensitive
+            exact_match: Whether to match exact strings only
+            use_regex: Whether to treat search_term as regex
+            output_path: File receiving every match
+            max_results: Maximum number of matches to return
+            chunk_rows: Rows read per chunk
+            progress_callback: Called after every chunk with a progress
+                dictionary (bytes_read, total_bytes, rows_scanned, matches, ...)
+            cancel_event: Search stops as soon as this event is set
+            whole_word: Match whole words only, as in search(); chunks are
+                scanned since no word index outlives its chunk
             
+        Returns:
+            Tuple of (results_dataframe indexed by row position in the file,
+            search_stats); stats include bytes_read, mb_per_second and
+            rows_per_second
+        """
+        if not os.path.exists(file_path):
+            return pd.DataFrame(), {'error': f"File not found: {os.path.basename(file_path)}"}
+        
+        start_time = time.time()
+        try:
+            file_columns = self._file_columns(file_path)
+        except Exception as e:
+            return pd.DataFrame(), {'error': f"Error reading file: {str(e)}"}
+        
+        search_columns = search_columns or file_columns[:LAZY_DEFAULT_COLUMNS]
+        invalid_columns = [col for col in search_columns if col not in file_columns]
+        if invalid_columns:
+            return pd.DataFrame(), {'error': f'Invalid columns: {invalid_columns}'}
+        
+        processed_term = search_term if case_sensitive else search_term.lower()
+        whole_word = whole_word and not exact_match and not use_regex
+        if use_regex:
+            try:
+                re.compile(processed_term)
+            except re.error as e:
+                return pd.DataFrame(), {'error': f'Invalid regex pattern: {e}'}
+        
+        kept: List[pd.DataFrame] = []
+        keep_limit = max_results if max_results is not None or output_path is None else 0
+        counters = {'rows_scanned': 0, 'total_results': 0, 'kept': 0, 'bytes_read': 0, 'chunks': 0}
+        
+        def matches():
+            reader = self._iter_chunks(file_path, chunk_rows, text=True)
+            try:
+                for chunk, raw_progress in reader:
+                    if cancel_event is not None and cancel_event.is_set():
+                        raise ExportCancelled()
+                    
+                    if search_term.strip():
+                        # A fresh cache per chunk: nothing outlives the chunk it was built from
+                        cache = {'normalized': {}, 'indexes': {}, 'tokens': {}, 'results': OrderedDict(),
+                                 'usage': {}}
+                        mask = np.zeros(len(chunk), dtype=bool)
+                        for column in search_columns:
+                            mask |= self._column_mask(chunk, cache, column, processed_term, case_sensitive,
+                                                      exact_match, use_regex, whole_word)
+                        positions = np.flatnonzero(mask)
+                    else:
+                        positions = np.arange(len(chunk))
+                    
+                    found = chunk.iloc[positions]
+                    found.index = positions + counters['rows_scanned']
+                    counters['rows_scanned'] += len(chunk)
+                    counters['total_results'] += len(found)
+                    counters['bytes_read'] = raw_progress['bytes_read']
+                    counters['chunks'] += 1
+                    
+                    if keep_limit is None or counters['kept'] < keep_limit:
+                        piece = found if keep_limit is None else found.iloc[:keep_limit - counters['kept']]
+                        if len(piece):
+                            kept.append(piece)
+                            counters['kept'] += len(piece)
+                    
+                    if progress_callback:
+                        elapsed = time.time() - start_time
+                        progress_callback({
+                            'bytes_read': raw_progress['bytes_read'],
+                            'total_bytes': raw_progress['total_bytes'],
+                            'rows_scanned': counters['rows_scanned'],
+                            'matches': counters['total_results'],
+                            'percent': raw_progress['fraction'] * 100,
+                            'mb_per_second': raw_progress['bytes_read'] / (1024 * 1024) / elapsed if elapsed else 0.0
+                        })
+                    yield found
+            finally:
+                reader.close()
+        
+        try:
+            if output_path:
+                success, message = write_chunks(output_path, [str(col) for col in file_columns], matches())
+                if not success:
+                    cancelled = cancel_event is not None and cancel_event.is_set()
+                    return pd.DataFrame(), {'error': 'Search cancelled' if cancelled else message}
+            else:
+                for _ in matches():
+                    pass
+        except ExportCancelled:
+            return pd.DataFrame(), {'error': 'Search cancelled'}
         except Exception as e:
             return pd.DataFrame(), {'error': f'Search failed: {str(e)}'}
+        
+        results = pd.concat(kept) if kept else pd.DataFrame(columns=file_columns)
+        search_time = time.time() - start_time
+        stats = {
+            'search_time': search_time,
+            'total_results': counters['total_results'],
+            'returned_results': len(results),
+            'search_term': search_term,
+            'search_columns': search_columns,
+            'case_sensitive': case_sensitive,
+            'exact_match': exact_match,
+            'use_regex': use_regex,
+            'whole_word': whole_word,
+            'rows_scanned': counters['rows_scanned'],
+            'chunks': counters['chunks'],
+            'bytes_read': counters['bytes_read'],
+            'mb_per_second': counters['bytes_read'] / (1024 * 1024) / search_time if search_time else 0.0,
+            'rows_per_second': counters['rows_scanned'] / search_time if search_time else 0.0,
+            'output_path': output_path,
+            'out_of_core': True
+        }
+        self._record('search', search_time, query=search_term, columns=search_columns,
+                     case_sensitive=case_sensitive, exact_match=exact_match, use_regex=use_regex,
+                     whole_word=whole_word, rows_scanned=counters['rows_scanned'],
+                     total_results=counters['total_results'], file=file_path, out_of_core=True)
+        return results, stats
+    
+    def _load_search_columns(self, search_columns: List[str]) -> Optional[str]:
+        """Load searched columns that a lazy load left in the file; returns an error message"""
+        if self._lazy is None or not any(col in self._lazy['columns'] for col in search_columns):
+            return None
+        success, message = self.load_columns(search_columns)
+        return None if success else message
+    
+    def _column_mask(self, df: pd.DataFrame, cache: Dict[str, Any], column: str,
+                     processed_term: str, case_sensitive: bool, exact_match: bool,
+                     use_regex: bool, whole_word: bool = False,
+                     trace: Optional[Dict[str, Any]] = None) -> np.ndarray:
+        """
+        Boolean match mask for one column
+        
+        When trace is given it receives the strategy used and the seconds
+        spent per phase (string_conversion, lowercase, match).
+        """
+        if trace is None:
+            trace = {}
+        
+        if whole_word:
+            return self._word_mask(df, cache, column, processed_term, case_sensitive, trace)
+        
+        index = cache['indexes'].get((column, case_sensitive))
+        if exact_match and not use_regex and index is not None:
+            self._touch(cache, 'indexes', (column, case_sensitive))
+            match_start = time.perf_counter()
+            col_mask = np.zeros(len(df), dtype=bool)
+            col_mask[index.lookup(processed_term)] = True
+            trace.update(strategy='value_index', index=index.describe(),
+                         match=time.perf_counter() - match_start)
+            return col_mask
+        
+        col_data = self._normalized_column(df, cache, column, case_sensitive, trace)
+        
+        # Apply search logic
+        match_start = time.perf_counter()
+        if use_regex:
+            trace['strategy'] = 'regex_scan'
+            col_mask = col_data.str.contains(processed_term, regex=True, na=False)
+        elif exact_match:
+            trace['strategy'] = 'equality_scan'
+            col_mask = col_data == processed_term
+        else:
+            # Partial match (default)
+            trace['strategy'] = 'substring_scan'
+            col_mask = col_data.str.contains(processed_term, regex=False, na=False)
+        
+        col_mask = col_mask.to_numpy(dtype=bool)
+        trace['match'] = time.perf_counter() - match_start
+        return col_mask
+    
+    def _word_mask(self, df: pd.DataFrame, cache: Dict[str, Any], column: str,
+                   processed_term: str, case_sensitive: bool, trace: Dict[str, Any]) -> np.ndarray:
+        """Boolean whole-word match mask for one column, from its word index when there is one"""
+        term, words, prefix, pattern = parse_word_term(processed_term)
+        key = (column, case_sensitive)
+        index = cache['tokens'].get(key)
+        if index is None or not words:
+            col_data = self._normalized_column(df, cache, column, case_sensitive, trace)
+            match_start = time.perf_counter()
+            trace['strategy'] = 'word_scan'
+            col_mask = col_data.str.contains(pattern, regex=True, na=False).to_numpy(dtype=bool)
+            trace['match'] = time.perf_counter() - match_start
+            return col_mask
+        
+        self._touch(cache, 'tokens', key)
+        match_start = time.perf_counter()
+        rows = index.candidates(words, prefix)
+        if len(rows) and not (len(words) == 1 and words[0] == term):
+            # Phrases and terms with punctuation: check the cells holding all the words
+            col_data = cache['normalized'].get(key)
+            if col_data is not None:
+                values = col_data.iloc[rows]
+            else:
+                values = df[column].iloc[rows].astype(str).fillna("")
+                if not case_sensitive:
+                    values = values.str.lower()
+            rows = rows[values.str.contains(pattern, regex=True, na=False).to_numpy(dtype=bool)]
+        col_mask = np.zeros(len(df), dtype=bool)
+        col_mask[rows] = True
+        trace.update(strategy='token_index', index=index.describe(),
+                     match=time.perf_counter() - match_start)
+        return col_mask
+    
+    def _token_index(self, df: pd.DataFrame, cache: Dict[str, Any], column: str,
+                     case_sensitive: bool, trace: Optional[Dict[str, Any]] = None) -> TokenIndex:
+        """Word index of a column, built from its normalized values on first use"""
+        key = (column, case_sensitive)
+        index = cache['tokens'].get(key)
+        if index is None:
+            values = self._normalized_column(df, cache, column, case_sensitive, trace)
+            build_start = time.perf_counter()
+            index = TokenIndex.build(values)
+            with self._cache_lock:
+                cache['tokens'][key] = index
+                self._track(cache, 'tokens', key, index.nbytes)
+            if trace is not None:
+                trace['index_build'] = time.perf_counter() - build_start
+            self.memory_budget.enforce()
+        return index
+    
+    def _normalized_column(self, df: pd.DataFrame, cache: Dict[str, Any], column: str,
+                           case_sensitive: bool, trace: Optional[Dict[str, Any]] = None) -> pd.Series:
+        """String form of a column as compared by search, cached per case mode"""
+        key = (column, case_sensitive)
+        col_data = cache['normalized'].get(key)
+        if trace is not None:
+            trace['normalized_cache'] = 'hit' if col_data is not None else 'built'
+        if col_data is not None:
+            self._touch(cache, 'normalized', key)
+        else:
+            # Convert column to string and handle NaN values
+            phase_start = time.perf_counter()
+            col_data = df[column].astype(str).fillna("")
+            conversion_end = time.perf_counter()
+            if not case_sensitive:
+                col_data = col_data.str.lower()
+            if trace is not None:
+                trace['string_conversion'] = conversion_end - phase_start
+                trace['lowercase'] = time.perf_counter() - conversion_end
+            with self._cache_lock:
+                cache['normalized'][key] = col_data
+                self._track(cache, 'normalized', key, series_bytes(col_data))
+            self.memory_budget.enforce()
+        return col_data
+    
+    def _get_cache(self, df: pd.DataFrame) -> Dict[str, Any]:
+        """
+        Caches derived from one loaded DataFrame
+        
+        Normalized columns, indexes and cached results are bound to the frame
+        they were built from, so replacing self.df starts a fresh cache while
+        searches still running on the old frame keep using the old one.
+        """
+        with self._cache_lock:
+            cache = self._cache
+            if cache is None or cache['df'] is not df:
+                cache = {
+                    'df': df,
+                    'normalized': {},
+                    'indexes': {},
+                    'tokens': {},
+                    'results': OrderedDict(),
+                    # (kind, key) -> [last use tick, bytes] for memory accounting
+                    'usage': {}
+                }
+                # A search still running on a replaced frame must not evict
+                # the caches already built for the current one
+                if df is self.df or self._cache is None:
+                    self._cache = cache
+            return cache
+    
+    def build_indexes(self, columns: Optional[List[str]] = None,
+                      case_modes: Tuple[bool, ...] = (False, True),
+                      tokens: bool = False) -> Dict[str, Any]:
+        """
+        Build exact-match indexes so repeated exact searches skip column scans
+        
+        Args:
+            columns: Columns to index (default: all columns)
+            case_modes: Case sensitivity modes to index
+            tokens: Also build the word indexes whole-word searches use, which
+                are otherwise built on a column's first whole-word search
+            
+        Returns:
+            Dictionary with the number of indexes built and the build time
+        """
+        df = self.df
+        if df is None:
+            return {'error': 'No data loaded'}
+        
+        start_time = time.time()
+        cache = self._get_cache(df)
+        built = 0
+        for column in (columns if columns is not None else list(df.columns)):
+            for case_sensitive in case_modes:
+                if (column, case_sensitive) not in cache['indexes']:
+                    values = self._normalized_column(df, cache, column, case_sensitive)
+                    index = ValueIndex.build(values)
+                    with self._cache_lock:
+                        cache['indexes'][(column, case_sensitive)] = index
+                        self._track(cache, 'indexes', (column, case_sensitive), index.nbytes)
+                    self.memory_budget.enforce()
+                    built += 1
+                if tokens and (column, case_sensitive) not in cache['tokens']:
+                    self._token_index(df, cache, column, case_sensitive)
+                    built += 1
+        
+        return {'indexes_built': built, 'build_time': time.time() - start_time}
+    
+    def _index_fingerprint(self) -> Optional[Dict[str, int]]:
+        """Size and modification time of the file version the loaded data came from"""
+        if self._source is None or self._source['fingerprint'] is None:
+            return None
+        _, size, mtime_ns = self._source['fingerprint']
+        return {'size': size, 'mtime_ns': mtime_ns}
+    
+    def save_indexes(self, path: Optional[str] = None) -> Tuple[bool, str]:
+        """
+        Write the built indexes to a sidecar file next to the loaded file
+        
+        The file records the size and modification time of the data file, so
+        load_indexes() ignores it once the data file changes.
+        
+        Args:
+            path: Index file (default: the data file's path plus '.esidx')
+        
+        Returns:
+            Tuple of (success, message)
+        """
+        df = self.df
+        fingerprint = self._index_fingerprint()
+        if df is None or fingerprint is None:
+            return False, "Indexes can only be saved for data loaded with load_file"
+        
+        indexes = {}
+        with self._cache_lock:
+            cache = self._cache
+            if cache is not None and cache['df'] is df:
+                for kind, cache_kind in INDEX_CACHE_KINDS.items():
+                    for (column, case_sensitive), index in cache[cache_kind].items():
+                        indexes[(kind, column, case_sensitive)] = index
+        # Column names have to survive the JSON header
+        indexes = {(kind, column, case_sensitive): (index, str(df[column].dtype))
+                   for (kind, column, case_sensitive), index in indexes.items()
+                   if isinstance(column, (str, int)) and not isinstance(column, bool)}
+        if not indexes:
+            return False, "No indexes built"
+        
+        path = path or index_path(self.file_path)
+        try:
+            written = save_index_file(path, fingerprint, indexes)
+        except OSError as e:
+            return False, f"Could not save indexes: {e}"
+        return True, f"Saved {written} indexes to {os.path.basename(path)}"
+    
+    def load_indexes(self, path: Optional[str] = None) -> Tuple[bool, str]:
+        """
+        Map indexes saved by save_indexes() instead of building them
+        
+        Indexes are used only when the sidecar was written for the same
+        version of the data file and each column still has the same row count
+        and dtype. They stay memory-mapped, so loading takes milliseconds and
+        the operating system reads index pages as lookups need them.
+        
+        Args:
+            path: Index file (default: the data file's path plus '.esidx')
+        
+        Returns:
+            Tuple of (success, message)
+        """
+        df = self.df
+        fingerprint = self._index_fingerprint()
+        if df is None or fingerprint is None:
+            return False, "Indexes can only be loaded for data loaded with load_file"
+        
+        path = path or index_path(self.file_path)
+        start_time = time.time()
+        try:
+            saved = load_index_file(path, fingerprint)
+        except (ValueError, KeyError) as e:
+            return False, f"Could not read {os.path.basename(path)}: {e}"
+        if saved is None:
+            return False, f"No up-to-date indexes in {os.path.basename(path)}"
+        
+        cache = self._get_cache(df)
+        loaded = 0
+        for (kind, column, case_sensitive), (index, dtype) in saved.items():
+            cache_kind = INDEX_CACHE_KINDS[kind]
+            key = (column, case_sensitive)
+            if (key in cache[cache_kind] or column not in df.columns or index.rows != len(df)
+                    or str(df[column].dtype) != dtype):
+                continue
+            with self._cache_lock:
+                cache[cache_kind][key] = index
+                self._track(cache, cache_kind, key, index.nbytes)
+            loaded += 1
+        self.memory_budget.enforce()
+        return True, f"Loaded {loaded} indexes in {time.time() - start_time:.3f} seconds"
+    
+    @staticmethod
+    def _track(cache: Dict[str, Any], kind: str, key: Any, nbytes: int):
+        """Register a new cache entry for memory accounting (call under the cache lock)"""
+        cache['usage'][(kind, key)] = [next_tick(), nbytes]
+    
+    @staticmethod
+    def _touch(cache: Dict[str, Any], kind: str, key: Any):
+        """Mark a cache entry as just used, so LRU eviction keeps it longest"""
+        entry = cache['usage'].get((kind, key))
+        if entry is not None:
+            entry[0] = next_tick()
+    
+    def _label_partial(self, stats: Dict[str, Any], df: pd.DataFrame) -> Dict[str, Any]:
+        """Mark search stats as covering only the rows loaded so far"""
+        if self.loading:
+            stats['partial'] = True
+            stats['rows_searched'] = len(df)
+            stats['load_percent'] = self.load_progress.get('percent', 0)
+        return stats
     
     def get_column_info(self) -> List[Dict[str, Any]]:
         """
@@ -198,13 +2074,17 @@ class ExcelSearchEngine:
         
         return column_info
     
-    def export_results(self, results: pd.DataFrame, output_path: str) -> Tuple[bool, str]:
+    def export_results(self, results: pd.DataFrame, output_path: str,
+                       progress_callback: Optional[Callable[[Dict[str, Any]], None]] = None,
+                       cancel_event: Optional[threading.Event] = None) -> Tuple[bool, str]:
         """
         Export search results to file
         
         Args:
             results: DataFrame to export
             output_path: Path for output file
+            progress_callback: Called after each written chunk (see exporters.export_dataframe)
+            cancel_event: Export stops and the partial file is removed when set
             
         Returns:
             Tuple of (success, message)
@@ -213,28 +2093,342 @@ class ExcelSearchEngine:
             if results.empty:
                 return False, "No results to export"
             
-            file_ext = os.path.splitext(output_path)[1].lower()
+            if self._lazy is not None:
+                # Written by position so unloaded columns are read a chunk at a time
+                positions = self.df.index.get_indexer(results.index)
+                if (positions >= 0).all():
+                    return self.export_rows(positions, output_path, progress_callback=progress_callback,
+                                            cancel_event=cancel_event)
             
-            if file_ext == '.csv':
-                results.to_csv(output_path, index=False)
-            elif file_ext in ['.xlsx', '.xls']:
-                results.to_excel(output_path, index=False, engine='openpyxl')
-            else:
-                return False, f"Unsupported export format: {file_ext}"
+            start_time = time.time()
+            success, message = export_dataframe(results, output_path,
+                                                progress_callback=progress_callback,
+                                                cancel_event=cancel_event)
+            if success:
+                self._record('export', time.time() - start_time, rows=len(results))
+            return success, message
             
-            return True, f"Successfully exported {len(results)} rows to {output_path}"
+        except Exception as e:
+            return False, f"Export failed: {str(e)}"
+    
+    def export_rows(self, positions: np.ndarray, output_path: str,
+                    columns: Optional[List[str]] = None,
+                    progress_callback: Optional[Callable[[Dict[str, Any]], None]] = None,
+                    cancel_event: Optional[threading.Event] = None) -> Tuple[bool, str]:
+        """
+        Export rows of the loaded data by position, e.g. from search_positions()
+        
+        Rows are pulled from the loaded DataFrame a chunk at a time, so large
+        result sets are never copied into a results DataFrame first.
+        
+        Args:
+            positions: Row positions to export
+            output_path: Path for output file
+            columns: Columns to export (default: all columns)
+            progress_callback: Called after each written chunk
+            cancel_event: Export stops and the partial file is removed when set
             
+        Returns:
+            Tuple of (success, message)
+        """
+        df = self.df
+        if df is None:
+            return False, "No data loaded"
+        if len(positions) == 0:
+            return False, "No results to export"
+        
+        try:
+            start_time = time.time()
+            fetch = None
+            if self._lazy is not None:
+                # Columns not loaded yet are read a chunk of rows at a time
+                columns = columns or self._lazy['file_columns']
+                fetch = lambda chunk_positions: self.fetch_rows(chunk_positions, columns)
+            success, message = export_dataframe(df, output_path, positions=positions, columns=columns,
+                                                progress_callback=progress_callback,
+                                                cancel_event=cancel_event, fetch_rows=fetch)
+            if success:
+                self._record('export', time.time() - start_time, rows=len(positions))
+            return success, message
         except Exception as e:
             return False, f"Export failed: {str(e)}"
     
-    def get_file_info(self) -> Dict[str, Any]:
-        """Get information about the loaded file"""
-        return self.file_info.copy() if self.file_info else {}
+    def enable_instrumentation(self, slow_query_threshold: Optional[float] = 0.5,
+                               slow_query_log: Optional[str] = None) -> Instrumentation:
+        """
+        Start recording latency histograms and logging slow searches
+        
+        Args:
+            slow_query_threshold: Searches taking at least this many seconds are
+                written to the slow-query log (None keeps only histograms)
+            slow_query_log: Rotating log file for slow searches
+                (default: ~/.excelsearchpro/slow_queries.log)
+        
+        Returns:
+            The active Instrumentation
+        """
+        self.disable_instrumentation()
+        self.instrumentation = Instrumentation(slow_query_threshold, slow_query_log or DEFAULT_SLOW_QUERY_LOG)
+        return self.instrumentation
+    
+    def disable_instrumentation(self):
+        """Stop recording and close the slow-query log"""
+        if self.instrumentation is not None:
+            self.instrumentation.close()
+            self.instrumentation = None
+    
+    def get_instrumentation_stats(self) -> Dict[str, Any]:
+        """Latency percentiles and slow-query counts ({} when instrumentation is off)"""
+        return self.instrumentation.snapshot() if self.instrumentation is not None else {}
+    
+    def _record(self, operation: str, seconds: float, **details: Any):
+        """Pass a timing to the instrumentation layer when it is enabled"""
+        instrumentation = self.instrumentation
+        if instrumentation is not None:
+            instrumentation.record(operation, seconds, **details)
+    
+    def _update_file_info(self):
+        """Refresh file_info from the currently loaded DataFrame"""
+        rows, cols = self.df.shape
+        file_size = os.path.getsize(self.file_path) / (1024 * 1024)  # MB
+        column_names = self._lazy['file_columns'] if self._lazy else list(self.df.columns)
+        
+        self.file_info = {
+            'rows': rows,
+            'columns': len(column_names),
+            'file_size_mb': file_size,
+            'load_time': self.load_time,
+            'column_names': list(column_names),
+            'lazy_columns': self.lazy_columns,
+            'compaction': self.compaction,
+            'loading': self.loading
+        }
+    
+    def get_file_info(self, include_memory: bool = False) -> Dict[str, Any]:
+        """
+        Get information about the loaded file
+        
+        Args:
+            include_memory: Also measure current memory usage under 'memory' (see
+                get_memory_usage); this walks the data, so only ask when showing it
+        
+        Returns:
+            Copy of file_info (rows, columns, column_names, file_size_mb,
+            load_time, ...), plus 'memory' when requested
+        """
+        info = self.file_info.copy() if self.file_info else {}
+        if include_memory and info and self.df is not None:
+            info['memory'] = self.get_memory_usage()
+        return info
+    
+    def get_memory_usage(self) -> Dict[str, Any]:
+        """
+        Measure the memory held by the loaded data and everything built from it
+        
+        Returns:
+            Dictionary with data_bytes, original_bytes, normalized_bytes,
+            indexes_bytes, results_bytes and total_bytes (the part counted
+            against the memory budget), plus disk_backed and budget_bytes
+            (None when unlimited)
+        """
+        usage = {'data_bytes': frame_bytes(self.df), 'original_bytes': 0}
+        if self.original_df is not None and self.original_df is not self.df:
+            usage['original_bytes'] = frame_bytes(self.original_df)
+        for kind in CACHE_KINDS:
+            usage[f'{kind}_bytes'] = 0
+        
+        cache = self._cache
+        if cache is not None:
+            with self._cache_lock:
+                for (kind, _), (_, nbytes) in cache['usage'].items():
+                    usage[f'{kind}_bytes'] += nbytes
+        
+        # Disk-backed data lives in the page cache, not in this process's budget
+        resident_data = 0 if self.disk_backed else usage['data_bytes']
+        usage['total_bytes'] = resident_data + sum(
+            usage[f'{kind}_bytes'] for kind in ('original',) + CACHE_KINDS)
+        usage['disk_backed'] = self.disk_backed
+        usage['budget_bytes'] = self.memory_budget.limit_bytes
+        return usage
+    
+    def set_memory_budget(self, limit_mb: Optional[float]):
+        """
+        Change the memory budget this engine shares with the rest of the process
+        
+        Args:
+            limit_mb: Budget in MB (None means unlimited)
+        """
+        self.memory_budget.set_limit(limit_mb)
+        self.memory_budget.enforce()
+    
+    def compact(self) -> Dict[str, Any]:
+        """
+        Store the loaded data in the smallest dtypes that search the same
+        
+        Use this after a progressive load, or to compact a file loaded without
+        ``compact=True``. Caches built from the old dtypes are dropped.
+        
+        Returns:
+            Report with before_bytes, after_bytes and the converted columns
+        """
+        df = self.df
+        if df is None:
+            return {'error': 'No data loaded'}
+        if self.loading:
+            return {'error': 'File is still loading'}
+        if self.disk_backed:
+            return {'error': 'Disk-backed data is already stored compactly'}
+        
+        compacted, report = compact_dataframe(df)
+        if report['columns']:
+            self.df = compacted
+            if self.original_df is not None:
+                self.original_df = compacted.copy()
+            self._cache = None
+        if self.compaction is not None:
+            # Keep counting from the size before the first compaction
+            report = dict(report, columns={**self.compaction['columns'], **report['columns']},
+                          before_bytes=report['before_bytes'] + self.compaction['before_bytes']
+                          - self.compaction['after_bytes'])
+        self.compaction = report
+        if self.file_path:
+            self._update_file_info()
+        return report
+    
+    def _merge_compaction(self, report: Dict[str, Any]):
+        """Add a compaction report to the one kept for the loaded file"""
+        if self.compaction is None:
+            self.compaction = report
+            return
+        merged = dict(self.compaction, columns=dict(self.compaction['columns']))
+        merged['columns'].update(report['columns'])
+        merged['before_bytes'] += report['before_bytes']
+        merged['after_bytes'] += report['after_bytes']
+        self.compaction = merged
+    
+    def spill_to_disk(self) -> bool:
+        """
+        Switch to disk-backed mode: move the loaded data to a memory-mapped Arrow file
+        
+        The data stays searchable, but its pages belong to the operating
+        system's file cache and are dropped under memory pressure instead of
+        counting against the process. Columns of mixed types become strings.
+        Caches are rebuilt from the mapped data on demand. Needs pyarrow.
+        
+        Returns:
+            True if the data was moved to disk
+        """
+        df = self.df
+        if df is None or self.disk_backed or self.loading:
+            return False
+        
+        spill_path = os.path.join(tempfile.gettempdir(), f"excelsearchpro-{uuid.uuid4().hex[:8]}.arrow")
+        try:
+            success, _ = export_dataframe(df, spill_path)
+            if not success:
+                return False
+            mapped, _ = self._read_arrow_file(spill_path)
+        except Exception:
+            self._remove_spill_file(spill_path)
+            return False
+        mapped.columns = df.columns
+        mapped.index = df.index
+        
+        # An unlinked file stays readable through the mapping and vanishes with it;
+        # where that is not allowed (Windows) the file is removed on the next load
+        if self._remove_spill_file(spill_path):
+            spill_path = None
+        self._drop_spill()
+        
+        self.df = mapped
+        self.disk_backed = True
+        self._spill_path = spill_path
+        self._cache = None
+        return True
+    
+    def _drop_spill(self):
+        """Leave disk-backed mode, removing the spill file if it is still on disk"""
+        if self._spill_path is not None:
+            self._remove_spill_file(self._spill_path)
+            self._spill_path = None
+        self.disk_backed = False
+    
+    @staticmethod
+    def _remove_spill_file(path: str) -> bool:
+        """Delete a spill file, returning whether it is gone"""
+        try:
+            os.unlink(path)
+            return True
+        except FileNotFoundError:
+            return True
+        except OSError:
+            return False
+    
+    def _resident_frames(self) -> List[pd.DataFrame]:
+        """DataFrames this engine keeps in RAM, for the memory budget"""
+        frames = [] if self.df is None or self.disk_backed else [self.df]
+        if self.original_df is not None and self.original_df is not self.df:
+            frames.append(self.original_df)
+        cache = self._cache
+        if cache is not None and cache['df'] is not self.df:
+            # A cache for replaced data keeps that data alive until the next search
+            frames.append(cache['df'])
+        return frames
+    
+    def _cache_bytes(self) -> int:
+        """Bytes held by normalized columns, indexes and cached results"""
+        cache = self._cache
+        if cache is None:
+            return 0
+        with self._cache_lock:
+            return sum(nbytes for _, nbytes in cache['usage'].values())
+    
+    def _cache_entries(self) -> List[Tuple[int, int, str, Any]]:
+        """(last use tick, bytes, kind, key) for every evictable cache entry"""
+        cache = self._cache
+        if cache is None:
+            return []
+        with self._cache_lock:
+            return [(tick, nbytes, kind, key) for (kind, key), (tick, nbytes) in cache['usage'].items()]
+    
+    def _evict(self, kind: str, key: Any) -> int:
+        """
+        Drop one cache entry under memory pressure
+        
+        Returns:
+            Bytes freed
+        """
+        with self._cache_lock:
+            cache = self._cache
+            if cache is None:
+                return 0
+            entry = cache['usage'].pop((kind, key), None)
+            if entry is None:
+                return 0
+            cache[kind].pop(key, None)
+            return entry[1]
+    
+    def _release_original(self) -> bool:
+        """Drop the pristine copy of the loaded data under memory pressure"""
+        if self.original_df is None:
+            return False
+        self.original_df = None
+        return True
     
     def reset(self):
         """Reset the search engine state"""
+        self.stop_watching()
+        self.discard_preload()
+        self._load_generation += 1
+        self.loading = False
+        self.load_progress = {}
+        self._cache = None
         self.df = None
         self.original_df = None
+        self._drop_spill()
+        self._lazy = None
+        self.compaction = None
+        self._source = None
         self.file_path = ""
         self.load_time = 0
         self.file_info = {}
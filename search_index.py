@@ -0,0 +1,345 @@
+"""
+Search indexes for the Excel search engine
+Sorted keys with posting lists, so lookups skip scanning the whole column
+"""
+
+import bisect
+import re
+import numpy as np
+import pandas as pd
+from typing import Dict, Any, List, Sequence, Tuple
+
+# Words are runs of letters, digits and underscores
+WORD_PATTERN = re.compile(r'\w+')
+
+# A whole-word term ending in this matches words starting with the term
+PREFIX_WILDCARD = '*'
+
+# Joins cell values while splitting them into words; not a word character
+_SEPARATOR = '\x1f'
+_WORD_OR_SEPARATOR = re.compile(r'\w+|\x1f')
+
+
+class StringTable:
+    """
+    Sorted strings stored as one UTF-8 buffer plus end offsets
+    
+    Reads like a sequence of str, decoding only the entries that are looked
+    at, so a table memory-mapped from an index file is usable without
+    decoding it first (see index_store).
+    """
+    
+    def __init__(self, blob: np.ndarray, offsets: np.ndarray):
+        """
+        Args:
+            blob: uint8 array holding every string's UTF-8 bytes back to back
+            offsets: Start of each string in blob, plus a final end offset
+        """
+        self.blob = blob
+        self.offsets = offsets
+    
+    @classmethod
+    def from_strings(cls, strings: Sequence[str]) -> 'StringTable':
+        """Encode a sequence of strings into a table"""
+        encoded = [string.encode('utf-8', 'surrogatepass') for string in strings]
+        offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+        np.cumsum([len(data) for data in encoded], out=offsets[1:])
+        return cls(np.frombuffer(b''.join(encoded), dtype=np.uint8), offsets)
+    
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+    
+    def __getitem__(self, i: int) -> str:
+        if not 0 <= i < len(self):
+            raise IndexError(i)
+        return bytes(self.blob[self.offsets[i]:self.offsets[i + 1]]).decode('utf-8', 'surrogatepass')
+    
+    def __array__(self, dtype=None, copy=None) -> np.ndarray:
+        # Decodes every string; only needed when an index is extended
+        return np.array([self[i] for i in range(len(self))], dtype=object)
+    
+    @property
+    def nbytes(self) -> int:
+        return self.blob.nbytes + self.offsets.nbytes
+
+
+class ValueIndex:
+    """Exact-value index for one column: sorted distinct values and the rows holding each"""
+    
+    def __init__(self, keys: np.ndarray, postings: np.ndarray, offsets: np.ndarray, rows: int):
+        """
+        Args:
+            keys: Sorted distinct values (object array or StringTable)
+            postings: Row positions grouped by key, ascending within each key
+            offsets: Start of each key's rows in postings, plus a final end offset
+            rows: Number of rows in the indexed column
+        """
+        self.keys = keys
+        self.postings = postings
+        self.offsets = offsets
+        self.rows = rows
+    
+    @classmethod
+    def build(cls, values: pd.Series) -> 'ValueIndex':
+        """
+        Build an index from normalized (string) column values
+        
+        Args:
+            values: Column values as produced by the engine's normalization
+        
+        Returns:
+            New ValueIndex
+        """
+        codes, uniques = pd.factorize(values, sort=True)
+        codes = np.asarray(codes)
+        
+        # Stable sort keeps row positions ascending inside each posting list
+        order = np.argsort(codes, kind='stable')
+        offsets = np.searchsorted(codes[order], np.arange(len(uniques) + 1))
+        
+        position_dtype = np.int32 if len(values) < 2 ** 31 else np.int64
+        return cls(np.asarray(uniques, dtype=object), order.astype(position_dtype),
+                   offsets.astype(np.int64), len(values))
+    
+    def extend(self, values: pd.Series) -> 'ValueIndex':
+        """
+        Index rows appended after the indexed ones
+        
+        Args:
+            values: Normalized values of the new rows, which follow the
+                indexed rows in order
+        
+        Returns:
+            New ValueIndex covering the old and the new rows
+        """
+        tail = type(self).build(values)
+        keys = np.union1d(np.asarray(self.keys, dtype=object), tail.keys).astype(object)
+        old_slots = np.searchsorted(keys, np.asarray(self.keys, dtype=object))
+        tail_slots = np.searchsorted(keys, tail.keys)
+        old_counts = np.diff(self.offsets)
+        tail_counts = np.diff(tail.offsets)
+        
+        # Each key's old rows come first, then its new rows
+        counts = np.zeros(len(keys), dtype=np.int64)
+        counts[old_slots] += old_counts
+        before_tail = counts.copy()
+        counts[tail_slots] += tail_counts
+        offsets = np.concatenate(([0], np.cumsum(counts)))
+        
+        rows = self.rows + tail.rows
+        position_dtype = np.int32 if rows < 2 ** 31 else np.int64
+        postings = np.empty(offsets[-1], dtype=position_dtype)
+        old_rank = np.arange(len(self.postings)) - np.repeat(self.offsets[:-1], old_counts)
+        postings[np.repeat(offsets[old_slots], old_counts) + old_rank] = self.postings
+        tail_rank = np.arange(len(tail.postings)) - np.repeat(tail.offsets[:-1], tail_counts)
+        tail_start = offsets[tail_slots] + before_tail[tail_slots]
+        postings[np.repeat(tail_start, tail_counts) + tail_rank] = tail.postings + self.rows
+        return type(self)(keys, postings, offsets.astype(np.int64), rows)
+    
+    def lookup(self, key: str) -> np.ndarray:
+        """
+        Find the rows holding exactly this value
+        
+        Args:
+            key: Normalized value to look up
+        
+        Returns:
+            Ascending array of row positions
+        """
+        i = bisect.bisect_left(self.keys, key)
+        if i < len(self.keys) and self.keys[i] == key:
+            return self.postings[self.offsets[i]:self.offsets[i + 1]]
+        return self.postings[:0]
+    
+    @property
+    def nbytes(self) -> int:
+        """Approximate memory held by the index"""
+        if isinstance(self.keys, StringTable):
+            key_bytes = self.keys.nbytes
+        else:
+            key_bytes = sum(len(key) for key in self.keys) + 50 * len(self.keys)
+        return key_bytes + self.postings.nbytes + self.offsets.nbytes
+    
+    def to_arrays(self) -> Tuple[Dict[str, Any], Dict[str, np.ndarray]]:
+        """
+        Flat arrays holding the index, for writing to an index file
+        
+        Returns:
+            Tuple of (JSON-serializable metadata, name -> array)
+        """
+        keys = self.keys if isinstance(self.keys, StringTable) else StringTable.from_strings(self.keys)
+        return {'rows': self.rows}, {
+            'key_blob': keys.blob,
+            'key_offsets': keys.offsets,
+            'postings': self.postings,
+            'offsets': self.offsets
+        }
+    
+    @classmethod
+    def from_arrays(cls, meta: Dict[str, Any], arrays: Dict[str, np.ndarray]) -> 'ValueIndex':
+        """Rebuild an index from to_arrays() output, without copying the arrays"""
+        return cls(StringTable(arrays['key_blob'], arrays['key_offsets']),
+                   arrays['postings'], arrays['offsets'], meta['rows'])
+    
+    def describe(self) -> Dict[str, Any]:
+        """Summary of the index for stats output"""
+        return {
+            'type': 'value',
+            'distinct_values': len(self.keys),
+            'rows': self.rows,
+            'bytes': self.nbytes
+        }
+
+
+def _split_words(texts: List[str]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Words of every text, flattened
+    
+    Returns:
+        Tuple of (object array of words, int64 array of the text each word came from)
+    """
+    joined = _SEPARATOR.join(texts)
+    if joined.count(_SEPARATOR) == max(len(texts) - 1, 0):
+        # One regex pass over all texts; separators mark where each text ends
+        tokens = np.array(_WORD_OR_SEPARATOR.findall(joined) or [_SEPARATOR], dtype=object)
+        is_separator = tokens == _SEPARATOR
+        text_ids = np.cumsum(is_separator)
+        return tokens[~is_separator], text_ids[~is_separator].astype(np.int64)
+    
+    # Some text holds the separator itself
+    per_text = [WORD_PATTERN.findall(text) for text in texts]
+    lengths = np.fromiter(map(len, per_text), dtype=np.int64, count=len(per_text))
+    words = np.empty(int(lengths.sum()), dtype=object)
+    words[:] = [word for text_words in per_text for word in text_words]
+    return words, np.repeat(np.arange(len(texts), dtype=np.int64), lengths)
+
+
+def parse_word_term(term: str) -> Tuple[str, List[str], bool, str]:
+    """
+    Split a whole-word search term into what the token index looks up
+    
+    "john" matches the word john but not johnson; "smi*" matches every word
+    starting with smi. Terms of several words match them as a phrase.
+    
+    Args:
+        term: Normalized search term
+    
+    Returns:
+        Tuple of (term without the wildcard, its words, whether the last word
+        is a prefix, regular expression matching the term in a cell)
+    """
+    prefix = term.endswith(PREFIX_WILDCARD)
+    if prefix:
+        term = term[:-len(PREFIX_WILDCARD)]
+    words = WORD_PATTERN.findall(term)
+    
+    # Word boundaries only apply where the term starts or ends with a word character
+    pattern = re.escape(term)
+    if WORD_PATTERN.match(term[:1]):
+        pattern = r'(?<!\w)' + pattern
+    if WORD_PATTERN.match(term[-1:]):
+        if not prefix:
+            pattern += r'(?!\w)'
+    else:
+        prefix = False  # The wildcard follows punctuation, so every word is whole
+    return term, words, prefix, pattern
+
+
+class TokenIndex(ValueIndex):
+    """
+    Word index for one column: sorted distinct words and the rows containing each
+    
+    Answers whole-word and word-prefix searches with lookups in the sorted
+    words instead of matching every cell.
+    """
+    
+    @classmethod
+    def build(cls, values: pd.Series) -> 'TokenIndex':
+        """
+        Build an index from normalized (string) column values
+        
+        Each distinct cell value is split into words once, so columns with
+        repeated values are cheap to index.
+        
+        Args:
+            values: Column values as produced by the engine's normalization
+        
+        Returns:
+            New TokenIndex
+        """
+        codes, uniques = pd.factorize(values)
+        codes = np.asarray(codes)
+        order = np.argsort(codes, kind='stable')
+        value_offsets = np.searchsorted(codes[order], np.arange(len(uniques) + 1))
+        
+        words, value_ids = _split_words(np.asarray(uniques, dtype=object).tolist())
+        word_codes, keys = pd.factorize(words, sort=True)
+        
+        # Every row holding a value gets that value's words
+        counts = value_offsets[value_ids + 1] - value_offsets[value_ids]
+        starts = np.repeat(value_offsets[value_ids], counts)
+        ranks = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+        rows = order[starts + ranks]
+        row_words = np.repeat(np.asarray(word_codes), counts)
+        
+        # Rows ascending within each word, each row once even if the word repeats in it
+        by_word = np.lexsort((rows, row_words))
+        rows, row_words = rows[by_word], row_words[by_word]
+        first = np.ones(len(rows), dtype=bool)
+        first[1:] = (rows[1:] != rows[:-1]) | (row_words[1:] != row_words[:-1])
+        rows, row_words = rows[first], row_words[first]
+        
+        offsets = np.searchsorted(row_words, np.arange(len(keys) + 1))
+        position_dtype = np.int32 if len(values) < 2 ** 31 else np.int64
+        return cls(np.asarray(keys, dtype=object), rows.astype(position_dtype),
+                   offsets.astype(np.int64), len(values))
+    
+    def lookup_prefix(self, prefix: str) -> np.ndarray:
+        """
+        Find the rows containing a word that starts with prefix
+        
+        Args:
+            prefix: Normalized start of a word
+        
+        Returns:
+            Ascending array of row positions
+        """
+        start = bisect.bisect_left(self.keys, prefix)
+        # The highest code point is never part of a word, so every word
+        # starting with prefix sorts before this
+        end = bisect.bisect_left(self.keys, prefix + '\U0010ffff', start)
+        rows = self.postings[self.offsets[start]:self.offsets[end]]
+        if end - start <= 1:
+            return rows
+        # Several words' rows: merge them through a row mask rather than sorting
+        mask = np.zeros(self.rows, dtype=bool)
+        mask[rows] = True
+        return np.flatnonzero(mask).astype(rows.dtype)
+    
+    def candidates(self, words: List[str], prefix: bool) -> np.ndarray:
+        """
+        Rows containing every one of the words
+        
+        Args:
+            words: Normalized words of the search term
+            prefix: Match the last word as the start of a word
+        
+        Returns:
+            Ascending array of row positions
+        """
+        found = None
+        for i, word in enumerate(words):
+            rows = self.lookup_prefix(word) if prefix and i == len(words) - 1 else self.lookup(word)
+            found = rows if found is None else np.intersect1d(found, rows, assume_unique=True)
+            if not len(found):
+                break
+        return found
+    
+    def describe(self) -> Dict[str, Any]:
+        """Summary of the index for stats output"""
+        return {
+            'type': 'token',
+            'distinct_words': len(self.keys),
+            'rows': self.rows,
+            'bytes': self.nbytes
+        }
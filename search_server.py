@@ -0,0 +1,254 @@
+#!/usr/bin/env python3
+"""
+Excel Database Search Tool - HTTP/JSON API
+Lets other tools load workbooks and run searches over local HTTP
+"""
+
+import json
+import os
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional
+from urllib.parse import parse_qs, urlparse
+from search_service import SearchService, DEFAULT_HOST, DEFAULT_PORT
+
+# Rows serialized per write when streaming NDJSON
+NDJSON_BATCH_ROWS = 10000
+
+# Endpoint path -> service operation
+ENDPOINTS = {
+    '/health': 'ping',
+    '/stats': 'stats',
+    '/load': 'load',
+    '/unload': 'unload',
+    '/search': 'search',
+    '/page': 'search',
+    '/export': 'export',
+    '/shutdown': 'shutdown'
+}
+
+# Operations that change server state or touch files; POST with a JSON body only, so a
+# web page can't trigger them with a plain link or form
+MUTATING_OPS = ('load', 'unload', 'export', 'shutdown')
+
+# Host header names accepted when the server is bound to a loopback address
+LOOPBACK_HOSTS = ('localhost', '127.0.0.1', '::1')
+
+BOOLEAN_FIELDS = ('case_sensitive', 'exact_match', 'use_regex', 'whole_word', 'explain')
+INTEGER_FIELDS = ('max_results', 'offset', 'rows')
+
+
+def parse_query_string(query: str) -> Dict[str, Any]:
+    """
+    Convert URL query parameters into a service request
+    
+    Booleans accept 1/true/yes, columns may be repeated or comma-separated.
+    
+    Args:
+        query: Raw query string
+    
+    Returns:
+        Request dictionary
+    """
+    request: Dict[str, Any] = {}
+    for key, values in parse_qs(query).items():
+        if key == 'columns':
+            request[key] = [col for value in values for col in value.split(',') if col]
+        elif key in BOOLEAN_FIELDS:
+            request[key] = values[-1].lower() in ('1', 'true', 'yes')
+        elif key in INTEGER_FIELDS:
+            request[key] = int(values[-1])
+        else:
+            request[key] = values[-1]
+    return request
+
+
+def host_header_name(host_header: str) -> str:
+    """
+    Strip the port (and IPv6 brackets) from a Host header
+    
+    Args:
+        host_header: Raw Host header value
+    
+    Returns:
+        Lowercase host name
+    """
+    host = host_header.strip().lower()
+    if host.startswith('['):
+        return host[1:host.find(']')] if ']' in host else host[1:]
+    return host.rsplit(':', 1)[0] if host.count(':') == 1 else host
+
+
+class SearchAPIServer(SearchService):
+    """HTTP front end over SearchService, one thread per request"""
+    
+    def __init__(self, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT,
+                 export_dir: Optional[str] = None):
+        """
+        Args:
+            host: Address to bind
+            port: Port to bind (0 picks a free one)
+            export_dir: Directory server-side exports are written to; without one,
+                requests with an 'output' path are refused
+        """
+        super().__init__()
+        self.host = host
+        self.port = port
+        self.restrict_exports = True
+        self.export_dir = export_dir
+        self._httpd: Optional[ThreadingHTTPServer] = None
+    
+    def allowed_hosts(self) -> List[str]:
+        """Host header names accepted; anything else is refused to block DNS rebinding"""
+        hosts = [host_header_name(self.host)]
+        if hosts[0] in LOOPBACK_HOSTS or hosts[0].startswith('127.'):
+            hosts.extend(LOOPBACK_HOSTS)
+        return hosts
+    
+    def start(self, preload_files: Optional[List[str]] = None) -> ThreadingHTTPServer:
+        """
+        Bind the HTTP server without serving yet
+        
+        Args:
+            preload_files: Files to load and index before accepting requests
+        
+        Returns:
+            The bound server; its server_address holds the actual port
+        """
+        for file_path in preload_files or []:
+            engine, message = self.get_engine(file_path)
+            print(f"{'✅' if engine else '❌'} {os.path.basename(file_path)}: {message}")
+        
+        service = self
+        allowed_hosts = self.allowed_hosts()
+        
+        class RequestHandler(BaseHTTPRequestHandler):
+            """Maps endpoints to service operations"""
+            
+            protocol_version = 'HTTP/1.1'
+            # Headers and body go out as separate writes; don't let Nagle hold the body back
+            disable_nagle_algorithm = True
+            
+            def do_GET(self):
+                self.dispatch(json_body=False)
+            
+            def do_POST(self):
+                content_type = self.headers.get('Content-Type', '').split(';')[0].strip().lower()
+                self.dispatch(json_body=content_type == 'application/json')
+            
+            def log_message(self, format, *args):
+                pass  # Keep the console quiet under load
+            
+            def dispatch(self, json_body: bool):
+                """
+                Run the endpoint's operation
+                
+                Args:
+                    json_body: The request is a POST with Content-Type application/json
+                """
+                # Always drain the body so the connection stays usable after an error
+                try:
+                    length = int(self.headers.get('Content-Length') or 0)
+                except ValueError:
+                    length = 0
+                body = self.rfile.read(length) if length > 0 else b''
+                
+                if host_header_name(self.headers.get('Host', '')) not in allowed_hosts:
+                    self.send_json(403, {'ok': False, 'error': "Host not allowed"})
+                    return
+                
+                url = urlparse(self.path)
+                op = ENDPOINTS.get(url.path)
+                if op is None:
+                    self.send_json(404, {'ok': False, 'error': f"Unknown endpoint: {url.path}"})
+                    return
+                
+                if body and not json_body:
+                    self.send_json(415, {'ok': False, 'error': "Request body must be application/json"})
+                    return
+                
+                try:
+                    request = parse_query_string(url.query)
+                    if body:
+                        payload = json.loads(body)
+                        if not isinstance(payload, dict):
+                            raise ValueError("body must be a JSON object")
+                        request.update(payload)
+                except ValueError as e:
+                    self.send_json(400, {'ok': False, 'error': f"Invalid request: {e}"})
+                    return
+                
+                if (op in MUTATING_OPS or request.get('output')) and not json_body:
+                    self.send_json(405, {'ok': False,
+                                         'error': f"{url.path} needs a POST with Content-Type application/json"})
+                    return
+                
+                request['op'] = op
+                if op == 'search' and request.get('format') == 'ndjson':
+                    self.send_ndjson(request, json_body)
+                    return
+                
+                # Loading a file reads it and may write its index sidecar, so only a
+                # JSON POST search may load or refresh one
+                response = service.handle_request(request, allow_load=json_body)
+                self.send_json(200 if response['ok'] else 400, response)
+            
+            def send_json(self, status: int, payload: Dict[str, Any]):
+                body = json.dumps(payload, default=str).encode('utf-8')
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+            
+            def send_ndjson(self, request: Dict[str, Any], allow_load: bool):
+                """Stream the stats line followed by one JSON object per result row"""
+                offset = request.get('offset') or 0
+                rows = request.get('rows')
+                try:
+                    engine, results, stats = service.run_search(
+                        request, limit=offset + rows if rows is not None else None, allow_load=allow_load)
+                except KeyError as e:
+                    self.send_json(400, {'ok': False, 'error': f"Missing request field: {e}"})
+                    return
+                if 'error' in stats:
+                    self.send_json(400, {'ok': False, 'error': stats['error']})
+                    return
+                
+                page = results.iloc[offset:offset + rows] if rows is not None else results.iloc[offset:]
+                
+                self.send_response(200)
+                self.send_header('Content-Type', 'application/x-ndjson')
+                self.send_header('Transfer-Encoding', 'chunked')
+                self.end_headers()
+                self.write_chunk(json.dumps({'stats': stats}, default=str) + '\n')
+                for start in range(0, len(page), NDJSON_BATCH_ROWS):
+                    batch = page.iloc[start:start + NDJSON_BATCH_ROWS]
+                    self.write_chunk(batch.to_json(orient='records', lines=True, date_format='iso')
+                                     .rstrip('\n') + '\n')
+                self.wfile.write(b'0\r\n\r\n')
+            
+            def write_chunk(self, text: str):
+                data = text.encode('utf-8')
+                self.wfile.write(f"{len(data):X}\r\n".encode('ascii') + data + b'\r\n')
+        
+        class Server(ThreadingHTTPServer):
+            daemon_threads = True
+        
+        self._httpd = Server((self.host, self.port), RequestHandler)
+        self.shutdown_callback = self._httpd.shutdown
+        return self._httpd
+    
+    def serve_forever(self, preload_files: Optional[List[str]] = None):
+        """
+        Serve HTTP requests until a shutdown request arrives
+        
+        Args:
+            preload_files: Files to load and index before accepting requests
+        """
+        httpd = self.start(preload_files)
+        host, port = httpd.server_address[:2]
+        print(f"🚀 Search API listening on http://{host}:{port}")
+        try:
+            httpd.serve_forever()
+        finally:
+            httpd.server_close()
@@ -0,0 +1,338 @@
+"""
+Shared request handling for the query daemon and the HTTP API
+Keeps workbooks loaded and indexed, and executes JSON-style requests against them
+"""
+
+import json
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+# Rows sent back for display when the client does not ask for a specific number
+DEFAULT_RESPONSE_ROWS = 10
+
+# Default HTTP API address; defined here so the CLI can show it without importing http.server
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8765
+
+
+class SearchService:
+    """Loaded workbooks plus the operations clients can run on them"""
+    
+    def __init__(self):
+        self.engines: Dict[str, Any] = {}
+        self.fingerprints: Dict[str, Any] = {}
+        self.started = time.time()
+        self.requests_served = 0
+        self.shutdown_callback: Optional[Callable[[], None]] = None
+        self._lock = threading.Lock()
+        self._file_locks: Dict[str, threading.Lock] = {}
+    
+        # Shared by every engine when set (see enable_instrumentation)
+        self.instrumentation = None
+        
+        # Refresh loaded files in the background as soon as they change on disk
+        self.watch_files: bool = False
+        
+        # Map indexes saved next to each file instead of rebuilding them, and save new ones
+        self.persist_indexes: bool = False
+        
+        # With restrict_exports set, server-side exports ('output') must land inside
+        # export_dir, and are refused when no export_dir is configured
+        self.restrict_exports: bool = False
+        self.export_dir: Optional[str] = None
+    
+    def enable_instrumentation(self, slow_query_threshold: Optional[float] = 0.5,
+                               slow_query_log: Optional[str] = None):
+        """
+        Record latency histograms and log slow searches for all loaded files
+        
+        Args:
+            slow_query_threshold: Seconds at or above which a search is logged
+            slow_query_log: Rotating log file (default: instrumentation.DEFAULT_SLOW_QUERY_LOG)
+        """
+        from instrumentation import Instrumentation, DEFAULT_SLOW_QUERY_LOG
+        
+        self.instrumentation = Instrumentation(slow_query_threshold, slow_query_log or DEFAULT_SLOW_QUERY_LOG)
+        for engine in list(self.engines.values()):
+            engine.instrumentation = self.instrumentation
+    
+    def get_engine(self, file_path: str):
+        """
+        Return an engine with the file loaded, loading or reloading it if needed
+        
+        A file is refreshed when its size or modification time changed since
+        it was loaded: rows appended to a CSV file are added to the loaded
+        data, any other change reloads it (see ExcelSearchEngine.refresh).
+        With watch_files set, newly loaded files are also refreshed in the
+        background when they change (see ExcelSearchEngine.watch). With
+        persist_indexes set, indexes saved by an earlier process are mapped
+        rather than rebuilt.
+        
+        Args:
+            file_path: Path to Excel or CSV file
+        
+        Returns:
+            Tuple of (engine or None, message)
+        """
+        from search_engine import ExcelSearchEngine
+        
+        file_path = os.path.abspath(file_path)
+        with self._lock:
+            file_lock = self._file_locks.setdefault(file_path, threading.Lock())
+        
+        # Concurrent requests for the same file wait for a single load
+        with file_lock:
+            fingerprint = ExcelSearchEngine._file_fingerprint(file_path)
+            engine = self.engines.get(file_path)
+            if engine is not None and self.fingerprints.get(file_path) == fingerprint:
+                return engine, "Already loaded"
+            
+            if engine is not None:
+                success, message = engine.refresh()
+                if success:
+                    self._build_indexes(engine, refreshed=True)
+                    self.fingerprints[file_path] = fingerprint
+                    return engine, message
+            
+            if engine is not None:
+                engine.stop_watching()
+            
+            engine = ExcelSearchEngine()
+            engine.instrumentation = self.instrumentation
+            success, message = engine.load_file(file_path)
+            if not success:
+                return None, message
+            
+            self._build_indexes(engine)
+            if self.watch_files:
+                engine.watch()
+            self.engines[file_path] = engine
+            self.fingerprints[file_path] = fingerprint
+            return engine, message
+    
+    def loaded_engine(self, file_path: str):
+        """
+        Return the engine of an already loaded, up-to-date file without loading anything
+        
+        Args:
+            file_path: Path to Excel or CSV file
+        
+        Returns:
+            Tuple of (engine or None, message)
+        """
+        from search_engine import ExcelSearchEngine
+        
+        file_path = os.path.abspath(file_path)
+        engine = self.engines.get(file_path)
+        if engine is None:
+            return None, (f"File is not loaded; send a load request (POST /load) first: "
+                          f"{os.path.basename(file_path)}")
+        # Watched files are refreshed in the background; others are refreshed by loading again
+        if not self.watch_files and \
+                self.fingerprints.get(file_path) != ExcelSearchEngine._file_fingerprint(file_path):
+            return None, (f"File changed since it was loaded; send a load request (POST /load) to refresh it: "
+                          f"{os.path.basename(file_path)}")
+        return engine, "Already loaded"
+    
+    def _build_indexes(self, engine, refreshed: bool = False, columns: Optional[List[str]] = None,
+                       case_modes: Tuple[bool, ...] = (False, True), tokens: bool = False):
+        """
+        Index column values, reusing and updating the sidecar index file when persist_indexes is set
+        
+        Word indexes are built only with tokens set, for the columns of a
+        whole-word search; a refresh rebuilds the ones that exist already.
+        
+        Args:
+            engine: Engine with the file loaded
+            refreshed: The file was just refreshed, so the sidecar is stale
+            columns: Columns to index (default: all columns)
+            case_modes: Case sensitivity modes to index
+            tokens: Also build the word indexes of these columns
+        """
+        if self.persist_indexes and not refreshed and columns is None:
+            engine.load_indexes()
+        built = engine.build_indexes(columns, case_modes, tokens=tokens)
+        if self.persist_indexes and (refreshed or built.get('indexes_built')):
+            engine.save_indexes()
+    
+    def handle_request(self, request: Dict[str, Any], allow_load: bool = True) -> Dict[str, Any]:
+        """
+        Execute one client request
+        
+        Args:
+            request: Dictionary with an 'op' key (search, export, load, unload,
+                list, stats, ping or shutdown) and the operation's arguments
+            allow_load: Let searches load or refresh their file; when False they
+                only run against files already loaded and unchanged
+        
+        Returns:
+            JSON-serializable response dictionary with an 'ok' flag
+        """
+        with self._lock:
+            self.requests_served += 1
+        op = request.get('op')
+        
+        try:
+            if op == 'ping':
+                return {'ok': True, 'pid': os.getpid(), 'uptime': time.time() - self.started}
+            
+            if op in ('list', 'stats'):
+                response = {
+                    'ok': True,
+                    'uptime': time.time() - self.started,
+                    'requests_served': self.requests_served,
+                    'files': [dict(engine.get_file_info(include_memory=op == 'stats'), path=path)
+                              for path, engine in list(self.engines.items())]
+                }
+                if op == 'stats' and self.instrumentation is not None:
+                    response['instrumentation'] = self.instrumentation.snapshot()
+                if op == 'stats':
+                    from memory_budget import GLOBAL_MEMORY_BUDGET
+                    response['memory'] = GLOBAL_MEMORY_BUDGET.usage()
+                return response
+            
+            if op == 'load':
+                engine, message = self.get_engine(request['file'])
+                if engine is None:
+                    return {'ok': False, 'error': message}
+                return {'ok': True, 'message': message, 'file_info': engine.get_file_info()}
+            
+            if op == 'unload':
+                file_path = os.path.abspath(request['file'])
+                engine = self.engines.pop(file_path, None)
+                removed = engine is not None
+                if removed:
+                    engine.stop_watching()
+                self.fingerprints.pop(file_path, None)
+                return {'ok': True, 'unloaded': removed}
+            
+            if op in ('search', 'export'):
+                return self._search(request, allow_load)
+            
+            if op == 'shutdown':
+                if self.shutdown_callback is not None:
+                    threading.Thread(target=self.shutdown_callback, daemon=True).start()
+                return {'ok': True}
+            
+            return {'ok': False, 'error': f"Unknown operation: {op}"}
+        
+        except KeyError as e:
+            return {'ok': False, 'error': f"Missing request field: {e}"}
+        except Exception as e:
+            return {'ok': False, 'error': f"Request failed: {str(e)}"}
+    
+    def run_search(self, request: Dict[str, Any], limit: Optional[int] = None,
+                   allow_load: bool = True) -> Tuple[Any, Any, Dict[str, Any]]:
+        """
+        Run the search described by a request
+        
+        Args:
+            request: Dictionary with file, term and optional columns,
+                case_sensitive, exact_match, use_regex, whole_word, max_results and
+                explain
+            limit: Materialize at most this many result rows; stats still
+                report the counts for the request's own max_results
+            allow_load: Load or refresh the file if needed (see loaded_engine)
+        
+        Returns:
+            Tuple of (engine, results_dataframe, search_stats); engine is None
+            and stats holds 'error' when the file could not be loaded
+        """
+        if allow_load:
+            engine, message = self.get_engine(request['file'])
+        else:
+            engine, message = self.loaded_engine(request['file'])
+        if engine is None:
+            return None, None, {'error': message}
+        
+        columns = request.get('columns') or engine.get_file_info()['column_names'][:2]
+        max_results = request.get('max_results')
+        if allow_load and request.get('whole_word') and not request.get('exact_match') \
+                and not request.get('use_regex'):
+            # Word indexes are built on a column's first whole-word search; build
+            # them here so they are saved with the sidecar like the value indexes
+            self._build_indexes(engine, columns=[col for col in columns if col in engine.df.columns],
+                                case_modes=(request.get('case_sensitive', False),), tokens=True)
+        if limit is not None:
+            max_results = min(limit, max_results) if max_results else limit
+        
+        results, stats = engine.search(
+            search_term=request['term'],
+            search_columns=columns,
+            case_sensitive=request.get('case_sensitive', False),
+            exact_match=request.get('exact_match', False),
+            use_regex=request.get('use_regex', False),
+            max_results=max_results,
+            explain=request.get('explain', False),
+            whole_word=request.get('whole_word', False)
+        )
+        
+        if 'error' not in stats and 'total_results' in stats:
+            requested = request.get('max_results')
+            stats['returned_results'] = min(stats['total_results'], requested) if requested else stats['total_results']
+        return engine, results, stats
+    
+    def _resolve_output(self, output: str) -> Tuple[Optional[str], str]:
+        """
+        Check a server-side export path against export_dir
+        
+        Relative paths are taken relative to export_dir when one is configured.
+        
+        Args:
+            output: Export path from the request
+        
+        Returns:
+            Tuple of (absolute path or None, error message)
+        """
+        if self.export_dir:
+            export_dir = os.path.realpath(self.export_dir)
+            path = os.path.realpath(os.path.join(export_dir, output))
+            if os.path.commonpath([export_dir, path]) != export_dir:
+                return None, f"Export path must be inside the export directory: {self.export_dir}"
+            return path, ""
+        if self.restrict_exports:
+            return None, "Server-side export is disabled (start the server with an export directory)"
+        return os.path.abspath(output), ""
+    
+    def _search(self, request: Dict[str, Any], allow_load: bool = True) -> Dict[str, Any]:
+        """Run a search request, optionally exporting all results server-side"""
+        output = None
+        if request.get('output'):
+            output, error = self._resolve_output(request['output'])
+            if output is None:
+                return {'ok': False, 'error': error}
+        
+        # One page of rows; offset/rows page through the (cached) result set
+        offset = request.get('offset') or 0
+        rows = request.get('rows', DEFAULT_RESPONSE_ROWS)
+        
+        # Only rows up to the end of the page are materialized
+        limit = offset + rows if rows is not None else None
+        engine, results, stats = self.run_search(request, limit=limit, allow_load=allow_load)
+        if 'error' in stats:
+            return {'ok': False, 'error': stats['error']}
+        
+        response = {'ok': True, 'stats': stats}
+        
+        if output:
+            # Exports stream straight from the loaded data by row position
+            positions, _ = engine.search_positions(
+                request['term'], request.get('columns') or engine.get_file_info()['column_names'][:2],
+                request.get('case_sensitive', False), request.get('exact_match', False),
+                request.get('use_regex', False), whole_word=request.get('whole_word', False))
+            if request.get('max_results'):
+                positions = positions[:request['max_results']]
+            success, export_message = engine.export_rows(positions, output)
+            response['export'] = {'ok': success, 'message': export_message}
+        elif request.get('op') == 'export':
+            return {'ok': False, 'error': "Missing request field: 'output'"}
+        
+        page = results.iloc[offset:offset + rows] if rows is not None else results.iloc[offset:]
+        # to_json handles NaN, numpy and timestamp values that json.dumps can't
+        table = json.loads(page.to_json(orient='split', index=False, date_format='iso'))
+        response['columns'] = table['columns']
+        response['rows'] = table['data']
+        response['offset'] = offset
+        return response
@@ -0,0 +1,660 @@
+"""
+SQLite storage and search backend for the search engine
+Bulk-loads a file into a local database with an FTS5 trigram index and answers searches with SQL
+"""
+
+import json
+import os
+import re
+import sqlite3
+import tempfile
+import threading
+import time
+import uuid
+from functools import lru_cache
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from exporters import export_dataframe
+from search_engine import ExcelSearchEngine, ARROW_EXTENSIONS, SEARCH_PHASES
+from search_index import parse_word_term
+
+# Bumped when the database layout changes; databases with another version are rebuilt
+SQLITE_FORMAT_VERSION = 1
+
+# Rows inserted per batch while bulk loading
+SQLITE_CHUNK_ROWS = 50000
+
+# Rows kept in ``df`` for display; the full data stays in the database
+SQLITE_PREVIEW_ROWS = 1000
+
+# The trigram tokenizer indexes every 3 characters, so shorter terms are matched by scanning
+TRIGRAM_LENGTH = 3
+
+# Row ids bound per "id IN (...)" query when fetching rows
+FETCH_BATCH_ROWS = 900
+
+
+def fts5_available() -> bool:
+    """Whether Python's SQLite has FTS5 with the trigram tokenizer (SQLite 3.34+)"""
+    conn = sqlite3.connect(':memory:')
+    try:
+        conn.execute("CREATE VIRTUAL TABLE probe USING fts5(text, tokenize='trigram')")
+        return True
+    except sqlite3.OperationalError:
+        return False
+    finally:
+        conn.close()
+
+
+def _text(value: Any) -> str:
+    """A stored value as search compares it: its text, with empty cells as ''"""
+    return '' if value is None else str(value)
+
+
+def _lower(value: Any) -> str:
+    return _text(value).lower()
+
+
+@lru_cache(maxsize=64)
+def _compile(pattern: str) -> 're.Pattern':
+    return re.compile(pattern)
+
+
+def _regexp(pattern: str, value: Any) -> bool:
+    return _compile(pattern).search(_text(value)) is not None
+
+
+def _cell(value: Any) -> Any:
+    """A value from an object column as SQLite stores it"""
+    if value is None or value is pd.NA or value is pd.NaT:
+        return None
+    if isinstance(value, float):
+        return None if value != value else value
+    if isinstance(value, (str, int)) and not isinstance(value, bool):
+        return value
+    if isinstance(value, np.generic):
+        return _cell(value.item())
+    return str(value)
+
+
+def _column_values(series: pd.Series) -> List[Any]:
+    """Column values as stored: numbers and text natively, anything else as its text"""
+    missing = series.isna().to_numpy()
+    if (isinstance(series.dtype, np.dtype) and series.dtype.kind in 'iuf') or \
+            isinstance(series.dtype, pd.StringDtype):
+        values = series.tolist()
+    elif pd.api.types.is_bool_dtype(series) or not (
+            pd.api.types.is_numeric_dtype(series) or pd.api.types.is_object_dtype(series)
+            or pd.api.types.is_string_dtype(series)):
+        values = series.astype(str).tolist()
+    else:
+        values = [_cell(value) for value in series.tolist()]
+    if missing.any():
+        for i in np.flatnonzero(missing):
+            values[i] = None
+    return values
+
+
+class _Database:
+    """An open backend database; closed (and deleted if temporary) once nothing uses it"""
+    
+    def __init__(self, path: str, columns: List[Any], rows: int, temporary: bool):
+        self.path = path
+        self.columns = columns
+        self.rows = rows
+        self.temporary = temporary
+        self.lock = threading.RLock()
+        self.conn = _connect(path)
+    
+    def query(self, sql: str, params: Iterable[Any] = ()) -> List[Tuple]:
+        with self.lock:
+            return self.conn.execute(sql, tuple(params)).fetchall()
+    
+    def close(self):
+        if self.conn is not None:
+            self.conn.close()
+            self.conn = None
+            if self.temporary:
+                try:
+                    os.unlink(self.path)
+                except OSError:
+                    pass
+    
+    def __del__(self):
+        try:
+            self.close()
+        except Exception:
+            pass  # Interpreter shutdown
+
+
+def _connect(path: str) -> sqlite3.Connection:
+    """Connection with the functions search queries use"""
+    conn = sqlite3.connect(path, check_same_thread=False)
+    conn.create_function('search_text', 1, _text, deterministic=True)
+    conn.create_function('search_lower', 1, _lower, deterministic=True)
+    conn.create_function('search_regexp', 2, _regexp, deterministic=True)
+    return conn
+
+
+def _read_meta(path: str) -> Optional[Dict[str, Any]]:
+    """Metadata of an existing backend database, or None if it is not one"""
+    try:
+        conn = sqlite3.connect(path)
+        try:
+            return json.loads(conn.execute("SELECT value FROM meta WHERE key = 'source'").fetchone()[0])
+        finally:
+            conn.close()
+    except (sqlite3.Error, TypeError, ValueError):
+        return None
+
+
+class SQLiteSearchEngine(ExcelSearchEngine):
+    """
+    ExcelSearchEngine keeping the data in SQLite instead of a DataFrame
+    
+    For datasets too large to hold in memory comfortably. The file is
+    streamed into a ``data`` table (numbers and text stored natively, other
+    values as text) and a contentless FTS5 table with the trigram tokenizer
+    indexes every column's text. Searches become SQL:
+    
+    - substring and exact matches of 3+ characters take their candidate rows
+      from the FTS index, then check them exactly
+    - shorter terms and regular expressions scan the table
+    
+    so results are the same as the in-memory engine's for the same cell text.
+    CSV cells are stored as the text in the file rather than as parsed
+    numbers. ``df`` holds only the first rows, for display; row counts come
+    from the database and results are read from it.
+    
+    Databases live in a temporary file by default. Given a database path, a
+    later load of the same unchanged file reuses the database instead of
+    importing again.
+    """
+    
+    def __init__(self, db_path: Optional[str] = None, chunk_rows: int = SQLITE_CHUNK_ROWS,
+                 preview_rows: int = SQLITE_PREVIEW_ROWS):
+        """
+        Args:
+            db_path: Database file to build and reuse (default: a temporary file)
+            chunk_rows: Rows read and inserted per batch while loading
+            preview_rows: Rows kept in ``df`` for display
+        """
+        super().__init__()
+        self.db_path = db_path
+        self.chunk_rows = chunk_rows
+        self.preview_rows = preview_rows
+        self._db: Optional[_Database] = None
+    
+    def load_file(self,
+                  file_path: str,
+                  progress_callback: Optional[Callable[[Dict[str, Any]], None]] = None,
+                  cancel_event: Optional[threading.Event] = None,
+                  columns: Optional[List[str]] = None,
+                  lazy: bool = False,
+                  compact: bool = False) -> Tuple[bool, str]:
+        """
+        Import a file into the database and index it
+        
+        The new database is built next to the current one and swapped in when
+        complete, so a cancelled or failed load leaves the loaded data as it
+        was and searches already running finish on the old database.
+        
+        Args:
+            file_path: Path to Excel, CSV, Parquet, Feather or Arrow file
+            progress_callback: Called after every imported chunk with a progress dictionary
+            cancel_event: Import stops as soon as this event is set
+            columns: Columns to import (default: all)
+            lazy: Has no effect; every imported column is on disk already
+            compact: Has no effect; SQLite stores values compactly already
+        
+        Returns:
+            Tuple of (success, message)
+        """
+        try:
+            start_time = time.time()
+            if not os.path.exists(file_path):
+                return False, f"File not found: {os.path.basename(file_path)}"
+            if not file_path.lower().endswith(('.csv', '.xlsx', '.xls') + ARROW_EXTENSIONS):
+                return False, f"Unsupported file format: {os.path.splitext(file_path)[1]}"
+            
+            if columns is not None:
+                file_columns = self._file_columns(file_path)
+                unknown = [col for col in columns if col not in file_columns]
+                if unknown:
+                    return False, f"Unknown columns: {unknown}"
+                columns = [col for col in file_columns if col in columns]
+            
+            fingerprint = self._file_fingerprint(file_path)
+            source = {'file_path': fingerprint[0], 'size': fingerprint[1], 'mtime_ns': fingerprint[2],
+                      'columns': columns, 'version': SQLITE_FORMAT_VERSION}
+            
+            reused = False
+            meta = _read_meta(self.db_path) if self.db_path and os.path.exists(self.db_path) else None
+            if meta is not None and {key: meta.get(key) for key in source} == source:
+                db = _Database(self.db_path, meta['column_names'], meta['rows'], temporary=False)
+                reused = True
+            else:
+                chunks = self._iter_chunks(file_path, self.chunk_rows, columns=columns, text=True)
+                db = self._build(chunks, source, start_time, progress_callback, cancel_event)
+                if db is None:
+                    return False, "Load cancelled"
+            
+            self._install(db, file_path, time.time() - start_time)
+            self._source = {'fingerprint': fingerprint, 'options': {'columns': columns}, 'append': None}
+            self._record('load', self.load_time, file=file_path, rows=db.rows)
+            
+            verb = "Opened" if reused else "Successfully loaded"
+            return True, (f"{verb} {db.rows:,} rows and {len(db.columns)} columns in {self.load_time:.2f} "
+                          f"seconds (SQLite database {os.path.basename(db.path)})")
+        except Exception as e:
+            return False, f"Error loading file: {str(e)}"
+    
+    def load_dataframe(self, df: pd.DataFrame, file_path: str, load_time: float = 0.0) -> Tuple[bool, str]:
+        """Import an already parsed DataFrame into the database"""
+        start_time = time.time()
+        chunks = ((df.iloc[start:start + self.chunk_rows], None)
+                  for start in range(0, max(len(df), 1), self.chunk_rows))
+        db = self._build(chunks, {'file_path': os.path.abspath(file_path)}, start_time, None, None)
+        self._install(db, file_path, load_time + time.time() - start_time)
+        self._source = None
+        self._record('load', self.load_time, file=file_path, rows=db.rows)
+        return True, f"Loaded {db.rows:,} rows and {len(db.columns)} columns"
+    
+    def load_file_progressive(self, file_path: str, preview_rows: int = 1000, chunk_rows: int = 50000,
+                              progress_callback: Optional[Callable[[Dict[str, Any]], None]] = None,
+                              cancel_event: Optional[threading.Event] = None) -> Tuple[bool, str]:
+        """
+        Import the whole file, reporting progress (see load_file)
+        
+        The database is searchable only once it is complete, so this returns
+        when the import is done rather than after the first rows.
+        """
+        return self.load_file(file_path, progress_callback=progress_callback, cancel_event=cancel_event)
+    
+    def preload(self, file_path: str) -> bool:
+        """Speculative loads are not supported; the import starts on load_file()"""
+        return False
+    
+    def refresh(self) -> Tuple[bool, str]:
+        """
+        Re-import the file if it changed since it was loaded
+        
+        Returns:
+            Tuple of (success, message)
+        """
+        with self._refresh_lock:
+            if self._db is None or self._source is None:
+                return False, "No file loaded"
+            fingerprint = self._file_fingerprint(self.file_path)
+            if fingerprint is None:
+                return False, f"File not found: {os.path.basename(self.file_path)}"
+            if fingerprint == self._source['fingerprint']:
+                return True, "File unchanged"
+            return self.load_file(self.file_path, **self._source['options'])
+    
+    def _build(self, chunks: Iterable[Tuple[pd.DataFrame, Optional[Dict[str, Any]]]],
+               source: Dict[str, Any], start_time: float,
+               progress_callback: Optional[Callable[[Dict[str, Any]], None]],
+               cancel_event: Optional[threading.Event]) -> Optional[_Database]:
+        """
+        Stream chunks into a new database file
+        
+        Returns:
+            The opened database, or None if the import was cancelled
+        """
+        if self.db_path:
+            path = f"{self.db_path}.{uuid.uuid4().hex}.tmp"
+        else:
+            fd, path = tempfile.mkstemp(prefix='excelsearchpro-', suffix='.sqlite')
+            os.close(fd)
+        
+        conn = sqlite3.connect(path)
+        try:
+            # A half-built database is thrown away, so skip the journal and fsyncs
+            conn.execute("PRAGMA journal_mode = OFF")
+            conn.execute("PRAGMA synchronous = OFF")
+            names = None
+            rows = 0
+            for chunk, raw_progress in chunks:
+                if cancel_event is not None and cancel_event.is_set():
+                    conn.close()
+                    os.unlink(path)
+                    return None
+                if names is None:
+                    names = list(chunk.columns)
+                    fields = [f"c{i}" for i in range(len(names))]
+                    conn.execute(f"CREATE TABLE data (id INTEGER PRIMARY KEY, {', '.join(fields)})")
+                    conn.execute(f"CREATE VIRTUAL TABLE fts USING fts5({', '.join(fields)}, "
+                                 f"content='', tokenize='trigram')")
+                    placeholders = ', '.join('?' * (len(names) + 1))
+                
+                ids = range(rows, rows + len(chunk))
+                values = [_column_values(chunk.iloc[:, i]) for i in range(len(names))]
+                # The index gets each value's text exactly as search compares it
+                texts = [[_text(value) for value in column] for column in values]
+                conn.executemany(f"INSERT INTO data VALUES ({placeholders})", zip(ids, *values))
+                conn.executemany(f"INSERT INTO fts (rowid, {', '.join(fields)}) VALUES ({placeholders})",
+                                 zip(ids, *texts))
+                rows += len(chunk)
+                if progress_callback:
+                    progress_callback(self._make_progress(raw_progress, rows, start_time))
+            
+            if names is None:
+                raise ValueError("File has no columns")
+            conn.execute("CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT)")
+            meta = dict(source, column_names=names, rows=rows)
+            conn.execute("INSERT INTO meta VALUES ('source', ?)", (json.dumps(meta, default=str),))
+            conn.execute("INSERT INTO fts (fts) VALUES ('optimize')")
+            conn.commit()
+            conn.close()
+        except BaseException:
+            conn.close()
+            if os.path.exists(path):
+                os.unlink(path)
+            raise
+        
+        if self.db_path:
+            os.replace(path, self.db_path)
+            return _Database(self.db_path, names, rows, temporary=False)
+        return _Database(path, names, rows, temporary=True)
+    
+    def _install(self, db: _Database, file_path: str, load_time: float):
+        """Make a database the loaded data; searches holding the old one finish on it"""
+        preview = self._fetch(db, np.arange(min(db.rows, self.preview_rows)))
+        with self._cache_lock:
+            self._db = db
+            self.df = preview
+            self._cache = None
+        self.discard_preload()
+        self._load_generation += 1
+        self.loading = False
+        self.load_progress = {}
+        self.original_df = None
+        self._lazy = None
+        self.compaction = None
+        self.file_path = file_path
+        self.load_time = load_time
+        self._update_file_info()
+    
+    def _update_file_info(self):
+        """Refresh file_info from the loaded database"""
+        db = self._db
+        self.file_info = {
+            'rows': db.rows,
+            'columns': len(db.columns),
+            'file_size_mb': os.path.getsize(self.file_path) / (1024 * 1024),
+            'load_time': self.load_time,
+            'column_names': list(db.columns),
+            'lazy_columns': [],
+            'compaction': None,
+            'loading': False,
+            'backend': 'sqlite',
+            'database': db.path,
+            'database_mb': os.path.getsize(db.path) / (1024 * 1024)
+        }
+    
+    def search(self,
+               search_term: str,
+               search_columns: List[str],
+               case_sensitive: bool = False,
+               exact_match: bool = False,
+               use_regex: bool = False,
+               max_results: Optional[int] = None,
+               explain: bool = False,
+               whole_word: bool = False) -> Tuple[pd.DataFrame, Dict[str, Any]]:
+        """
+        Search the database; takes the same options as ExcelSearchEngine.search()
+        
+        Returns:
+            Tuple of (results_dataframe, search_stats)
+        """
+        # One reference, so a reload swapping the database can't split a search
+        db = self._db
+        start_time = time.time()
+        positions, stats = self._search_database(db, search_term, search_columns, case_sensitive,
+                                                 exact_match, use_regex, explain, whole_word)
+        if positions is None:
+            return pd.DataFrame(), stats
+        
+        try:
+            phase_start = time.perf_counter()
+            if max_results:
+                positions = positions[:max_results]
+            results = self._fetch(db, positions)
+            stats['phases']['materialize'] = time.perf_counter() - phase_start
+        except Exception as e:
+            return pd.DataFrame(), {'error': f'Search failed: {str(e)}'}
+        
+        stats['search_time'] = time.time() - start_time
+        stats['returned_results'] = len(results)
+        self._record('search', stats['search_time'], query=search_term, columns=search_columns,
+                     case_sensitive=case_sensitive, exact_match=exact_match, use_regex=use_regex,
+                     whole_word=whole_word, rows_scanned=stats['rows_scanned'],
+                     total_results=stats['total_results'])
+        return results, stats
+    
+    def search_positions(self,
+                         search_term: str,
+                         search_columns: List[str],
+                         case_sensitive: bool = False,
+                         exact_match: bool = False,
+                         use_regex: bool = False,
+                         df: Optional[pd.DataFrame] = None,
+                         explain: bool = False,
+                         whole_word: bool = False) -> Tuple[Optional[np.ndarray], Dict[str, Any]]:
+        """
+        Find matching row positions with one SQL query per column
+        
+        Takes the same options as search(); df is ignored.
+        
+        Returns:
+            Tuple of (ascending row positions or None on error, search_stats)
+        """
+        return self._search_database(self._db, search_term, search_columns, case_sensitive,
+                                     exact_match, use_regex, explain, whole_word)
+    
+    def _search_database(self, db: Optional[_Database], search_term: str, search_columns: List[str],
+                         case_sensitive: bool, exact_match: bool, use_regex: bool,
+                         explain: bool, whole_word: bool = False) -> Tuple[Optional[np.ndarray], Dict[str, Any]]:
+        """search_positions() against one database"""
+        if db is None:
+            return None, {'error': 'No data loaded'}
+        
+        start_time = time.time()
+        phases = dict.fromkeys(SEARCH_PHASES, 0.0)
+        invalid_columns = [col for col in search_columns if col not in db.columns]
+        if invalid_columns:
+            return None, {'error': f'Invalid columns: {invalid_columns}'}
+        if not search_term.strip():
+            return np.arange(db.rows), {'search_time': 0, 'total_results': db.rows, 'rows_scanned': 0,
+                                        'phases': phases, 'backend': 'sqlite'}
+        
+        processed_term = search_term if case_sensitive else search_term.lower()
+        whole_word = whole_word and not exact_match and not use_regex
+        if use_regex:
+            try:
+                _compile(processed_term)
+            except re.error as e:
+                return None, {'error': f'Invalid regex pattern: {e}'}
+        
+        try:
+            positions = np.empty(0, dtype=np.int64)
+            column_times = {}
+            column_plans = []
+            rows_scanned = 0
+            for column in search_columns:
+                column_start = time.perf_counter()
+                sql, params, strategy = self._column_query(db, column, processed_term, case_sensitive,
+                                                           exact_match, use_regex, whole_word)
+                matches = np.array([row[0] for row in db.query(sql, params)], dtype=np.int64)
+                phases['match'] += time.perf_counter() - column_start
+                
+                phase_start = time.perf_counter()
+                positions = np.union1d(positions, matches)
+                phases['combine'] += time.perf_counter() - phase_start
+                
+                column_times[column] = time.perf_counter() - column_start
+                if strategy != 'fts_trigram':
+                    rows_scanned += db.rows
+                if explain:
+                    column_plans.append({'column': column, 'strategy': strategy, 'sql': sql,
+                                         'matches': len(matches), 'time': column_times[column]})
+        except sqlite3.Error as e:
+            return None, {'error': f'Search failed: {str(e)}'}
+        
+        stats = {
+            'search_time': time.time() - start_time,
+            'total_results': len(positions),
+            'search_term': search_term,
+            'search_columns': search_columns,
+            'case_sensitive': case_sensitive,
+            'exact_match': exact_match,
+            'use_regex': use_regex,
+            'whole_word': whole_word,
+            'rows_scanned': rows_scanned,
+            'phases': phases,
+            'column_times': column_times,
+            'backend': 'sqlite'
+        }
+        if explain:
+            stats['explain'] = {'result_cache': 'none', 'columns': column_plans}
+        return positions, stats
+    
+    @staticmethod
+    def _column_query(db: _Database, column: Any, processed_term: str, case_sensitive: bool,
+                      exact_match: bool, use_regex: bool, whole_word: bool = False) -> Tuple[str, List[Any], str]:
+        """
+        SQL finding one column's matching row ids
+        
+        Returns:
+            Tuple of (sql, parameters, strategy)
+        """
+        field = f"c{db.columns.index(column)}"
+        text = f"search_text({field})" if case_sensitive else f"search_lower({field})"
+        if use_regex:
+            return f"SELECT id FROM data WHERE search_regexp(?, {text}) ORDER BY id", [processed_term], 'regex_scan'
+        
+        if whole_word:
+            # Whole words of the term are substrings of it; the regex keeps the word matches
+            processed_term, _, _, pattern = parse_word_term(processed_term)
+            condition, value, scan = f"search_regexp(?, {text})", pattern, 'word_scan'
+        elif exact_match:
+            condition, value, scan = f"{text} = ?", processed_term, 'sql_scan'
+        else:
+            condition, value, scan = f"instr({text}, ?) > 0", processed_term, 'sql_scan'
+        if len(processed_term) < TRIGRAM_LENGTH:
+            return f"SELECT id FROM data WHERE {condition} ORDER BY id", [value], scan
+        
+        # The trigram index matches substrings ignoring case; the condition keeps the exact matches
+        phrase = '"' + processed_term.replace('"', '""') + '"'
+        return (f"SELECT id FROM data WHERE id IN (SELECT rowid FROM fts WHERE fts MATCH ?) "
+                f"AND {condition} ORDER BY id", [f"{{{field}}} : {phrase}", value], 'fts_trigram')
+    
+    def fetch_rows(self, positions: np.ndarray, columns: Optional[List[str]] = None) -> pd.DataFrame:
+        """
+        Full rows by position, read from the database
+        
+        Args:
+            positions: Row positions
+            columns: Columns to return (default: all)
+        
+        Returns:
+            DataFrame indexed by row position
+        """
+        db = self._db
+        if db is None:
+            raise ValueError("No data loaded")
+        return self._fetch(db, positions, columns)
+    
+    @staticmethod
+    def _fetch(db: _Database, positions: np.ndarray, columns: Optional[List[str]] = None) -> pd.DataFrame:
+        """Rows of a database by position, in the order given"""
+        columns = list(db.columns) if columns is None else list(columns)
+        fields = ', '.join(f"c{db.columns.index(col)}" for col in columns)
+        positions = np.asarray(positions, dtype=np.int64)
+        
+        rows = []
+        for start in range(0, len(positions), FETCH_BATCH_ROWS):
+            batch = positions[start:start + FETCH_BATCH_ROWS].tolist()
+            rows.extend(db.query(f"SELECT id, {fields} FROM data WHERE id IN "
+                                 f"({', '.join('?' * len(batch))}) ORDER BY id", batch))
+        
+        frame = pd.DataFrame([row[1:] for row in rows], columns=columns,
+                             index=pd.Index([row[0] for row in rows], dtype=np.int64))
+        if len(frame) != len(positions) or (len(positions) > 1 and (np.diff(positions) < 0).any()):
+            frame = frame.reindex(positions)
+        return frame
+    
+    def export_rows(self, positions: np.ndarray, output_path: str,
+                    columns: Optional[List[str]] = None,
+                    progress_callback: Optional[Callable[[Dict[str, Any]], None]] = None,
+                    cancel_event: Optional[threading.Event] = None) -> Tuple[bool, str]:
+        """Export rows by position, reading them from the database a chunk at a time"""
+        db = self._db
+        if db is None:
+            return False, "No data loaded"
+        if len(positions) == 0:
+            return False, "No results to export"
+        
+        try:
+            start_time = time.time()
+            columns = columns or list(db.columns)
+            success, message = export_dataframe(self.df, output_path, positions=positions, columns=columns,
+                                                progress_callback=progress_callback,
+                                                cancel_event=cancel_event,
+                                                fetch_rows=lambda chunk: self._fetch(db, chunk, columns))
+            if success:
+                self._record('export', time.time() - start_time, rows=len(positions))
+            return success, message
+        except Exception as e:
+            return False, f"Export failed: {str(e)}"
+    
+    def build_indexes(self, columns: Optional[List[str]] = None,
+                      case_modes: Tuple[bool, ...] = (False, True),
+                      tokens: bool = False) -> Dict[str, Any]:
+        """Nothing to build: the FTS5 table indexes every column when the file is loaded"""
+        if self._db is None:
+            return {'error': 'No data loaded'}
+        return {'indexes_built': 0, 'build_time': 0.0}
+    
+    def get_column_info(self) -> List[Dict[str, Any]]:
+        """
+        Get information about all columns, counted in the database
+        
+        Returns:
+            List of dictionaries with column information
+        """
+        db = self._db
+        if db is None:
+            return []
+        
+        column_info = []
+        for i, col in enumerate(db.columns):
+            non_null, unique = db.query(f"SELECT COUNT(c{i}), COUNT(DISTINCT c{i}) FROM data")[0]
+            samples = db.query(f"SELECT c{i} FROM data WHERE c{i} IS NOT NULL ORDER BY id LIMIT 3")
+            column_info.append({
+                'name': col,
+                'dtype': str(self.df[col].dtype),
+                'non_null_count': non_null,
+                'null_count': db.rows - non_null,
+                'unique_values': unique,
+                'sample_values': [str(value) for (value,) in samples]
+            })
+        return column_info
+    
+    def compact(self) -> Dict[str, Any]:
+        """Not applicable: the data is stored in SQLite"""
+        return {'error': 'The SQLite backend keeps its data on disk; there is nothing to compact'}
+    
+    def spill_to_disk(self) -> bool:
+        """The data is on disk already; only the preview rows are in memory"""
+        return False
+    
+    def reset(self):
+        """Reset the search engine state and drop the database (temporary ones are deleted)"""
+        super().reset()
+        with self._cache_lock:
+            self._db = None
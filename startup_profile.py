@@ -0,0 +1,77 @@
+"""
+Import-time profiling and startup budgets
+Runs a command under ``python -X importtime`` and summarizes where startup goes
+"""
+
+import subprocess
+import sys
+from typing import List, Tuple
+
+# Libraries the fast startup paths (--help, --version, daemon client) must not load
+HEAVY_MODULES = ('pandas', 'numpy', 'openpyxl', 'xlsxwriter', 'pyarrow', 'tkinter')
+
+# Wall-clock budget in seconds per fast startup path, checked by benchmarks/bench_startup.py.
+# Importing pandas alone takes ~0.4 s, so any path that pulls it in blows the budget.
+STARTUP_BUDGETS = {
+    'main --help': 0.25,
+    'main --version': 0.25,
+    'cli --help': 0.25,
+    'cli --version': 0.25,
+    'cli --daemon search': 0.25
+}
+
+
+def parse_importtime(output: str) -> Tuple[List[Tuple[str, int, int]], List[str]]:
+    """
+    Split ``-X importtime`` stderr into timing entries and everything else
+    
+    Args:
+        output: Captured stderr of a ``python -X importtime`` run
+    
+    Returns:
+        Tuple of ([(module, self_us, cumulative_us)], other_lines)
+    """
+    entries = []
+    other_lines = []
+    for line in output.splitlines():
+        if not line.startswith('import time:'):
+            other_lines.append(line)
+            continue
+        fields = line[len('import time:'):].split('|')
+        if len(fields) != 3 or not fields[0].strip().isdigit():
+            continue  # Column header line
+        entries.append((fields[2].strip(), int(fields[0]), int(fields[1])))
+    return entries, other_lines
+
+
+def profile_imports(script: str, argv: List[str], top: int = 20) -> int:
+    """
+    Run a script under ``-X importtime`` and print the slowest imports to stderr
+    
+    The command's own output is passed through unchanged.
+    
+    Args:
+        script: Path of the Python script to run
+        argv: Arguments for the script
+        top: Number of modules to list
+    
+    Returns:
+        Exit code of the profiled command
+    """
+    process = subprocess.run([sys.executable, '-X', 'importtime', script] + argv,
+                             stderr=subprocess.PIPE, text=True)
+    entries, other_lines = parse_importtime(process.stderr)
+    for line in other_lines:
+        print(line, file=sys.stderr)
+    
+    total_us = sum(self_us for _, self_us, _ in entries)
+    heavy = [name for name, _, _ in entries if name in HEAVY_MODULES]
+    
+    print(f"\n⏱️ IMPORT PROFILE: {len(entries)} modules, {total_us / 1000:.1f} ms total", file=sys.stderr)
+    print("-" * 60, file=sys.stderr)
+    print(f"{'cumulative ms':>13} {'self ms':>9}  module", file=sys.stderr)
+    for name, self_us, cumulative_us in sorted(entries, key=lambda e: e[2], reverse=True)[:top]:
+        print(f"{cumulative_us / 1000:>13.1f} {self_us / 1000:>9.1f}  {name}", file=sys.stderr)
+    print(f"\nHeavy libraries loaded: {', '.join(heavy) if heavy else 'none'}", file=sys.stderr)
+    
+    return process.returncode
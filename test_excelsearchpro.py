@@ -5,8 +5,34 @@ Test suite for ExcelSearchPro
 import unittest
 import os
 import tempfile
+import shutil
+import socket
+import subprocess
+import sys
+import threading
+import time
+import json
+import argparse
+import importlib.util
+import urllib.error
+import urllib.parse
+import urllib.request
+import numpy as np
 import pandas as pd
+import utils
+import startup_profile
+import exporters
+import instrumentation
+import memory_budget
+import search_engine
 from search_engine import ExcelSearchEngine
+from excel_search_cli import ExcelSearchCLI
+from search_daemon import SearchDaemon, daemon_request
+from search_server import SearchAPIServer
+from workbook_search import WorkbookSearch
+from folder_catalog import FolderCatalog
+from search_index import StringTable
+from sqlite_backend import SQLiteSearchEngine, fts5_available
 
 
 class TestExcelSearchEngine(unittest.TestCase):
@@ -130,6 +156,8 @@ class TestExcelSearchEngine(unittest.TestCase):
         self.assertEqual(info['columns'], 4)
         self.assertIn('file_size_mb', info)
         self.assertIn('load_time', info)
+        self.assertNotIn('memory', info)
+        self.assertIn('total_bytes', self.engine.get_file_info(include_memory=True)['memory'])
     
     def test_get_column_info(self):
         """Test column info functionality"""
@@ -145,6 +173,1623 @@ class TestExcelSearchEngine(unittest.TestCase):
         self.assertIn('dtype', first_col)
 
 
+class TestSearchCaches(unittest.TestCase):
+    """Test cases for normalized caches, indexes and the result cache"""
+    
+    def setUp(self):
+        """Set up an engine with data loaded directly"""
+        self.engine = ExcelSearchEngine()
+        self.engine.df = pd.DataFrame({
+            'Name': ['Alice', 'bob', 'ALICE', None, 'Carol', 'alice'],
+            'City': ['Paris', 'Rome', 'Oslo', 'Paris', 'Rome', 'Lima']
+        })
+    
+    def test_indexed_exact_match_equals_scan(self):
+        """Test exact matches through an index return the same rows as a scan"""
+        for case_sensitive in (False, True):
+            scanned, _ = self.engine.search("alice", ["Name", "City"], case_sensitive=case_sensitive,
+                                            exact_match=True)
+            self.engine.build_indexes()
+            indexed, _ = self.engine.search("alice", ["Name", "City"], case_sensitive=case_sensitive,
+                                            exact_match=True)
+            pd.testing.assert_frame_equal(scanned, indexed)
+            self.engine.reset()
+            self.setUp()
+    
+    def test_result_cache_is_per_dataframe(self):
+        """Test cached results are not reused after the data changes"""
+        results, _ = self.engine.search("Paris", ["City"])
+        self.assertEqual(len(results), 2)
+        
+        self.engine.df = self.engine.df.head(2)
+        results, _ = self.engine.search("Paris", ["City"])
+        self.assertEqual(len(results), 1)
+    
+    def test_max_results_keeps_total(self):
+        """Test max_results limits returned rows but not the total count"""
+        results, stats = self.engine.search("r", ["City"], max_results=1)
+        self.assertEqual(len(results), 1)
+        self.assertEqual(stats['total_results'], 4)
+    
+    def test_explain_reports_phases_and_strategies(self):
+        """Test stats break search time down by phase and column, and explain names the strategy"""
+        _, stats = self.engine.search("alice", ["Name", "City"], explain=True)
+        self.assertEqual(list(stats['phases']), list(search_engine.SEARCH_PHASES))
+        self.assertEqual(set(stats['column_times']), {'Name', 'City'})
+        plans = {plan['column']: plan for plan in stats['explain']['columns']}
+        self.assertEqual(plans['Name']['strategy'], 'substring_scan')
+        self.assertEqual(plans['Name']['matches'], 3)
+        self.assertEqual(plans['Name']['normalized_cache'], 'built')
+        
+        self.engine.build_indexes()
+        _, stats = self.engine.search("alice", ["Name"], exact_match=True, explain=True)
+        self.assertEqual(stats['explain']['columns'][0]['strategy'], 'value_index')
+        _, stats = self.engine.search("alice", ["Name"], exact_match=True, explain=True)
+        self.assertEqual(stats['explain']['result_cache'], 'hit')
+        self.assertIn("Served from the result cache", utils.format_search_breakdown(stats))
+
+
+class TestWordSearch(unittest.TestCase):
+    """Test cases for whole-word and prefix searches through the word index"""
+    
+    def setUp(self):
+        """Write a CSV file of names and load it"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.csv_path = os.path.join(self.temp_dir, 'people.csv')
+        pd.DataFrame({
+            'Name': ['John Smith', 'Johnson', 'jane smithers', "Ann O'Brien", None, 'Smith, John', 'Zoë Müller'],
+            'Code': [10, 101, 7, 10, 3, 100, 12]
+        }).to_csv(self.csv_path, index=False)
+        self.engine = ExcelSearchEngine()
+        self.engine.load_file(self.csv_path)
+    
+    def tearDown(self):
+        """Clean up test fixtures"""
+        shutil.rmtree(self.temp_dir)
+    
+    def test_whole_words_and_prefixes_use_the_word_index(self):
+        """Test whole-word terms skip longer words, * matches prefixes, and no column is scanned"""
+        cases = [
+            ("john", False, [0, 5]), ("John", True, [0, 5]), ("smi*", False, [0, 2, 5]),
+            ("john smith", False, [0]), ("smith, john", False, [5]), ("o'brien", False, [3]),
+            ("müller", False, [6]), ("10", False, [0, 3]), ("10*", False, [0, 1, 3, 5]), ("joh", False, [])
+        ]
+        for term, case_sensitive, expected in cases:
+            with self.subTest(term=term):
+                results, stats = self.engine.search(term, ["Name", "Code"], case_sensitive,
+                                                    whole_word=True, explain=True)
+                self.assertEqual(list(results.index), expected)
+                self.assertEqual(stats['rows_scanned'], 0)
+                self.assertEqual({plan['strategy'] for plan in stats['explain']['columns']}, {'token_index'})
+        
+        # The same matches as a regular expression with word boundaries
+        regex, _ = self.engine.search(r"(?<!\w)smi", ["Name"], use_regex=True)
+        prefix, _ = self.engine.search("smi*", ["Name"], whole_word=True)
+        pd.testing.assert_frame_equal(prefix, regex)
+        self.assertIn("words", "\n".join(utils.format_search_breakdown(stats)))
+    
+    def test_word_indexes_are_extended_and_persisted(self):
+        """Test appended rows extend the word index and saved word indexes are mapped back"""
+        self.assertEqual(self.engine.build_indexes(["Name"], (False,), tokens=True)['indexes_built'], 2)
+        with open(self.csv_path, 'a', encoding='utf-8') as f:
+            f.write("Johnny Smith,8\n")
+        self.assertIn("Appended 1 rows", self.engine.refresh()[1])
+        tokens = self.engine._get_cache(self.engine.df)['tokens'][('Name', False)]
+        self.assertEqual(tokens.rows, 8)
+        self.assertEqual(list(self.engine.search("john*", ["Name"], whole_word=True)[0].index), [0, 1, 5, 7])
+        
+        self.assertTrue(self.engine.save_indexes()[0])
+        restarted = ExcelSearchEngine()
+        restarted.load_file(self.csv_path)
+        self.assertIn("Loaded 2 indexes", restarted.load_indexes()[1])
+        self.assertIsInstance(restarted._get_cache(restarted.df)['tokens'][('Name', False)].keys, StringTable)
+        for term in ("smith", "john*", "jane smithers"):
+            expected, _ = self.engine.search(term, ["Name"], whole_word=True)
+            results, stats = restarted.search(term, ["Name"], whole_word=True)
+            pd.testing.assert_frame_equal(results, expected)
+            self.assertEqual(stats['rows_scanned'], 0)
+
+
+class TestRefresh(unittest.TestCase):
+    """Test cases for incremental refresh of appended CSV rows"""
+    
+    def setUp(self):
+        """Load a CSV file with indexes built"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.csv_path = os.path.join(self.temp_dir, 'log.csv')
+        pd.DataFrame({'Name': [f"name {i}" for i in range(100)], 'Code': range(100)}).to_csv(
+            self.csv_path, index=False)
+        self.engine = ExcelSearchEngine()
+        self.engine.load_file(self.csv_path)
+        self.engine.build_indexes()
+    
+    def tearDown(self):
+        """Clean up test fixtures"""
+        shutil.rmtree(self.temp_dir)
+    
+    def test_appended_rows_extend_caches_and_indexes(self):
+        """Test appended rows are parsed alone and indexes are extended, not rebuilt"""
+        self.assertEqual(self.engine.refresh(), (True, "File unchanged"))
+        with open(self.csv_path, 'a', encoding='utf-8') as f:
+            f.write("name 7,500\nnew row,501\n")
+        
+        success, message = self.engine.refresh()
+        self.assertTrue(success, message)
+        self.assertIn("Appended 2 rows", message)
+        cache = self.engine._get_cache(self.engine.df)
+        self.assertEqual(cache['indexes'][('Name', False)].rows, 102)
+        
+        reloaded = ExcelSearchEngine()
+        reloaded.load_file(self.csv_path)
+        for term, exact in (("name 7", True), ("row", False), ("50", False)):
+            for column in ("Name", "Code"):
+                expected, _ = reloaded.search(term, [column], exact_match=exact)
+                results, _ = self.engine.search(term, [column], exact_match=exact)
+                pd.testing.assert_frame_equal(results, expected)
+    
+    def test_edited_file_is_reloaded(self):
+        """Test a change to earlier rows falls back to a full reload"""
+        with open(self.csv_path, 'r+', encoding='utf-8') as f:
+            f.seek(len("Name,Code\n"))
+            f.write("NAME")
+        
+        success, message = self.engine.refresh()
+        self.assertTrue(success, message)
+        self.assertIn("Successfully loaded", message)
+        self.assertEqual(self.engine.df['Name'].iloc[0], "NAME 0")
+    
+    def test_appended_rows_keep_column_types(self):
+        """Test appended values are typed like the loaded column, not inferred on their own"""
+        with open(self.csv_path, 'w', encoding='utf-8') as f:
+            f.write("Name,Code\nab1,1\n00123,2\n")
+        self.engine.load_file(self.csv_path)
+        with open(self.csv_path, 'a', encoding='utf-8') as f:
+            f.write("00124,3\n")
+        
+        success, message = self.engine.refresh()
+        self.assertTrue(success, message)
+        self.assertIn("Appended 1 rows", message)
+        results, stats = self.engine.search("00124", ["Name"])
+        self.assertEqual(stats['total_results'], 1)
+        self.assertEqual(results['Name'].iloc[0], "00124")
+        
+        # Text in a number column changes its type: reload in full
+        with open(self.csv_path, 'a', encoding='utf-8') as f:
+            f.write("x,abc\n")
+        success, message = self.engine.refresh()
+        self.assertIn("Successfully loaded", message)
+        self.assertEqual(list(self.engine.df['Code']), ['1', '2', '3', 'abc'])
+
+
+
+class TestWatch(unittest.TestCase):
+    """Test cases for watch mode and atomic reloads"""
+    
+    def setUp(self):
+        """Load a CSV file with an index built"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.csv_path = os.path.join(self.temp_dir, 'stock.csv')
+        pd.DataFrame({'Item': ['bolt', 'nut'], 'Qty': [1, 2]}).to_csv(self.csv_path, index=False)
+        self.engine = ExcelSearchEngine()
+        self.engine.load_file(self.csv_path)
+        self.engine.build_indexes(['Item'], (False,))
+    
+    def tearDown(self):
+        """Clean up test fixtures"""
+        self.engine.reset()
+        shutil.rmtree(self.temp_dir)
+    
+    def replace_file(self, items):
+        """Save a new version the way editors do: write a temporary file and rename it"""
+        temp_path = self.csv_path + '.tmp'
+        pd.DataFrame({'Item': items, 'Qty': range(len(items))}).to_csv(temp_path, index=False)
+        os.replace(temp_path, self.csv_path)
+    
+    def test_watch_reloads_changed_file(self):
+        """Test each watcher backend reloads a replaced file with its indexes"""
+        for use_inotify in (True, False):
+            with self.subTest(use_inotify=use_inotify):
+                reloaded = threading.Event()
+                outcomes = []
+                
+                def callback(success, message):
+                    outcomes.append((success, message))
+                    reloaded.set()
+                
+                success, message = self.engine.watch(callback, interval=0.05, use_inotify=use_inotify)
+                self.assertTrue(success, message)
+                if not use_inotify or not sys.platform.startswith('linux'):
+                    self.assertIn("(polling)", message)
+                self.engine._watch['watcher'].settle = 0.05
+                
+                items = ['washer', 'screw', f'pin {use_inotify}']
+                self.replace_file(items)
+                self.assertTrue(reloaded.wait(10), "change not noticed")
+                self.engine.stop_watching()
+                
+                self.assertTrue(outcomes[0][0], outcomes[0][1])
+                self.assertEqual(self.engine.df['Item'].tolist(), items)
+                self.assertIn(('Item', False), self.engine._get_cache(self.engine.df)['indexes'])
+        self.assertFalse(self.engine.watching)
+    
+    def test_searches_on_replaced_frame_keep_new_caches(self):
+        """Test a search still running on the old data neither fails nor evicts the new indexes"""
+        old_df = self.engine.df
+        self.replace_file(['washer'])
+        success, message = self.engine.refresh()
+        self.assertTrue(success, message)
+        
+        self.assertEqual(old_df['Item'].tolist(), ['bolt', 'nut'])
+        stale = self.engine._get_cache(old_df)
+        self.assertEqual(stale['indexes'], {})
+        self.assertIs(self.engine._cache['df'], self.engine.df)
+        self.assertIn(('Item', False), self.engine._cache['indexes'])
+        
+        results, stats = self.engine.search("washer", ["Item"], exact_match=True)
+        self.assertEqual(stats['total_results'], 1)
+
+
+class TestPersistentIndexes(unittest.TestCase):
+    """Test cases for sidecar index files"""
+    
+    def setUp(self):
+        """Load a CSV file and index it"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.csv_path = os.path.join(self.temp_dir, 'people.csv')
+        pd.DataFrame({
+            'Name': ['Zoë', 'ann', 'Ann', 'bob', 'ann'],
+            'Code': [5, 3, 3, 1, 2]
+        }).to_csv(self.csv_path, index=False)
+        self.engine = ExcelSearchEngine()
+        self.engine.load_file(self.csv_path)
+        self.engine.build_indexes()
+    
+    def tearDown(self):
+        """Clean up test fixtures"""
+        shutil.rmtree(self.temp_dir)
+    
+    def test_saved_indexes_are_mapped_by_a_new_engine(self):
+        """Test indexes are saved next to the file and serve lookups after a restart"""
+        success, message = self.engine.save_indexes()
+        self.assertTrue(success, message)
+        self.assertTrue(os.path.exists(self.csv_path + '.esidx'))
+        
+        restarted = ExcelSearchEngine()
+        restarted.load_file(self.csv_path)
+        success, message = restarted.load_indexes()
+        self.assertTrue(success, message)
+        self.assertIn("Loaded 4 indexes", message)
+        self.assertEqual(restarted.build_indexes()['indexes_built'], 0)
+        
+        index = restarted._get_cache(restarted.df)['indexes'][('Name', False)]
+        self.assertIsInstance(index.keys, StringTable)
+        for term, column, case_sensitive in (("ann", "Name", False), ("Ann", "Name", True),
+                                             ("zoë", "Name", False), ("3", "Code", False),
+                                             ("missing", "Name", False)):
+            expected, _ = self.engine.search(term, [column], case_sensitive, exact_match=True)
+            results, _ = restarted.search(term, [column], case_sensitive, exact_match=True)
+            pd.testing.assert_frame_equal(results, expected)
+    
+    def test_stale_or_foreign_index_files_are_ignored(self):
+        """Test a changed data file or another format version is not used"""
+        self.engine.save_indexes()
+        with open(self.csv_path, 'a', encoding='utf-8') as f:
+            f.write("eve,9\n")
+        reloaded = ExcelSearchEngine()
+        reloaded.load_file(self.csv_path)
+        success, message = reloaded.load_indexes()
+        self.assertFalse(success)
+        self.assertIn("No up-to-date indexes", message)
+        
+        reloaded.build_indexes()
+        reloaded.save_indexes()
+        with open(self.csv_path + '.esidx', 'r+b') as f:
+            f.seek(8)
+            f.write((99).to_bytes(4, 'little'))
+        self.assertFalse(reloaded.load_indexes()[0])
+
+@unittest.skipUnless(fts5_available(), "SQLite has no FTS5 trigram tokenizer")
+class TestSQLiteBackend(unittest.TestCase):
+    """Test cases for the SQLite search backend"""
+    
+    def setUp(self):
+        """Write a CSV file and load it into both backends"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.csv_path = os.path.join(self.temp_dir, 'people.csv')
+        pd.DataFrame({
+            'Name': ['John Smith', 'Zoë Adams', 'ann "Annie" Lee', 'Bob', None, 'johnson'],
+            'City': ['New York', 'Zürich', 'Boston', 'new york', 'Oslo', 'Paris'],
+            'Age': [30, 25, 41, 30, 52, 19]
+        }).to_csv(self.csv_path, index=False)
+        self.memory = ExcelSearchEngine()
+        self.memory.load_file(self.csv_path)
+        self.db_path = os.path.join(self.temp_dir, 'people.sqlite')
+        self.engine = SQLiteSearchEngine(self.db_path, chunk_rows=2)
+    
+    def tearDown(self):
+        """Clean up test fixtures"""
+        self.engine.reset()
+        shutil.rmtree(self.temp_dir)
+    
+    def test_results_match_in_memory_engine(self):
+        """Test every search mode returns the same rows as the in-memory engine"""
+        success, message = self.engine.load_file(self.csv_path)
+        self.assertTrue(success, message)
+        self.assertEqual(self.engine.get_file_info()['rows'], 6)
+        
+        queries = [
+            ("john", {}), ("JOHN", {'case_sensitive': True}), ("zür", {}), ('"Annie"', {}),
+            ("ne", {}), ("30", {}), ("new york", {'exact_match': True}),
+            ("^[jb]o", {'use_regex': True}), ("nothing here", {}), ("o", {'search_columns': ['City']}),
+            ("john", {'whole_word': True}), ("smi*", {'whole_word': True}), ("new york", {'whole_word': True})
+        ]
+        for term, options in queries:
+            with self.subTest(term=term, **options):
+                options.setdefault('search_columns', ['Name', 'City', 'Age'])
+                expected, expected_stats = self.memory.search(term, **options)
+                results, stats = self.engine.search(term, **options)
+                self.assertNotIn('error', stats)
+                self.assertEqual(stats['backend'], 'sqlite')
+                self.assertEqual(stats['total_results'], expected_stats['total_results'])
+                self.assertEqual(list(results.index), list(expected.index))
+                self.assertEqual(results['Name'].fillna('').astype(str).tolist(),
+                                 expected['Name'].fillna('').astype(str).tolist())
+    
+    def test_database_is_reused_until_the_file_changes(self):
+        """Test an unchanged file reopens its database and a changed one is imported again"""
+        self.engine.load_file(self.csv_path)
+        reopened = SQLiteSearchEngine(self.db_path)
+        success, message = reopened.load_file(self.csv_path)
+        self.assertTrue(success, message)
+        self.assertTrue(message.startswith("Opened 6 rows"))
+        self.assertEqual(reopened.search("smith", ['Name'])[1]['total_results'], 1)
+        
+        time.sleep(0.01)
+        with open(self.csv_path, 'a', encoding='utf-8') as f:
+            f.write("Jane Smith,Rome,33\n")
+        success, message = reopened.refresh()
+        self.assertTrue(success, message)
+        self.assertEqual(reopened.get_file_info()['rows'], 7)
+        self.assertEqual(reopened.search("smith", ['Name'])[1]['total_results'], 2)
+        # The first engine still answers from the database it opened
+        self.assertEqual(self.engine.search("smith", ['Name'])[1]['total_results'], 1)
+        reopened.reset()
+    
+    def test_column_info_and_export_read_the_database(self):
+        """Test column statistics and exports come from all rows, not the preview"""
+        engine = SQLiteSearchEngine(preview_rows=2)
+        engine.load_file(self.csv_path)
+        self.assertEqual(len(engine.df), 2)
+        
+        info = {col['name']: col for col in engine.get_column_info()}
+        self.assertEqual(info['Name']['null_count'], 1)
+        self.assertEqual(info['City']['unique_values'], 6)
+        
+        positions, _ = engine.search_positions("o", ['Name'])
+        output_path = os.path.join(self.temp_dir, 'matches.csv')
+        success, message = engine.export_rows(positions, output_path)
+        self.assertTrue(success, message)
+        exported = pd.read_csv(output_path)
+        self.assertEqual(exported['Name'].tolist(), ['John Smith', 'Zoë Adams', 'Bob', 'johnson'])
+        
+        database = engine._db.path
+        engine.reset()
+        self.assertFalse(os.path.exists(database))
+
+
+class TestMemoryBudget(unittest.TestCase):
+    """Test cases for memory accounting and the memory budget"""
+    
+    def setUp(self):
+        """Set up an engine with its own budget so other tests are unaffected"""
+        self.engine = ExcelSearchEngine()
+        self.engine.df = pd.DataFrame({
+            'Name': [f"name {i}" for i in range(5000)],
+            'City': ['Paris', 'Rome'] * 2500
+        })
+        self.budget = memory_budget.MemoryBudget()
+        self.budget.register(self.engine)
+        self.engine.memory_budget = self.budget
+    
+    def test_usage_measured_while_indexes_are_built(self):
+        """Test measuring memory while another thread fills the caches does not fail"""
+        self.engine.df = pd.DataFrame({f"Col{i}": [f"v{row}" for row in range(50)] for i in range(300)})
+        errors = []
+        done = threading.Event()
+        
+        def measure():
+            while not done.is_set():
+                try:
+                    self.engine.get_memory_usage()
+                    self.engine._cache_entries()
+                except RuntimeError as e:
+                    errors.append(e)
+        
+        thread = threading.Thread(target=measure)
+        thread.start()
+        try:
+            self.engine.build_indexes()
+        finally:
+            done.set()
+            thread.join()
+        self.assertEqual(errors, [])
+    
+    def test_usage_counts_caches_and_indexes(self):
+        """Test normalized columns, indexes and results are measured"""
+        before = self.engine.get_memory_usage()
+        self.engine.search("name 1", ["Name"])
+        self.engine.build_indexes(["City"])
+        usage = self.engine.get_memory_usage()
+        
+        self.assertGreater(before['data_bytes'], 0)
+        self.assertGreater(usage['normalized_bytes'], 0)
+        self.assertGreater(usage['indexes_bytes'], 0)
+        self.assertGreater(usage['results_bytes'], 0)
+        self.assertEqual(usage['total_bytes'], sum(usage[key] for key in (
+            'data_bytes', 'original_bytes', 'normalized_bytes', 'indexes_bytes', 'results_bytes')))
+    
+    def test_budget_evicts_least_recently_used_first(self):
+        """Test eviction drops the oldest cache entries and keeps searches correct"""
+        self.engine.search("name", ["Name"])
+        self.engine.search("paris", ["City"])
+        usage = self.engine.get_memory_usage()
+        
+        self.budget.set_limit((usage['total_bytes'] - 1) / (1024 * 1024))
+        self.budget.enforce()
+        cache = self.engine._get_cache(self.engine.df)
+        self.assertNotIn(('Name', False), cache['normalized'])
+        self.assertIn(('City', False), cache['normalized'])
+        self.assertLessEqual(self.engine.get_memory_usage()['total_bytes'], self.budget.limit_bytes)
+        
+        _, stats = self.engine.search("name 4999", ["Name"], exact_match=True)
+        self.assertEqual(stats['total_results'], 1)
+    
+    @unittest.skipUnless(importlib.util.find_spec('pyarrow'), "pyarrow not installed")
+    def test_disk_backed_mode_when_caches_are_not_enough(self):
+        """Test the data moves to a memory-mapped file and stays searchable"""
+        self.budget.set_limit(0)
+        self.budget.enforce()
+        
+        self.assertTrue(self.engine.disk_backed)
+        self.assertEqual(self.engine.get_memory_usage()['total_bytes'], 0)
+        results, _ = self.engine.search("name 42", ["Name"], exact_match=True)
+        self.assertEqual(results['Name'].tolist(), ["name 42"])
+
+
+class TestCompaction(unittest.TestCase):
+    """Test cases for dtype compaction"""
+    
+    def setUp(self):
+        """Create a CSV file with numeric, repetitive and unique columns"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.df = pd.DataFrame({
+            'ID': range(1000),
+            'Amount': [i * 0.25 for i in range(1000)],
+            'Price': [i / 3 for i in range(1000)],
+            'City': pd.Series(['Paris', 'Rome', None, 'Oslo'] * 250, dtype=object),
+            'Email': pd.Series([f"user{i}@example.com" for i in range(1000)], dtype=object),
+            'Mixed': pd.Series([1, 'one'] * 500, dtype=object)
+        })
+        self.csv_path = os.path.join(self.temp_dir, 'data.csv')
+        self.df.to_csv(self.csv_path, index=False)
+    
+    def tearDown(self):
+        """Clean up test fixtures"""
+        shutil.rmtree(self.temp_dir)
+    
+    def test_compaction_keeps_search_text(self):
+        """Test every column searches the same text after compaction"""
+        compacted, report = utils.compact_dataframe(self.df)
+        
+        self.assertLess(report['after_bytes'], report['before_bytes'])
+        self.assertEqual(str(compacted['ID'].dtype), 'uint16')
+        self.assertEqual(str(compacted['Amount'].dtype), 'float32')
+        self.assertEqual(str(compacted['Price'].dtype), 'float64')
+        self.assertIsInstance(compacted['City'].dtype, pd.CategoricalDtype)
+        self.assertEqual(compacted['Mixed'].dtype, object)
+        self.assertNotIn('Mixed', report['columns'])
+        for column in self.df.columns:
+            self.assertTrue(compacted[column].astype(str).fillna("").equals(
+                self.df[column].astype(str).fillna("")), column)
+    
+    def test_compact_load_searches_the_same(self):
+        """Test a compacted load finds the same rows and reports its savings"""
+        plain = ExcelSearchEngine()
+        compact = ExcelSearchEngine()
+        plain.load_file(self.csv_path)
+        success, message = compact.load_file(self.csv_path, compact=True)
+        self.assertTrue(success, message)
+        self.assertIn("compacted", message)
+        
+        info = compact.get_file_info(include_memory=True)
+        self.assertLess(info['compaction']['after_bytes'], info['compaction']['before_bytes'])
+        self.assertLess(info['memory']['data_bytes'], plain.get_file_info(include_memory=True)['memory']['data_bytes'])
+        for term, columns, exact in (("paris", ["City"], False), ("7", ["ID", "Amount"], False),
+                                     ("user5@example.com", ["Email"], True)):
+            expected, _ = plain.search(term, columns, exact_match=exact)
+            results, _ = compact.search(term, columns, exact_match=exact)
+            self.assertEqual(results.index.tolist(), expected.index.tolist())
+    
+    def test_compact_after_load(self):
+        """Test compacting loaded data drops caches built from the old dtypes"""
+        engine = ExcelSearchEngine()
+        engine.load_file(self.csv_path)
+        engine.search("rome", ["City"])
+        
+        report = engine.compact()
+        self.assertIn('City', report['columns'])
+        self.assertIsNone(engine._cache)
+        self.assertEqual(engine.compact()['before_bytes'], report['before_bytes'])
+        _, stats = engine.search("rome", ["City"])
+        self.assertEqual(stats['total_results'], 250)
+
+
+class TestInstrumentation(unittest.TestCase):
+    """Test cases for latency histograms and the slow-query log"""
+    
+    def setUp(self):
+        """Set up a temporary directory for logs and data"""
+        self.temp_dir = tempfile.mkdtemp()
+    
+    def tearDown(self):
+        """Clean up test fixtures"""
+        shutil.rmtree(self.temp_dir)
+    
+    def test_histogram_percentiles(self):
+        """Test histogram percentiles stay within the bucket precision"""
+        histogram = instrumentation.LatencyHistogram()
+        for ms in range(1, 1001):
+            histogram.record(ms / 1000)
+        
+        self.assertEqual(histogram.summary()['count'], 1000)
+        self.assertAlmostEqual(histogram.percentile(50), 0.5, delta=0.5 / 64)
+        self.assertAlmostEqual(histogram.percentile(99), 0.99, delta=0.99 / 64)
+        self.assertEqual(histogram.percentile(100), 1.0)
+    
+    def test_slow_queries_are_logged(self):
+        """Test searches over the threshold are logged and every operation is counted"""
+        csv_path = os.path.join(self.temp_dir, 'data.csv')
+        pd.DataFrame({'Name': ['Alice', 'Bob'], 'City': ['Paris', 'Rome']}).to_csv(csv_path, index=False)
+        log_path = os.path.join(self.temp_dir, 'slow.log')
+        
+        engine = ExcelSearchEngine()
+        engine.enable_instrumentation(slow_query_threshold=0, slow_query_log=log_path)
+        engine.load_file(csv_path)
+        engine.search("alice", ["Name", "City"])
+        engine.disable_instrumentation()
+        
+        with open(log_path, encoding='utf-8') as f:
+            entries = [json.loads(line) for line in f]
+        self.assertEqual(len(entries), 1)
+        self.assertEqual(entries[0]['query'], "alice")
+        self.assertEqual(entries[0]['columns'], ["Name", "City"])
+        self.assertEqual(entries[0]['rows_scanned'], 4)
+        
+        engine.enable_instrumentation(slow_query_threshold=None)
+        engine.search("bob", ["Name"])
+        latency = engine.get_instrumentation_stats()['latency']
+        self.assertEqual((latency['load']['count'], latency['search']['count']), (0, 1))
+
+
+class TestSearchDaemon(unittest.TestCase):
+    """Test cases for the query daemon"""
+    
+    def setUp(self):
+        """Set up a CSV file and a daemon"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.csv_path = os.path.join(self.temp_dir, 'data.csv')
+        pd.DataFrame({
+            'Name': ['Alice Smith', 'Bob Johnson', 'Carol Smith'],
+            'City': ['Paris', 'Rome', 'Oslo']
+        }).to_csv(self.csv_path, index=False)
+        self.socket_path = os.path.join(self.temp_dir, 'daemon.sock')
+        self.daemon = SearchDaemon(self.socket_path)
+    
+    def tearDown(self):
+        """Clean up test fixtures"""
+        shutil.rmtree(self.temp_dir)
+    
+    def test_search_request(self):
+        """Test a search request loads the file once and returns rows"""
+        request = {'op': 'search', 'file': self.csv_path, 'term': 'smith', 'columns': ['Name']}
+        response = self.daemon.handle_request(request)
+        
+        self.assertTrue(response['ok'])
+        self.assertEqual(response['stats']['total_results'], 2)
+        self.assertEqual(response['columns'], ['Name', 'City'])
+        self.assertEqual(response['rows'][0], ['Alice Smith', 'Paris'])
+        
+        engine = self.daemon.engines[os.path.abspath(self.csv_path)]
+        self.daemon.handle_request(request)
+        self.assertIs(self.daemon.engines[os.path.abspath(self.csv_path)], engine)
+    
+    def test_word_indexes_built_for_searched_columns(self):
+        """Test loading builds no word indexes and a whole-word search builds and saves its column's"""
+        self.daemon.persist_indexes = True
+        request = {'op': 'search', 'file': self.csv_path, 'term': 'smith', 'columns': ['Name']}
+        self.daemon.handle_request(request)
+        engine = self.daemon.engines[os.path.abspath(self.csv_path)]
+        self.assertEqual(engine._get_cache(engine.df)['tokens'], {})
+        
+        response = self.daemon.handle_request({**request, 'whole_word': True})
+        self.assertEqual(response['stats']['total_results'], 2)
+        self.assertEqual(list(engine._get_cache(engine.df)['tokens']), [('Name', False)])
+        
+        restarted = ExcelSearchEngine()
+        restarted.load_file(self.csv_path)
+        restarted.load_indexes()
+        self.assertEqual(list(restarted._get_cache(restarted.df)['tokens']), [('Name', False)])
+    
+    def test_bad_request(self):
+        """Test errors are reported in the response"""
+        self.assertFalse(self.daemon.handle_request({'op': 'search', 'file': self.csv_path})['ok'])
+        self.assertFalse(self.daemon.handle_request({'op': 'nope'})['ok'])
+    
+    @unittest.skipUnless(hasattr(socket, 'AF_UNIX'), "Unix sockets not available")
+    def test_socket_round_trip(self):
+        """Test requests over the Unix socket"""
+        thread = threading.Thread(target=self.daemon.serve_forever, daemon=True)
+        thread.start()
+        deadline = time.time() + 10
+        while not os.path.exists(self.socket_path) and time.time() < deadline:
+            time.sleep(0.01)
+        
+        response = daemon_request(self.socket_path, {
+            'op': 'search', 'file': self.csv_path, 'term': 'Rome', 'columns': ['City']
+        }, timeout=10)
+        self.assertEqual(response['rows'], [['Bob Johnson', 'Rome']])
+        
+        daemon_request(self.socket_path, {'op': 'shutdown'}, timeout=10)
+        thread.join(10)
+        self.assertFalse(thread.is_alive())
+
+
+class TestSearchAPI(unittest.TestCase):
+    """Test cases for the HTTP/JSON search API"""
+    
+    def setUp(self):
+        """Set up a CSV file and start the API on a free port"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.csv_path = os.path.join(self.temp_dir, 'data.csv')
+        pd.DataFrame({
+            'Name': ['Alice Smith', 'Bob Johnson', 'Carol Smith'],
+            'City': ['Paris', 'Rome', 'Oslo']
+        }).to_csv(self.csv_path, index=False)
+        
+        self.export_dir = os.path.join(self.temp_dir, 'exports')
+        os.mkdir(self.export_dir)
+        self.httpd = SearchAPIServer('127.0.0.1', 0, export_dir=self.export_dir).start()
+        self.base_url = f"http://127.0.0.1:{self.httpd.server_address[1]}"
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+    
+    def tearDown(self):
+        """Stop the API and clean up"""
+        self.httpd.shutdown()
+        self.httpd.server_close()
+        shutil.rmtree(self.temp_dir)
+    
+    def get(self, path, payload=None, headers=None):
+        """Send a request (a JSON POST when there is a payload) and return the raw response body"""
+        data = json.dumps(payload).encode('utf-8') if payload is not None else None
+        request = urllib.request.Request(self.base_url + path, data=data, headers=headers or {})
+        if data is not None and not request.has_header('Content-type'):
+            request.add_header('Content-Type', 'application/json')
+        with urllib.request.urlopen(request, timeout=10) as response:
+            return response.read().decode('utf-8')
+    
+    def assert_status(self, status, path, payload=None, headers=None):
+        """Assert a request is refused with the given HTTP status"""
+        with self.assertRaises(urllib.error.HTTPError) as context:
+            self.get(path, payload, headers)
+        self.assertEqual(context.exception.code, status)
+    
+    def test_search_and_paginate(self):
+        """Test JSON search with pagination"""
+        load = json.loads(self.get('/load', {'file': self.csv_path}))
+        self.assertEqual(load['file_info']['rows'], 3)
+        
+        query = urllib.parse.urlencode({'file': self.csv_path, 'term': 'smith', 'columns': 'Name',
+                                        'offset': 1, 'rows': 1})
+        response = json.loads(self.get(f"/search?{query}"))
+        self.assertEqual(response['stats']['total_results'], 2)
+        self.assertEqual(response['rows'], [['Carol Smith', 'Oslo']])
+        
+        stats = json.loads(self.get('/stats'))
+        self.assertEqual(len(stats['files']), 1)
+    
+    def test_search_ndjson(self):
+        """Test NDJSON search streams a stats line and one line per row"""
+        body = self.get('/search', {'file': self.csv_path, 'term': 'o', 'columns': ['City'],
+                                    'format': 'ndjson'})
+        lines = [json.loads(line) for line in body.splitlines()]
+        self.assertEqual(lines[0]['stats']['total_results'], 2)
+        self.assertEqual(lines[1:], [{'Name': 'Bob Johnson', 'City': 'Rome'},
+                                     {'Name': 'Carol Smith', 'City': 'Oslo'}])
+    
+    def test_unknown_endpoint(self):
+        """Test unknown endpoints return 404"""
+        self.assert_status(404, '/nope')
+    
+    def test_mutating_requests_need_json_post(self):
+        """Test loads and shutdowns are refused over GET or a form POST"""
+        query = urllib.parse.urlencode({'file': self.csv_path})
+        self.assert_status(405, f"/load?{query}")
+        self.assert_status(405, '/shutdown')
+        self.assert_status(415, '/load', {'file': self.csv_path},
+                           headers={'Content-Type': 'text/plain'})
+        self.assertEqual(json.loads(self.get('/stats'))['files'], [])
+    
+    def test_get_search_does_not_load(self):
+        """Test a GET search only reaches files that were loaded with a JSON POST"""
+        query = urllib.parse.urlencode({'file': self.csv_path, 'term': 'smith'})
+        self.assert_status(400, f"/search?{query}")
+        self.assert_status(400, f"/search?{query}&format=ndjson")
+        self.assertEqual(json.loads(self.get('/stats'))['files'], [])
+        
+        self.get('/load', {'file': self.csv_path})
+        self.assertEqual(json.loads(self.get(f"/search?{query}"))['stats']['total_results'], 2)
+    
+    def test_foreign_host_refused(self):
+        """Test a Host header other than the bound address is refused (DNS rebinding)"""
+        self.assert_status(403, '/stats', headers={'Host': 'attacker.example'})
+        self.get('/health', headers={'Host': f"localhost:{self.httpd.server_address[1]}"})
+    
+    def test_export_confined_to_export_dir(self):
+        """Test server-side exports only write inside the export directory"""
+        request = {'file': self.csv_path, 'term': 'smith', 'columns': ['Name']}
+        response = json.loads(self.get('/export', dict(request, output='smiths.csv')))
+        self.assertTrue(response['export']['ok'])
+        self.assertEqual(len(pd.read_csv(os.path.join(self.export_dir, 'smiths.csv'))), 2)
+        
+        outside = os.path.join(self.temp_dir, 'outside.csv')
+        for output in (outside, '../outside.csv'):
+            self.assert_status(400, '/export', dict(request, output=output))
+        self.assertFalse(os.path.exists(outside))
+
+
+class TestBatchQueries(unittest.TestCase):
+    """Test cases for CLI batch query mode"""
+    
+    def setUp(self):
+        """Set up a CSV file and a query file"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.csv_path = os.path.join(self.temp_dir, 'data.csv')
+        pd.DataFrame({
+            'Name': ['Alice Smith', 'Bob Johnson', 'Carol Smith'],
+            'City': ['Paris', 'Rome', 'Oslo']
+        }).to_csv(self.csv_path, index=False)
+        
+        self.queries_path = os.path.join(self.temp_dir, 'queries.txt')
+        with open(self.queries_path, 'w', encoding='utf-8') as f:
+            f.write("# people\n")
+            f.write("Smith -c Name\n")
+            f.write('{"term": "rome", "columns": ["City"], "case_sensitive": false}\n')
+            f.write("x -c Missing\n")
+        self.output_path = os.path.join(self.temp_dir, 'out.jsonl')
+    
+    def tearDown(self):
+        """Clean up test fixtures"""
+        shutil.rmtree(self.temp_dir)
+    
+    def run_batch(self, workers):
+        """Run the query file and return the JSON Lines records"""
+        args = argparse.Namespace(
+            file=self.csv_path, queries=self.queries_path, batch_output=self.output_path,
+            workers=workers, columns=None, ignore_case=False, exact=False, regex=False,
+            max_results=None
+        )
+        success = ExcelSearchCLI().run_batch_queries(args)
+        with open(self.output_path, encoding='utf-8') as f:
+            return success, [json.loads(line) for line in f]
+    
+    def test_batch_records_in_order(self):
+        """Test every query produces one record, in input order"""
+        for workers in (1, 3):
+            success, records = self.run_batch(workers)
+            self.assertFalse(success)  # The invalid column query fails
+            self.assertEqual([r['query'][:5] for r in records], ['Smith', '{"ter', 'x -c '])
+            self.assertEqual(records[0]['total_results'], 2)
+            self.assertEqual(records[1]['rows'], [{'Name': 'Bob Johnson', 'City': 'Rome'}])
+            self.assertIn('error', records[2])
+            self.assertIn('elapsed', records[2])
+    
+    def test_blank_term_does_not_abort_batch(self):
+        """Test a blank term matches every row and later lines still run"""
+        with open(self.queries_path, 'w', encoding='utf-8') as f:
+            f.write('{"term": " "}\n')
+            f.write("Smith\n")
+        success, records = self.run_batch(1)
+        self.assertTrue(success)
+        self.assertEqual(len(records), 2)
+        self.assertEqual(records[0]['total_results'], 3)
+        self.assertEqual(records[0]['returned_results'], 3)
+        self.assertEqual(records[1]['total_results'], 2)
+
+
+class TestProgressiveLoad(unittest.TestCase):
+    """Test cases for progressive loading"""
+    
+    def setUp(self):
+        """Set up a CSV large enough to load in several chunks"""
+        self.engine = ExcelSearchEngine()
+        self.test_data = pd.DataFrame({
+            'ID': range(1000),
+            'Name': [f'Person {i}' for i in range(1000)]
+        })
+        
+        self.temp_file = tempfile.NamedTemporaryFile(suffix='.csv', delete=False)
+        self.temp_file.close()
+        self.test_data.to_csv(self.temp_file.name, index=False)
+    
+    def tearDown(self):
+        """Clean up test fixtures"""
+        self.engine.reset()
+        if os.path.exists(self.temp_file.name):
+            os.unlink(self.temp_file.name)
+    
+    def wait_for_load(self, timeout=10):
+        """Wait until the background load finishes"""
+        deadline = time.time() + timeout
+        while self.engine.loading and time.time() < deadline:
+            time.sleep(0.01)
+        self.assertFalse(self.engine.loading)
+    
+    def test_empty_workbook_keeps_running_load(self):
+        """Test a progressive load that finds no data leaves the load already running to finish"""
+        from openpyxl import Workbook
+        empty_path = self.temp_file.name.replace('.csv', '.xlsx')
+        Workbook().save(empty_path)
+        try:
+            self.engine.load_file_progressive(self.temp_file.name, preview_rows=10, chunk_rows=1)
+            self.assertTrue(self.engine.loading)
+            self.assertEqual(self.engine.load_file_progressive(empty_path), (False, "File contains no data"))
+            self.wait_for_load()
+            self.assertEqual(len(self.engine.df), 1000)
+        finally:
+            os.unlink(empty_path)
+    
+    def test_xlsx_headers_match_eager_load(self):
+        """Test chunked and progressive xlsx loads label columns like pd.read_excel"""
+        from openpyxl import Workbook
+        xlsx_path = self.temp_file.name.replace('.csv', '.xlsx')
+        workbook = Workbook()
+        workbook.active.append([2020, 'Name', None, 'Name', 'Name.1', 2020])
+        for i in range(30):
+            workbook.active.append([i, f"name {i}", i, 'a', 'b', i * 2])
+        workbook.save(xlsx_path)
+        try:
+            eager = ExcelSearchEngine()
+            eager.load_file(xlsx_path)
+            self.assertEqual(list(eager.df.columns), [2020, 'Name', 'Unnamed: 2', 'Name.2', 'Name.1', '2020.1'])
+            
+            self.engine.load_file(xlsx_path, progress_callback=lambda progress: None)
+            pd.testing.assert_frame_equal(self.engine.df, eager.df)
+            self.assertEqual(self.engine.search("1", [2020])[1]['total_results'], 12)
+            
+            self.engine.load_file_progressive(xlsx_path, preview_rows=5, chunk_rows=5)
+            self.wait_for_load()
+            pd.testing.assert_frame_equal(self.engine.df, eager.df)
+        finally:
+            os.unlink(xlsx_path)
+    
+    def test_encoding_change_past_sample(self):
+        """Test chunked loads retry with the next encoding when bytes past the sniffed sample don't decode"""
+        with open(self.temp_file.name, 'wb') as f:
+            f.write(b'ID,Name\n')
+            i = 0
+            while f.tell() < 1100 * 1024:
+                f.write(f"{i},name {i}\n".encode('ascii'))
+                i += 1
+            for j in range(20):
+                f.write(f"{i + j},مرحبا {j}\n".encode('cp1256'))
+        
+        eager = ExcelSearchEngine()
+        self.assertTrue(eager.load_file(self.temp_file.name)[0])
+        success, message = self.engine.load_file(self.temp_file.name, progress_callback=lambda progress: None)
+        self.assertTrue(success, message)
+        pd.testing.assert_frame_equal(self.engine.df, eager.df)
+        
+        self.engine.load_file_progressive(self.temp_file.name, preview_rows=10, chunk_rows=5000)
+        self.wait_for_load()
+        pd.testing.assert_frame_equal(self.engine.df, eager.df)
+        self.assertEqual(self.engine.search("مرحبا", ["Name"])[1]['total_results'], 20)
+    
+    def test_cancelled_load_keeps_progressive_load(self):
+        """Test a cancelled load_file doesn't stop a progressive load already streaming"""
+        self.engine.load_file_progressive(self.temp_file.name, preview_rows=10, chunk_rows=1)
+        self.assertTrue(self.engine.loading)
+        cancel_event = threading.Event()
+        cancel_event.set()
+        self.assertEqual(self.engine.load_file(self.temp_file.name, cancel_event=cancel_event),
+                         (False, "Load cancelled"))
+        
+        self.wait_for_load()
+        self.assertEqual(len(self.engine.df), 1000)
+    
+    def test_preview_then_full_load(self):
+        """Test preview rows are available before the full load completes"""
+        updates = []
+        success, message = self.engine.load_file_progressive(
+            self.temp_file.name, preview_rows=10, chunk_rows=100,
+            progress_callback=updates.append
+        )
+        self.assertTrue(success)
+        self.assertGreaterEqual(len(self.engine.df), 10)
+        
+        self.wait_for_load()
+        self.assertEqual(len(self.engine.df), 1000)
+        self.assertEqual(self.engine.get_file_info()['rows'], 1000)
+        self.assertTrue(updates[-1]['done'])
+        self.assertEqual(updates[-1]['percent'], 100)
+        self.assertEqual(list(self.engine.df['ID']), list(range(1000)))
+    
+    def test_search_during_load_is_partial(self):
+        """Test searches during loading are labeled as partial"""
+        release = threading.Event()
+        
+        def hold_loader(progress):
+            if not progress['done']:
+                release.wait(5)
+        
+        self.engine.load_file_progressive(
+            self.temp_file.name, preview_rows=10, chunk_rows=100,
+            progress_callback=hold_loader
+        )
+        results, stats = self.engine.search("Person", ["Name"])
+        release.set()
+        
+        self.assertTrue(stats['partial'])
+        self.assertEqual(stats['rows_searched'], len(results))
+        self.assertLess(stats['rows_searched'], 1000)
+        
+        self.wait_for_load()
+        results, stats = self.engine.search("Person", ["Name"])
+        self.assertNotIn('partial', stats)
+        self.assertEqual(len(results), 1000)
+    
+    def test_load_file_reports_progress(self):
+        """Test load_file progress callbacks"""
+        updates = []
+        success, _ = self.engine.load_file(self.temp_file.name, progress_callback=updates.append)
+        
+        self.assertTrue(success)
+        self.assertEqual(len(self.engine.df), 1000)
+        self.assertEqual(updates[-1]['rows_loaded'], 1000)
+        self.assertEqual(updates[-1]['bytes_read'], updates[-1]['total_bytes'])
+        self.assertIn('eta_seconds', updates[-1])
+    
+    def test_cancel_load_keeps_previous_data(self):
+        """Test a cancelled load_file leaves the loaded data untouched"""
+        self.engine.load_file(self.temp_file.name)
+        cancel_event = threading.Event()
+        cancel_event.set()
+        
+        success, message = self.engine.load_file(self.temp_file.name, cancel_event=cancel_event)
+        self.assertFalse(success)
+        self.assertIn("cancelled", message.lower())
+        self.assertEqual(len(self.engine.df), 1000)
+    
+    def test_cancel_progressive_load_releases_data(self):
+        """Test cancelling a progressive load discards the partial data"""
+        cancel_event = threading.Event()
+        finished = threading.Event()
+        updates = []
+        
+        def cancel_after_first_chunk(progress):
+            updates.append(progress)
+            cancel_event.set()
+            if progress['done']:
+                finished.set()
+        
+        self.engine.load_file_progressive(
+            self.temp_file.name, preview_rows=10, chunk_rows=100,
+            progress_callback=cancel_after_first_chunk, cancel_event=cancel_event
+        )
+        self.assertTrue(finished.wait(10))
+        
+        self.assertTrue(updates[-1]['cancelled'])
+        self.assertIsNone(self.engine.df)
+    
+    def test_progressive_excel_matches_full_load(self):
+        """Test streamed Excel chunks produce the same data as a full load"""
+        excel_file = self.temp_file.name.replace('.csv', '.xlsx')
+        self.test_data.to_excel(excel_file, index=False)
+        try:
+            self.engine.load_file_progressive(excel_file, preview_rows=10, chunk_rows=300)
+            self.wait_for_load()
+            pd.testing.assert_frame_equal(self.engine.df, pd.read_excel(excel_file))
+        finally:
+            os.unlink(excel_file)
+
+
+class TestPreload(unittest.TestCase):
+    """Test cases for speculative preloading"""
+    
+    def setUp(self):
+        """Set up test fixtures"""
+        self.engine = ExcelSearchEngine()
+        self.test_data = pd.DataFrame({
+            'ID': range(500),
+            'Name': [f'Person {i}' for i in range(500)]
+        })
+        
+        self.temp_file = tempfile.NamedTemporaryFile(suffix='.csv', delete=False)
+        self.temp_file.close()
+        self.test_data.to_csv(self.temp_file.name, index=False)
+    
+    def tearDown(self):
+        """Clean up test fixtures"""
+        self.engine.reset()
+        if os.path.exists(self.temp_file.name):
+            os.unlink(self.temp_file.name)
+    
+    def test_load_reuses_preload(self):
+        """Test load_file takes over a speculative load of the same file"""
+        self.assertTrue(self.engine.preload(self.temp_file.name))
+        self.assertIsNone(self.engine.df)
+        
+        success, message = self.engine.load_file(self.temp_file.name)
+        self.assertTrue(success)
+        self.assertIn("preloaded", message)
+        self.assertEqual(len(self.engine.df), 500)
+        self.assertFalse(self.engine.loading)
+    
+    def test_progressive_load_reuses_preload(self):
+        """Test load_file_progressive takes over a speculative load"""
+        finished = threading.Event()
+        self.engine.preload(self.temp_file.name)
+        
+        success, message = self.engine.load_file_progressive(
+            self.temp_file.name,
+            progress_callback=lambda progress: progress['done'] and finished.set()
+        )
+        self.assertTrue(success)
+        self.assertIn("preloaded", message)
+        if self.engine.loading:
+            self.assertTrue(finished.wait(10))
+        self.assertEqual(len(self.engine.df), 500)
+    
+    def test_changed_file_is_not_reused(self):
+        """Test a preload is discarded when the file changed since it started"""
+        self.engine.preload(self.temp_file.name)
+        self.test_data.head(10).to_csv(self.temp_file.name, index=False)
+        os.utime(self.temp_file.name, ns=(0, 0))
+        
+        success, message = self.engine.load_file(self.temp_file.name)
+        self.assertTrue(success)
+        self.assertNotIn("preloaded", message)
+        self.assertEqual(len(self.engine.df), 10)
+
+
+class TestStreamingExport(unittest.TestCase):
+    """Test cases for chunked exports"""
+    
+    def setUp(self):
+        """Set up an engine with data loaded directly"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.engine = ExcelSearchEngine()
+        self.engine.df = pd.DataFrame({
+            'ID': range(250),
+            'Name': [f"Person {i}" if i % 7 else None for i in range(250)],
+            'Score': [i / 4 for i in range(250)]
+        })
+    
+    def tearDown(self):
+        """Clean up test fixtures"""
+        shutil.rmtree(self.temp_dir)
+    
+    def test_csv_export_matches_to_csv(self):
+        """Test chunked CSV output is identical to a single to_csv call"""
+        output = os.path.join(self.temp_dir, 'out.csv')
+        success, _ = exporters.export_dataframe(self.engine.df, output, chunk_rows=64)
+        self.assertTrue(success)
+        with open(output, encoding='utf-8') as f:
+            self.assertEqual(f.read(), self.engine.df.to_csv(index=False))
+    
+    def test_cli_output_exports_every_match(self):
+        """Test a command-line search with -o writes every match while building only the shown rows"""
+        csv_path = os.path.join(self.temp_dir, 'data.csv')
+        output = os.path.join(self.temp_dir, 'out.csv')
+        self.engine.df.to_csv(csv_path, index=False)
+        args = argparse.Namespace(
+            file=csv_path, search='Person', columns=['Name'], ignore_case=True, exact=False, regex=False,
+            max_results=None, explain=False, whole_word=False, output=output
+        )
+        cli = ExcelSearchCLI()
+        self.assertTrue(cli.run_command_line_search(args))
+        expected = self.engine.df.dropna().reset_index(drop=True)
+        pd.testing.assert_frame_equal(pd.read_csv(output), expected)
+    
+    def test_parts_export_matches_concat(self):
+        """Test exporting several frames part by part gives the same file as concatenating them"""
+        other = pd.DataFrame({'ID': [7, 8], 'Extra': ['a', 'b']})
+        parts = [(self.engine.df, np.array([1, 2, 3]), {'Sheet': 'One'}), (other, None, {'Sheet': 'Two'})]
+        output = os.path.join(self.temp_dir, 'parts.csv')
+        success, _ = exporters.export_parts(parts, output, max_rows=4, chunk_rows=2)
+        self.assertTrue(success)
+        
+        expected = pd.concat([self.engine.df.iloc[[1, 2, 3]].assign(Sheet='One'), other.assign(Sheet='Two')])
+        expected = expected[['Sheet', 'ID', 'Name', 'Score', 'Extra']].iloc[:4]
+        with open(output, encoding='utf-8') as f:
+            self.assertEqual(f.read(), expected.to_csv(index=False))
+    
+    def test_xlsx_export_rows_by_position(self):
+        """Test exporting search positions to Excel with progress updates"""
+        positions, stats = self.engine.search_positions("person 1", ["Name"])
+        output = os.path.join(self.temp_dir, 'out.xlsx')
+        progress = []
+        success, message = self.engine.export_rows(positions, output, progress_callback=progress.append)
+        self.assertTrue(success, message)
+        
+        exported = pd.read_excel(output)
+        self.assertEqual(len(exported), stats['total_results'])
+        self.assertEqual(list(exported['ID']), list(self.engine.df['ID'].iloc[positions]))
+        self.assertEqual(progress[-1]['rows_written'], len(positions))
+    
+    def test_xlsx_export_continues_on_new_sheet(self):
+        """Test rows beyond the sheet row limit continue on another sheet"""
+        output = os.path.join(self.temp_dir, 'out.xlsx')
+        original_limit = exporters.EXCEL_MAX_DATA_ROWS
+        exporters.EXCEL_MAX_DATA_ROWS = 200
+        try:
+            success, _ = exporters.export_dataframe(self.engine.df, output, chunk_rows=64)
+        finally:
+            exporters.EXCEL_MAX_DATA_ROWS = original_limit
+        self.assertTrue(success)
+        
+        sheets = pd.read_excel(output, sheet_name=None)
+        self.assertEqual(list(sheets), ['Sheet1', 'Sheet2'])
+        self.assertEqual([len(sheet) for sheet in sheets.values()], [200, 50])
+    
+    def test_compressed_and_line_formats_round_trip(self):
+        """Test gzip CSV and JSON Lines exports read back to the same rows"""
+        positions = self.engine.search_positions("person", ["Name"])[0]
+        expected = self.engine.df.iloc[positions].reset_index(drop=True)
+        
+        gz_path = os.path.join(self.temp_dir, 'out.csv.gz')
+        self.assertTrue(self.engine.export_rows(positions, gz_path)[0])
+        pd.testing.assert_frame_equal(pd.read_csv(gz_path), expected, check_dtype=False)
+        
+        jsonl_path = os.path.join(self.temp_dir, 'out.jsonl')
+        self.assertTrue(self.engine.export_rows(positions, jsonl_path)[0])
+        self.assertEqual(list(pd.read_json(jsonl_path, lines=True)['ID']), list(expected['ID']))
+    
+    @unittest.skipUnless(importlib.util.find_spec('pyarrow'), "pyarrow not installed")
+    def test_columnar_formats_round_trip(self):
+        """Test Parquet and Feather exports written in batches read back intact"""
+        positions = np.arange(0, 250, 3)
+        expected = self.engine.df.iloc[positions].reset_index(drop=True)
+        for name, reader in (('out.parquet', pd.read_parquet), ('out.feather', pd.read_feather)):
+            output = os.path.join(self.temp_dir, name)
+            success, message = exporters.export_dataframe(self.engine.df, output, positions=positions,
+                                                          chunk_rows=20)
+            self.assertTrue(success, message)
+            pd.testing.assert_frame_equal(reader(output), expected, check_dtype=False)
+    
+    def test_cancel_removes_partial_file(self):
+        """Test a cancelled export leaves no partial output and keeps an existing file"""
+        output = os.path.join(self.temp_dir, 'out.csv')
+        with open(output, 'w') as f:
+            f.write('previous export\n')
+        
+        cancel_event = threading.Event()
+        success, message = exporters.export_dataframe(
+            self.engine.df, output, chunk_rows=10,
+            progress_callback=lambda progress: cancel_event.set(), cancel_event=cancel_event)
+        self.assertFalse(success)
+        self.assertIn("cancelled", message)
+        self.assertEqual(os.listdir(self.temp_dir), ['out.csv'])
+        with open(output) as f:
+            self.assertEqual(f.read(), 'previous export\n')
+
+
+class TestLazyColumns(unittest.TestCase):
+    """Test cases for lazy column loading"""
+    
+    def setUp(self):
+        """Create a wide CSV file"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.df = pd.DataFrame({
+            'Name': ['Alice', 'Bob', 'Carol', 'alice b', 'Dave'],
+            'City': ['Paris', 'Rome', 'Oslo', 'Lima', 'Paris'],
+            **{f'Extra{i}': [f"x{i}-{row}" for row in range(5)] for i in range(10)}
+        })
+        self.csv_path = os.path.join(self.temp_dir, 'wide.csv')
+        self.df.to_csv(self.csv_path, index=False)
+    
+    def tearDown(self):
+        """Clean up test fixtures"""
+        shutil.rmtree(self.temp_dir)
+    
+    def test_lazy_load_reads_only_search_columns(self):
+        """Test a lazy load parses the given columns and full rows are read for shown rows only"""
+        engine = ExcelSearchEngine()
+        success, message = engine.load_file(self.csv_path, columns=['Name'], lazy=True)
+        self.assertTrue(success, message)
+        self.assertEqual(list(engine.df.columns), ['Name'])
+        self.assertEqual(engine.get_file_info()['column_names'], list(self.df.columns))
+        
+        results, _ = engine.search("alice", ["Name"])
+        pd.testing.assert_frame_equal(results, self.df.iloc[[0, 3]][['Name']])
+        pd.testing.assert_frame_equal(engine.complete_rows(results.tail(1)), self.df.iloc[[3]])
+    
+    def test_export_results_reads_lazy_columns(self):
+        """Test exporting search results writes the columns that were not loaded"""
+        engine = ExcelSearchEngine()
+        engine.load_file(self.csv_path, columns=['Name'], lazy=True)
+        results, _ = engine.search("alice", ["Name"])
+        output_path = os.path.join(self.temp_dir, 'results.csv')
+        success, message = engine.export_results(results, output_path)
+        
+        self.assertTrue(success, message)
+        pd.testing.assert_frame_equal(pd.read_csv(output_path), self.df.iloc[[0, 3]].reset_index(drop=True))
+    
+    def test_searching_a_lazy_column_loads_it(self):
+        """Test a column left in the file is loaded when searched"""
+        engine = ExcelSearchEngine()
+        engine.load_file(self.csv_path, lazy=True)
+        self.assertEqual(list(engine.df.columns), ['Name', 'City'])
+        
+        results, _ = engine.search("x7-4", ["Extra7"], exact_match=True)
+        self.assertEqual(results['Name'].tolist(), ['Dave'])
+        self.assertNotIn('Extra7', engine.lazy_columns)
+        self.assertIn('Extra7', engine.df.columns)
+    
+    def test_export_rows_reads_lazy_columns(self):
+        """Test exports include the columns that were not loaded"""
+        engine = ExcelSearchEngine()
+        engine.load_file(self.csv_path, columns=['City'], lazy=True)
+        positions, _ = engine.search_positions("paris", ["City"])
+        output_path = os.path.join(self.temp_dir, 'out.csv')
+        success, _ = engine.export_rows(positions, output_path)
+        
+        self.assertTrue(success)
+        pd.testing.assert_frame_equal(pd.read_csv(output_path), self.df.iloc[[0, 4]].reset_index(drop=True))
+    
+    def test_quoted_line_breaks_fall_back_to_parsing(self):
+        """Test rows are still found when values contain line breaks"""
+        self.df.loc[1, 'Extra0'] = "two\nlines"
+        self.df.to_csv(self.csv_path, index=False)
+        engine = ExcelSearchEngine()
+        engine.load_file(self.csv_path, columns=['Name'], lazy=True)
+        
+        results, _ = engine.search("o", ["Name"])
+        pd.testing.assert_frame_equal(engine.complete_rows(results), self.df.iloc[[1, 2]])
+
+
+@unittest.skipUnless(importlib.util.find_spec('pyarrow'), "pyarrow not installed")
+class TestWorkbookSearch(unittest.TestCase):
+    """Test cases for multi-sheet loading and cross-sheet search"""
+    
+    def setUp(self):
+        """Create a workbook with three sheets"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.xlsx_path = os.path.join(self.temp_dir, 'workbook.xlsx')
+        with pd.ExcelWriter(self.xlsx_path) as writer:
+            pd.DataFrame({'Name': ['Alice', 'Bob'], 'City': ['Paris', 'Rome']}).to_excel(
+                writer, sheet_name='People', index=False)
+            pd.DataFrame({'Product': ['Paris lamp', 'Chair', 'Desk'], 'Price': [5, 6, 7]}).to_excel(
+                writer, sheet_name='Products', index=False)
+            pd.DataFrame({'Name': ['Carol'], 'City': ['Oslo']}).to_excel(
+                writer, sheet_name='Archive', index=False)
+        self.workbook = WorkbookSearch()
+    
+    def tearDown(self):
+        """Clean up test fixtures"""
+        self.workbook.close()
+        shutil.rmtree(self.temp_dir)
+    
+    def test_output_written_sheet_by_sheet(self):
+        """Test a workbook search exports every match while returning only the requested rows"""
+        self.workbook.load_workbook(self.xlsx_path, processes=1)
+        expected, _ = self.workbook.search("a", ["City", "Product"])
+        output_path = os.path.join(self.temp_dir, 'matches.csv')
+        results, stats = self.workbook.search("a", ["City", "Product"], output_path=output_path, return_rows=1)
+        
+        self.assertEqual(len(results), 1)
+        self.assertTrue(stats['export']['ok'], stats['export']['message'])
+        pd.testing.assert_frame_equal(pd.read_csv(output_path), expected.reset_index(drop=True))
+    
+    def test_load_all_sheets_in_parallel(self):
+        """Test every sheet is loaded into its own engine with its own indexes"""
+        success, message = self.workbook.load_workbook(self.xlsx_path, processes=2)
+        self.assertTrue(success, message)
+        self.assertEqual(self.workbook.sheet_names, ['People', 'Products', 'Archive'])
+        self.assertEqual(self.workbook.get_file_info()['rows'], 6)
+        
+        self.workbook.build_indexes(['City'])
+        self.assertIn(('City', False), self.workbook.engines['People']._get_cache(
+            self.workbook.engines['People'].df)['indexes'])
+    
+    def test_search_fans_out_across_sheets(self):
+        """Test one search returns rows from every sheet tagged with the sheet name"""
+        self.workbook.load_workbook(self.xlsx_path, processes=1)
+        results, stats = self.workbook.search("paris")
+        self.assertEqual(results['Sheet'].tolist(), ['People', 'Products'])
+        self.assertEqual(stats['sheets']['Archive']['total_results'], 0)
+        
+        results, stats = self.workbook.search("o", ["City"])
+        self.assertEqual(results['Sheet'].tolist(), ['People', 'Archive'])
+        self.assertNotIn('Products', stats['sheets'])
+        
+        _, stats = self.workbook.search("x", ["Missing"])
+        self.assertIn('Invalid columns', stats['error'])
+    
+    def test_unknown_sheet(self):
+        """Test asking for a sheet the workbook lacks fails"""
+        success, message = self.workbook.load_workbook(self.xlsx_path, sheets=['Nope'])
+        self.assertFalse(success)
+        self.assertIn('Unknown sheets', message)
+
+
+class TestFolderCatalog(unittest.TestCase):
+    """Test cases for the folder catalog and multi-file search"""
+    
+    def setUp(self):
+        """Create a folder of workbooks and CSV files"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.folder = os.path.join(self.temp_dir, 'reports')
+        os.makedirs(os.path.join(self.folder, '2024'))
+        with pd.ExcelWriter(os.path.join(self.folder, '2024', 'january.xlsx')) as writer:
+            pd.DataFrame({'Customer': ['ACME Corp', 'Globex'], 'Total': [10, 20]}).to_excel(
+                writer, sheet_name='Sales', index=False)
+            pd.DataFrame({'Note': ['call ACME']}).to_excel(writer, sheet_name='Notes', index=False)
+        pd.DataFrame({'Customer': ['Initech', 'acme corp']}).to_csv(
+            os.path.join(self.folder, 'february.csv'), index=False)
+        pd.DataFrame({'Supplier': ['ACME Corp']}).to_csv(os.path.join(self.folder, 'suppliers.csv'), index=False)
+        self.catalog = FolderCatalog(os.path.join(self.temp_dir, 'catalog.sqlite'))
+    
+    def tearDown(self):
+        """Clean up test fixtures"""
+        self.catalog.close()
+        shutil.rmtree(self.temp_dir)
+    
+    def test_scan_records_headers_and_skips_unchanged_files(self):
+        """Test a scan stores sheets, headers and row counts and rescans only changes"""
+        scan = self.catalog.scan(self.folder, processes=2)
+        self.assertEqual((scan['files'], scan['scanned'], scan['errors']), (3, 3, 0))
+        
+        entries = {os.path.basename(entry['path']): entry for entry in self.catalog.files(self.folder)}
+        self.assertEqual(entries['january.xlsx']['sheets'], [
+            {'name': 'Sales', 'columns': ['Customer', 'Total'], 'rows': 2},
+            {'name': 'Notes', 'columns': ['Note'], 'rows': 1}])
+        self.assertEqual(entries['february.csv']['sheets'][0]['rows'], 2)
+        
+        os.remove(os.path.join(self.folder, 'suppliers.csv'))
+        scan = self.catalog.scan(self.folder)
+        self.assertEqual((scan['scanned'], scan['unchanged'], scan['removed']), (0, 2, 1))
+    
+    def test_search_skips_files_without_the_columns(self):
+        """Test a folder search returns rows tagged with file and sheet"""
+        self.catalog.scan(self.folder)
+        results, stats = self.catalog.search(self.folder, "acme corp", ["Customer"], processes=2)
+        
+        self.assertEqual(stats['total_results'], 2)
+        self.assertEqual(stats['files_searched'], 2)
+        self.assertEqual(stats['files_skipped'], 1)
+        tagged = sorted(zip(results['File'].map(os.path.basename), results['Sheet']))
+        self.assertEqual(tagged, [('february.csv', ''), ('january.xlsx', 'Sales')])
+    
+    def test_search_output_written_file_by_file(self):
+        """Test a folder search exports every match while returning only the requested rows"""
+        self.catalog.scan(self.folder)
+        expected, _ = self.catalog.search(self.folder, "acme", ["Customer", "Supplier"], processes=1)
+        output_path = os.path.join(self.temp_dir, 'matches.csv')
+        results, stats = self.catalog.search(self.folder, "acme", ["Customer", "Supplier"], processes=1,
+                                             output_path=output_path, return_rows=1)
+        
+        self.assertEqual(len(results), 1)
+        self.assertTrue(stats['export']['ok'], stats['export']['message'])
+        with open(output_path, encoding='utf-8') as f:
+            self.assertEqual(f.read(), expected.to_csv(index=False))
+    
+    def test_numeric_headers_and_sheet_errors(self):
+        """Test non-text headers are searchable and a failing sheet doesn't drop the file"""
+        budget_path = os.path.join(self.folder, 'budget.xlsx')
+        
+        def write_budget(draft_header):
+            with pd.ExcelWriter(budget_path) as writer:
+                pd.DataFrame({2023: ['ACME Corp', 'Globex']}).to_excel(writer, sheet_name='Plan', index=False)
+                pd.DataFrame({draft_header: ['acme corp']}).to_excel(writer, sheet_name='Draft', index=False)
+        
+        write_budget(2023)
+        self.catalog.scan(self.folder)
+        results, stats = self.catalog.search(self.folder, "acme", ["2023"], processes=1)
+        self.assertEqual(stats['files'][budget_path], {'Plan': 1, 'Draft': 1})
+        self.assertNotIn('sheet_errors', stats)
+        
+        # A sheet changed since the scan fails on its own
+        write_budget('Year')
+        results, stats = self.catalog.search(self.folder, "acme", ["2023"], processes=1)
+        self.assertEqual(stats['files'][budget_path], {'Plan': 1})
+        self.assertIn('Draft', stats['sheet_errors'][budget_path])
+        self.assertEqual(list(results['Sheet']), ['Plan'])
+
+
+class TestOutOfCoreSearch(unittest.TestCase):
+    """Test cases for chunked search of files that are not loaded"""
+    
+    def setUp(self):
+        """Create a CSV file spanning several chunks"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.df = pd.DataFrame({
+            'Name': [f"name {i}" for i in range(1000)],
+            'City': ['Paris', 'Rome', 'Oslo', 'Lima'] * 250
+        })
+        self.csv_path = os.path.join(self.temp_dir, 'data.csv')
+        self.df.to_csv(self.csv_path, index=False)
+        self.engine = ExcelSearchEngine()
+    
+    def tearDown(self):
+        """Clean up test fixtures"""
+        shutil.rmtree(self.temp_dir)
+    
+    def test_chunked_search_matches_loaded_search(self):
+        """Test every mode finds the same rows as a search of the loaded file"""
+        loaded = ExcelSearchEngine()
+        loaded.load_file(self.csv_path)
+        for args in (("PARIS", ["City"]), ("name 99", ["Name", "City"])):
+            for options in ({}, {'exact_match': True}, {'use_regex': True, 'case_sensitive': True}):
+                expected, _ = loaded.search(*args, **options)
+                results, stats = self.engine.search_file(self.csv_path, *args, chunk_rows=128, **options)
+                self.assertEqual(results.index.tolist(), expected.index.tolist(), (args, options))
+                self.assertEqual(stats['chunks'], 8)
+        self.assertIsNone(self.engine.df)
+    
+    def test_matches_stream_to_output(self):
+        """Test all matches are written while only max_results are returned"""
+        output_path = os.path.join(self.temp_dir, 'matches.csv')
+        progress = []
+        results, stats = self.engine.search_file(self.csv_path, "rome", ["City"], output_path=output_path,
+                                                 max_results=5, chunk_rows=100,
+                                                 progress_callback=progress.append)
+        
+        self.assertEqual(len(results), 5)
+        self.assertEqual(stats['total_results'], 250)
+        self.assertEqual(len(pd.read_csv(output_path)), 250)
+        self.assertEqual(stats['bytes_read'], os.path.getsize(self.csv_path))
+        self.assertGreater(stats['mb_per_second'], 0)
+        self.assertEqual(len(progress), 10)
+    
+    def test_invalid_columns_and_cancel(self):
+        """Test bad columns and a cancelled search return errors"""
+        _, stats = self.engine.search_file(self.csv_path, "x", ["Missing"])
+        self.assertIn('Invalid columns', stats['error'])
+        
+        cancel_event = threading.Event()
+        cancel_event.set()
+        output_path = os.path.join(self.temp_dir, 'matches.csv')
+        _, stats = self.engine.search_file(self.csv_path, "x", ["Name"], output_path=output_path,
+                                           cancel_event=cancel_event)
+        self.assertEqual(stats['error'], 'Search cancelled')
+        self.assertFalse(os.path.exists(output_path))
+
+
+class TestArrowInputs(unittest.TestCase):
+    """Test cases for loading Parquet, Feather and Arrow files"""
+    
+    def setUp(self):
+        """Write the same data in each columnar format"""
+        import pyarrow.feather as feather
+        
+        self.temp_dir = tempfile.mkdtemp()
+        self.df = pd.DataFrame({
+            'Name': ['Alice', 'Bob', 'Carol', None],
+            'City': ['Paris', 'Rome', 'Paris', 'Oslo'],
+            'Age': [30, 41, 25, 52]
+        })
+        self.paths = {
+            'parquet': os.path.join(self.temp_dir, 'data.parquet'),
+            'feather': os.path.join(self.temp_dir, 'data.feather'),
+            'arrow': os.path.join(self.temp_dir, 'data.arrow')
+        }
+        self.df.to_parquet(self.paths['parquet'])
+        feather.write_feather(self.df, self.paths['feather'])
+        feather.write_feather(self.df, self.paths['arrow'], compression='uncompressed')
+    
+    def tearDown(self):
+        """Clean up test fixtures"""
+        shutil.rmtree(self.temp_dir)
+    
+    def test_formats_load_and_search(self):
+        """Test every format loads all rows and searches like the DataFrame it came from"""
+        for file_format, path in self.paths.items():
+            engine = ExcelSearchEngine()
+            success, message = engine.load_file(path)
+            self.assertTrue(success, message)
+            self.assertEqual(engine.get_file_info()['rows'], 4)
+            
+            results, _ = engine.search("paris", ["City"])
+            self.assertEqual(results['Name'].tolist(), ['Alice', 'Carol'], file_format)
+            results, _ = engine.search("52", ["Age"], exact_match=True)
+            self.assertEqual(len(results), 1, file_format)
+    
+    def test_uncompressed_arrow_is_memory_mapped(self):
+        """Test an uncompressed Arrow file is mapped rather than copied into RAM"""
+        engine = ExcelSearchEngine()
+        engine.load_file(self.paths['arrow'])
+        self.assertTrue(engine.disk_backed)
+        self.assertEqual(engine.get_memory_usage()['total_bytes'], 0)
+    
+    def test_column_projection(self):
+        """Test only the requested columns are read"""
+        for path in self.paths.values():
+            engine = ExcelSearchEngine()
+            success, _ = engine.load_file(path, columns=['Name', 'Age'])
+            self.assertTrue(success)
+            self.assertEqual(engine.get_file_info()['column_names'], ['Name', 'Age'])
+    
+    def test_progressive_load_finishes_at_once(self):
+        """Test progressive and speculative loads of Arrow files report completion"""
+        updates = []
+        engine = ExcelSearchEngine()
+        success, _ = engine.load_file_progressive(self.paths['feather'], progress_callback=updates.append)
+        self.assertTrue(success)
+        self.assertFalse(engine.loading)
+        self.assertTrue(updates[-1]['done'])
+        
+        self.assertTrue(engine.preload(self.paths['parquet']))
+        success, message = engine.load_file(self.paths['parquet'])
+        self.assertTrue(success, message)
+        self.assertIn("preloaded", message)
+
+
+class TestStartup(unittest.TestCase):
+    """Test cases for the fast startup paths"""
+    
+    def heavy_imports(self, script, *args):
+        """Run a script under -X importtime and return the heavy libraries it loaded"""
+        script_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), script)
+        process = subprocess.run([sys.executable, '-X', 'importtime', script_path] + list(args),
+                                 stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
+        entries, _ = startup_profile.parse_importtime(process.stderr)
+        self.assertTrue(entries)
+        return [name for name, _, _ in entries if name in startup_profile.HEAVY_MODULES]
+    
+    def test_help_and_version_skip_heavy_imports(self):
+        """Test --help and --version load neither pandas, openpyxl nor Tk"""
+        self.assertEqual(self.heavy_imports('main.py', '--help'), [])
+        self.assertEqual(self.heavy_imports('excel_search_cli.py', '--help'), [])
+        self.assertEqual(self.heavy_imports('excel_search_cli.py', '--version'), [])
+    
+    def test_daemon_client_skips_heavy_imports(self):
+        """Test a daemon client search does not load pandas"""
+        socket_path = os.path.join(tempfile.gettempdir(), f"missing-{os.getpid()}.sock")
+        self.assertEqual(self.heavy_imports('excel_search_cli.py', 'data.xlsx', '-s', 'x',
+                                            '--daemon', '--socket', socket_path), [])
+
+
+class TestRecentFiles(unittest.TestCase):
+    """Test cases for recent file tracking"""
+    
+    def setUp(self):
+        """Point the recent files list at a temporary location"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.original_path = utils.RECENT_FILES_PATH
+        utils.RECENT_FILES_PATH = os.path.join(self.temp_dir, 'recent_files.json')
+    
+    def tearDown(self):
+        """Restore the recent files location"""
+        utils.RECENT_FILES_PATH = self.original_path
+        shutil.rmtree(self.temp_dir)
+    
+    def test_recent_files_newest_first(self):
+        """Test recent files are deduplicated and ordered newest first"""
+        paths = []
+        for name in ['a.csv', 'b.csv']:
+            path = os.path.join(self.temp_dir, name)
+            with open(path, 'w') as f:
+                f.write('x\n1\n')
+            paths.append(path)
+        
+        utils.add_recent_file(paths[0])
+        utils.add_recent_file(paths[1])
+        utils.add_recent_file(paths[0])
+        
+        self.assertEqual(utils.load_recent_files(), [paths[0], paths[1]])
+        self.assertTrue(utils.warm_file_cache(paths[0]))
+
+
 class TestErrorHandling(unittest.TestCase):
     """Test error handling"""
     
@@ -5,6 +5,8 @@ Helper functions for file handling, data processing, and formatting
 
 import os
 import re
+import json
+import numpy as np
 import pandas as pd
 from typing import List, Dict, Any, Tuple, Optional
 from datetime import datetime
@@ -30,7 +32,7 @@ def validate_file_path(file_path: str) -> Tuple[bool, str]:
     
     # Check file extension
     _, ext = os.path.splitext(file_path.lower())
-    supported_formats = ['.xlsx', '.xls', '.csv']
+    supported_formats = ['.xlsx', '.xls', '.csv', '.parquet', '.feather', '.arrow']
     
     if ext not in supported_formats:
         return False, f"Unsupported file format: {ext}. Supported: {', '.join(supported_formats)}"
@@ -42,6 +44,71 @@ def validate_file_path(file_path: str) -> Tuple[bool, str]:
     
     return True, "File is valid"
 
+# Most recently loaded files, newest first
+RECENT_FILES_PATH = os.path.join(os.path.expanduser('~'), '.excelsearchpro', 'recent_files.json')
+
+def load_recent_files(limit: int = 10) -> List[str]:
+    """
+    Load the list of recently used files that still exist
+    
+    Args:
+        limit: Maximum number of files to return
+        
+    Returns:
+        List of file paths, newest first
+    """
+    try:
+        with open(RECENT_FILES_PATH, 'r', encoding='utf-8') as f:
+            recent = json.load(f)
+    except (OSError, ValueError):
+        return []
+    
+    return [path for path in recent if isinstance(path, str) and os.path.isfile(path)][:limit]
+
+def add_recent_file(file_path: str, limit: int = 10) -> None:
+    """
+    Record a file as the most recently used one
+    
+    Args:
+        file_path: Path of the loaded file
+        limit: Maximum number of files to remember
+    """
+    file_path = os.path.abspath(file_path)
+    recent = [path for path in load_recent_files(limit) if path != file_path]
+    recent.insert(0, file_path)
+    
+    try:
+        os.makedirs(os.path.dirname(RECENT_FILES_PATH), exist_ok=True)
+        with open(RECENT_FILES_PATH, 'w', encoding='utf-8') as f:
+            json.dump(recent[:limit], f, ensure_ascii=False, indent=2)
+    except OSError:
+        pass  # Recent files are a convenience only
+
+def warm_file_cache(file_path: str, block_size: int = 1024 * 1024) -> bool:
+    """
+    Pull a file into the operating system page cache
+    
+    Reading a file once ahead of time makes the later parse read from memory
+    instead of disk, which matters for network drives and cold HDDs.
+    
+    Args:
+        file_path: Path to file
+        block_size: Read size in bytes
+        
+    Returns:
+        True if the file was read completely
+    """
+    try:
+        with open(file_path, 'rb') as f:
+            # Let the kernel start readahead for the whole file where supported
+            if hasattr(os, 'posix_fadvise'):
+                os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_WILLNEED)
+            while f.read(block_size):
+                pass
+        return True
+    except OSError:
+        return False
+
 def format_file_size(size_bytes: int) -> str:
     """
     Format file size in human-readable format
@@ -58,6 +125,27 @@ def format_file_size(size_bytes: int) -> str:
         size_bytes /= 1024.0
     return f"{size_bytes:.1f} TB"
 
+def format_memory_usage(usage: Dict[str, Any]) -> str:
+    """
+    Summarize ExcelSearchEngine.get_memory_usage() on one line
+    
+    Args:
+        usage: Memory usage dictionary in bytes
+        
+    Returns:
+        Text such as "42.0 MB (data 30.0 MB, caches 10.0 MB, indexes 2.0 MB)"
+    """
+    data = usage['data_bytes'] + usage['original_bytes']
+    caches = usage['normalized_bytes'] + usage['results_bytes']
+    indexes = usage['indexes_bytes'] + usage['tokens_bytes']
+    text = (f"{format_file_size(usage['total_bytes'])} (data {format_file_size(data)}, "
+            f"caches {format_file_size(caches)}, indexes {format_file_size(indexes)})")
+    if usage.get('disk_backed'):
+        text += ", data disk-backed"
+    if usage.get('budget_bytes') is not None:
+        text += f", budget {format_file_size(usage['budget_bytes'])}"
+    return text
+
 def format_duration(seconds: float) -> str:
     """
     Format duration in human-readable format
@@ -184,6 +272,100 @@ def optimize_dataframe_for_search(df: pd.DataFrame) -> pd.DataFrame:
     
     return optimized_df
 
+# Text columns with at most this share of distinct values become categoricals
+CATEGORY_MAX_UNIQUE_RATIO = 0.5
+
+def _string_dtype():
+    """Arrow-backed string dtype that keeps NaN for missing values, or None without pyarrow"""
+    try:
+        import pyarrow  # noqa: F401
+        return pd.StringDtype('pyarrow', na_value=np.nan)
+    except (ImportError, TypeError):
+        return None
+
+def _compact_column(series: pd.Series, category_ratio: float, string_dtype) -> pd.Series:
+    """
+    Smallest representation of a column that searches and exports the same
+    
+    Args:
+        series: Column to compact
+        category_ratio: Largest distinct/total ratio converted to a categorical
+        string_dtype: Dtype for the remaining text columns (None keeps them)
+        
+    Returns:
+        The compacted column, or the original one when nothing is smaller
+    """
+    dtype = series.dtype
+    
+    if pd.api.types.is_bool_dtype(dtype) or isinstance(dtype, pd.ArrowDtype):
+        return series
+    
+    if pd.api.types.is_integer_dtype(dtype):
+        return pd.to_numeric(series, downcast='unsigned' if (series >= 0).all() else 'integer')
+    
+    if pd.api.types.is_float_dtype(dtype):
+        if dtype.itemsize <= 4:
+            return series
+        smaller = series.astype('float32')
+        # Searches compare the text form, so float32 must print every value the same way
+        if not np.array_equal(smaller.to_numpy(dtype='float64'), series.to_numpy(), equal_nan=True):
+            return series
+        if not smaller.astype(str).fillna("").equals(series.astype(str).fillna("")):
+            return series
+        return smaller
+    
+    is_text = pd.api.types.is_string_dtype(dtype) and not isinstance(dtype, pd.CategoricalDtype)
+    if not is_text or pd.api.types.infer_dtype(series, skipna=True) not in ('string', 'empty'):
+        # Mixed cells (numbers next to text) keep their Python types
+        return series
+    
+    if len(series) and series.nunique() <= len(series) * category_ratio:
+        return series.astype('category')
+    if string_dtype is not None and dtype != string_dtype:
+        return series.astype(string_dtype)
+    return series
+
+def compact_dataframe(df: pd.DataFrame,
+                      category_ratio: float = CATEGORY_MAX_UNIQUE_RATIO) -> Tuple[pd.DataFrame, Dict[str, Any]]:
+    """
+    Shrink a DataFrame's memory without changing what searches find
+    
+    Integers are downcast to the smallest type holding their range, floats to
+    float32 when every value keeps its exact text, low-cardinality text
+    becomes categorical and other text moves to an Arrow-backed string dtype.
+    Columns holding mixed Python objects are left alone.
+    
+    Args:
+        df: DataFrame to compact
+        category_ratio: Largest distinct/total ratio converted to a categorical
+        
+    Returns:
+        Tuple of (compacted DataFrame, report with before_bytes, after_bytes
+        and the dtype change of every converted column)
+    """
+    string_dtype = _string_dtype()
+    compacted_df = df.copy(deep=False)
+    report = {'before_bytes': 0, 'after_bytes': 0, 'columns': {}}
+    
+    for position, column in enumerate(df.columns):
+        series = df.iloc[:, position]
+        compacted = _compact_column(series, category_ratio, string_dtype)
+        before = int(series.memory_usage(index=False, deep=True))
+        after = int(compacted.memory_usage(index=False, deep=True)) if compacted is not series else before
+        if after < before:
+            compacted_df.isetitem(position, compacted)
+            report['columns'][column] = f"{series.dtype} -> {compacted.dtype}"
+        else:
+            after = before
+        report['before_bytes'] += before
+        report['after_bytes'] += after
+    
+    index_bytes = int(df.index.memory_usage(deep=True))
+    report['before_bytes'] += index_bytes
+    report['after_bytes'] += index_bytes
+    
+    return compacted_df, report
+
 def generate_search_suggestions(df: pd.DataFrame, column: str, limit: int = 10) -> List[str]:
     """
     Generate search suggestions based on column data
@@ -239,7 +421,9 @@ def create_backup_filename(original_path: str) -> str:
 
 def estimate_memory_usage(file_path: str) -> Dict[str, Any]:
     """
-    Estimate memory usage for loading a file
+    Estimate memory usage for loading a file, before it is loaded
+    
+    Once loaded, ExcelSearchEngine.get_memory_usage() reports measured usage.
     
     Args:
         file_path: Path to file
@@ -304,3 +488,37 @@ def get_search_statistics(results: pd.DataFrame, search_time: float, total_rows:
         'results_per_second': result_count / search_time if search_time > 0 else 0,
         'efficiency_rating': 'Excellent' if search_time < 0.1 else 'Good' if search_time < 1 else 'Slow'
     }
+
+def format_search_breakdown(stats: Dict[str, Any]) -> List[str]:
+    """
+    Describe where a search spent its time, one line per phase and column
+    
+    Args:
+        stats: Search stats with 'phases' and optionally 'explain'
+        
+    Returns:
+        List of text lines
+    """
+    lines = [f"{phase:<18} {seconds * 1000:>9.2f} ms"
+             for phase, seconds in stats.get('phases', {}).items()]
+    
+    explain = stats.get('explain')
+    if explain is None:
+        for column, seconds in stats.get('column_times', {}).items():
+            lines.append(f"{column}: {seconds * 1000:.2f} ms")
+        return lines
+    
+    if explain['result_cache'] == 'hit':
+        lines.append("Served from the result cache")
+        return lines
+    
+    for plan in explain['columns']:
+        line = f"{plan['column']}: {plan['strategy']}, {plan['matches']:,} matches, {plan['time'] * 1000:.2f} ms"
+        if plan.get('index', {}).get('type') == 'token':
+            line += f" (index of {plan['index']['distinct_words']:,} words)"
+        elif plan.get('index'):
+            line += f" (index of {plan['index']['distinct_values']:,} values)"
+        elif plan.get('normalized_cache'):
+            line += f" (normalized column {plan['normalized_cache']})"
+        lines.append(line)
+    return lines
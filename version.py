@@ -0,0 +1,5 @@
+"""
+ExcelSearchPro version, kept in a dependency-free module so it loads instantly
+"""
+
+__version__ = "1.0.0"
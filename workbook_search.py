@@ -0,0 +1,265 @@
+"""
+Multi-sheet workbooks for the search engine
+Parses every sheet in a process pool and searches all sheets concurrently
+"""
+
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+
+import pandas as pd
+
+from exporters import export_parts
+from search_engine import ExcelSearchEngine
+
+# Column added to cross-sheet results holding the sheet each row came from
+SHEET_COLUMN = 'Sheet'
+
+
+def list_sheets(file_path: str) -> List[str]:
+    """
+    Sheet names of a workbook in tab order
+    
+    Args:
+        file_path: Path to .xlsx or .xls file
+    
+    Returns:
+        List of sheet names
+    """
+    engine = 'openpyxl' if file_path.lower().endswith('.xlsx') else 'xlrd'
+    with pd.ExcelFile(file_path, engine=engine) as workbook:
+        return [str(name) for name in workbook.sheet_names]
+
+
+def read_sheet(file_path: str, sheet_name: str) -> Tuple[pd.DataFrame, float]:
+    """
+    Parse one sheet; runs in a worker process
+    
+    Returns:
+        Tuple of (DataFrame, seconds spent parsing)
+    """
+    start_time = time.time()
+    engine = 'openpyxl' if file_path.lower().endswith('.xlsx') else 'xlrd'
+    df = pd.read_excel(file_path, sheet_name=sheet_name, engine=engine)
+    return df, time.time() - start_time
+
+
+class WorkbookSearch:
+    """
+    Every sheet of a workbook, each loaded into its own ExcelSearchEngine
+    
+    Sheets keep separate normalized columns, indexes and result caches, and
+    all of them count against the shared memory budget.
+    """
+    
+    def __init__(self):
+        self.file_path: str = ""
+        self.engines: Dict[str, ExcelSearchEngine] = {}
+        self.load_time: float = 0
+    
+    @property
+    def sheet_names(self) -> List[str]:
+        """Loaded sheets in tab order"""
+        return list(self.engines)
+    
+    def load_workbook(self, file_path: str, sheets: Optional[List[str]] = None,
+                      processes: Optional[int] = None) -> Tuple[bool, str]:
+        """
+        Load every sheet of a workbook, parsing sheets in parallel processes
+        
+        Args:
+            file_path: Path to .xlsx or .xls file
+            sheets: Sheets to load (default: all)
+            processes: Worker processes (default: one per sheet, up to the CPU
+                count); 1 parses the sheets one after another in this process
+        
+        Returns:
+            Tuple of (success, message)
+        """
+        if not os.path.exists(file_path):
+            return False, f"File not found: {os.path.basename(file_path)}"
+        if not file_path.lower().endswith(('.xlsx', '.xls')):
+            return False, "Multi-sheet loading needs an .xlsx or .xls workbook"
+        
+        try:
+            start_time = time.time()
+            names = list_sheets(file_path)
+            if sheets is not None:
+                unknown = [sheet for sheet in sheets if sheet not in names]
+                if unknown:
+                    return False, f"Unknown sheets: {unknown}"
+                names = [name for name in names if name in sheets]
+            if not names:
+                return False, "Workbook has no sheets"
+            
+            workers = min(len(names), processes or os.cpu_count() or 1)
+            if workers > 1:
+                with ProcessPoolExecutor(max_workers=workers) as pool:
+                    parsed = list(pool.map(read_sheet, [file_path] * len(names), names))
+            else:
+                parsed = [read_sheet(file_path, name) for name in names]
+            
+            engines = {}
+            for name, (df, parse_time) in zip(names, parsed):
+                engine = ExcelSearchEngine()
+                engine.load_dataframe(df, file_path, parse_time)
+                engines[name] = engine
+            
+            self.close()
+            self.engines = engines
+            self.file_path = file_path
+            self.load_time = time.time() - start_time
+            
+            rows = sum(len(engine.df) for engine in engines.values())
+            return True, (f"Successfully loaded {len(engines)} sheets with {rows:,} rows "
+                          f"in {self.load_time:.2f} seconds")
+        except Exception as e:
+            return False, f"Error loading workbook: {str(e)}"
+    
+    def build_indexes(self, columns: Optional[List[str]] = None) -> Dict[str, Any]:
+        """
+        Build each sheet's exact-match indexes
+        
+        Args:
+            columns: Columns to index in the sheets that have them (default: all)
+        
+        Returns:
+            Dictionary mapping sheet name to ExcelSearchEngine.build_indexes() stats
+        """
+        built = {}
+        for name, engine in self.engines.items():
+            sheet_columns = None if columns is None else [col for col in columns if col in engine.df.columns]
+            built[name] = engine.build_indexes(sheet_columns)
+        return built
+    
+    def search(self,
+               search_term: str,
+               search_columns: Optional[List[str]] = None,
+               case_sensitive: bool = False,
+               exact_match: bool = False,
+               use_regex: bool = False,
+               max_results: Optional[int] = None,
+               whole_word: bool = False,
+               output_path: Optional[str] = None,
+               return_rows: Optional[int] = None) -> Tuple[pd.DataFrame, Dict[str, Any]]:
+        """
+        Search all sheets concurrently
+        
+        Each sheet is searched in the given columns it has; sheets with none
+        of them are skipped.
+        
+        Args:
+            search_term: Text to search for
+            search_columns: Columns to search in (default: each sheet's first two)
+            case_sensitive: Whether search should be case sensitive
+            exact_match: Whether to match exact strings only
+            use_regex: Whether to treat search_term as regex
+            max_results: Maximum number of results to return across all sheets
+            whole_word: Match whole words only (see ExcelSearchEngine.search)
+            output_path: Also write every match (up to max_results) to this file,
+                sheet by sheet from the loaded data; stats['export'] holds the
+                outcome
+            return_rows: Build at most this many result rows (default: max_results)
+        
+        Returns:
+            Tuple of (results with a Sheet column first, search_stats with a
+            'sheets' entry holding each sheet's total_results and search_time)
+        """
+        if not self.engines:
+            return pd.DataFrame(), {'error': 'No workbook loaded'}
+        
+        start_time = time.time()
+        plans = {}
+        for name, engine in self.engines.items():
+            columns = list(engine.df.columns[:2]) if search_columns is None else \
+                [col for col in search_columns if col in engine.df.columns]
+            if columns:
+                plans[name] = columns
+        if not plans:
+            return pd.DataFrame(), {'error': f'Invalid columns: {search_columns}'}
+        
+        limit = min(return_rows, max_results) if return_rows and max_results else return_rows or max_results
+        
+        def search_sheet(name):
+            return self.engines[name].search(search_term, plans[name], case_sensitive,
+                                             exact_match, use_regex, limit, whole_word=whole_word)
+        
+        with ThreadPoolExecutor(max_workers=len(plans)) as pool:
+            outcomes = dict(zip(plans, pool.map(search_sheet, plans)))
+        
+        frames = []
+        sheets = {}
+        for name, (results, stats) in outcomes.items():
+            if 'error' in stats:
+                return pd.DataFrame(), {'error': f"{name}: {stats['error']}"}
+            sheets[name] = {'total_results': stats['total_results'], 'search_time': stats['search_time'],
+                            'search_columns': plans[name]}
+            if len(results):
+                results = results.copy()
+                results.insert(0, SHEET_COLUMN, name, allow_duplicates=True)
+                frames.append(results)
+        
+        results = pd.concat(frames) if frames else pd.DataFrame(columns=[SHEET_COLUMN])
+        if limit:
+            results = results.iloc[:limit]
+        
+        stats = {
+            'search_time': time.time() - start_time,
+            'total_results': sum(sheet['total_results'] for sheet in sheets.values()),
+            'returned_results': len(results),
+            'search_term': search_term,
+            'search_columns': search_columns,
+            'case_sensitive': case_sensitive,
+            'exact_match': exact_match,
+            'use_regex': use_regex,
+            'whole_word': whole_word,
+            'sheets': sheets
+        }
+        if output_path:
+            stats['export'] = self._export_matches(plans, output_path, search_term, case_sensitive, exact_match,
+                                                   use_regex, max_results, whole_word)
+        return results, stats
+    
+    def _export_matches(self, plans: Dict[str, List[str]], output_path: str, search_term: str,
+                        case_sensitive: bool, exact_match: bool, use_regex: bool,
+                        max_results: Optional[int], whole_word: bool) -> Dict[str, Any]:
+        """Write each sheet's matches in turn, by row position, without combining them first"""
+        parts = []
+        for name, columns in plans.items():
+            engine = self.engines[name]
+            # Answered from the result cache filled by the search just run
+            positions, stats = engine.search_positions(search_term, columns, case_sensitive, exact_match,
+                                                       use_regex, whole_word=whole_word)
+            if positions is None:
+                return {'ok': False, 'message': f"{name}: {stats['error']}"}
+            if len(positions):
+                parts.append((engine.df, positions, {SHEET_COLUMN: name}))
+        if not parts:
+            return {'ok': False, 'message': "No results to export"}
+        
+        try:
+            success, message = export_parts(parts, output_path, max_rows=max_results)
+        except Exception as e:
+            success, message = False, f"Export failed: {str(e)}"
+        return {'ok': success, 'message': message}
+    
+    def get_file_info(self, include_memory: bool = False) -> Dict[str, Any]:
+        """Workbook summary with each sheet's ExcelSearchEngine file info (see its include_memory)"""
+        if not self.engines:
+            return {}
+        sheets = {name: engine.get_file_info(include_memory) for name, engine in self.engines.items()}
+        return {
+            'file_path': self.file_path,
+            'file_size_mb': os.path.getsize(self.file_path) / (1024 * 1024),
+            'load_time': self.load_time,
+            'rows': sum(info['rows'] for info in sheets.values()),
+            'sheets': sheets
+        }
+    
+    def close(self):
+        """Release every sheet's data"""
+        for engine in self.engines.values():
+            engine.reset()
+            engine.memory_budget.unregister(engine)
+        self.engines = {}